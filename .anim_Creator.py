@@ -1,14 +1,33 @@
+import time
+process_start = time.perf_counter()  # Measured as early as possible for the startup time check
+
 import os, sys
 import json  # Now using JSON for settings
+import queue
+import logging
+import threading
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import filedialog, Menu
-from animExport import export_single_animation, export_all_animations
-from FBX_import import load_fbx_animations  # Import the actual FBX handler
+from tkinter import filedialog, Menu, font as tkfont
+from animTakeList import TakeList
+
+# The FBX SDK and the exporter modules are imported lazily (see preload_exporter) so the window shows instantly
+
+logger = logging.getLogger("animCreator")
 
 # Path for the settings.json file
 settings_file = "settings.json"
 
+# How often the main thread checks on background work (milliseconds)
+background_poll_interval = 50
+
+# Time after the last key press in the filter box before the animation list is filtered (milliseconds)
+filter_delay = 150
+
+# Time from process start until the window is shown that we consider acceptable (seconds).
+# benchmarks/startup_benchmark.py reads it from here as its default budget.
+startup_budget_seconds = 1.0
+
 # Define color themes (including additional ones)
 color_themes = {
     "blue": {
@@ -43,6 +62,176 @@ color_themes = {
     }
 }
 
+class VirtualListbox(tk.Frame):
+    """
+    A list that only draws the rows currently visible, so thousands of entries show and scroll as
+    fast as a handful.
+
+    Rows are (key, text) pairs and the selection is a set of keys. Click selects a row, Ctrl+click
+    toggles one, Shift+click selects a range, Ctrl+A selects every row and the arrow keys move the
+    selection.
+    """
+
+    def __init__(self, master, font, bg, fg, select_bg, select_fg, row_padding=6, text_padding=10, on_context_menu=None):
+        super().__init__(master, bg=bg)
+        self.font = tkfont.Font(font=font)
+        self.row_height = self.font.metrics("linespace") + row_padding
+        self.text_padding = text_padding
+        self.colors = {False: (bg, fg), True: (select_bg, select_fg)}
+        self.on_context_menu = on_context_menu
+
+        self.rows = []  # (key, text) of every row, in display order
+        self.selection = set()  # Keys of the selected rows
+        self.anchor = None  # Row index Shift+click ranges start from
+        self.top = 0  # Index of the first visible row
+        self.row_items = []  # (rectangle, text) canvas items, reused for whichever rows are visible
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, borderwidth=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Control-Button-1>", self.on_toggle_click)
+        self.canvas.bind("<Shift-Button-1>", self.on_range_click)
+        self.canvas.bind("<Button-3>", self.on_right_click)
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", self.on_wheel)
+        self.canvas.bind("<Button-5>", self.on_wheel)
+        self.canvas.bind("<Up>", lambda event: self.move_selection(-1))
+        self.canvas.bind("<Down>", lambda event: self.move_selection(1))
+        self.canvas.bind("<Control-a>", self.select_all)
+
+    def set_rows(self, rows):
+        """Replace the rows, keeping the selection of rows that are still present."""
+        self.rows = list(rows)
+        self.selection &= {key for key, _ in self.rows}
+        self.anchor = None
+        self.top = min(self.top, self.max_top())
+        self.redraw()
+
+    def selected_keys(self):
+        """Return the keys of the selected rows in display order."""
+        return [key for key, _ in self.rows if key in self.selection]
+
+    def visible_count(self):
+        """Number of rows that fit in the list."""
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def max_top(self):
+        return max(0, len(self.rows) - self.visible_count())
+
+    def yview(self, *args):
+        """Scrollbar protocol: ("moveto", fraction) or ("scroll", amount, "units" or "pages")."""
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            amount = int(args[1]) * (self.visible_count() if args[2] == "pages" else 1)
+            self.scroll_to(self.top + amount)
+
+    def scroll_to(self, top):
+        self.top = max(0, min(int(top), self.max_top()))
+        self.redraw()
+
+    def see(self, index):
+        """Scroll just enough to show the row at index."""
+        if index < self.top:
+            self.scroll_to(index)
+        elif index >= self.top + self.visible_count():
+            self.scroll_to(index - self.visible_count() + 1)
+
+    def redraw(self):
+        """Show the rows from self.top on in the reused canvas items and update the scrollbar."""
+        width = self.canvas.winfo_width()
+        slots = self.canvas.winfo_height() // self.row_height + 1
+        while len(self.row_items) < slots:
+            self.row_items.append((
+                self.canvas.create_rectangle(0, 0, 0, 0, width=0),
+                self.canvas.create_text(self.text_padding, 0, anchor="w", font=self.font),
+            ))
+
+        for slot, (rectangle, text) in enumerate(self.row_items):
+            index = self.top + slot
+            if slot >= slots or index >= len(self.rows):
+                self.canvas.itemconfigure(rectangle, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+                continue
+            key, label = self.rows[index]
+            background, foreground = self.colors[key in self.selection]
+            y = slot * self.row_height
+            self.canvas.coords(rectangle, 0, y, width, y + self.row_height)
+            self.canvas.itemconfigure(rectangle, fill=background, state="normal")
+            self.canvas.coords(text, self.text_padding, y + self.row_height / 2)
+            self.canvas.itemconfigure(text, text=label, fill=foreground, state="normal")
+
+        if self.rows:
+            self.scrollbar.set(self.top / len(self.rows), min(1.0, (self.top + self.visible_count()) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def index_at(self, y):
+        """Return the index of the row at canvas height y, or None below the last row."""
+        index = self.top + int(y // self.row_height)
+        return index if index < len(self.rows) else None
+
+    def select_index(self, index):
+        """Select only the row at index and make it the anchor of Shift+click ranges."""
+        self.selection = {self.rows[index][0]}
+        self.anchor = index
+        self.see(index)
+        self.redraw()
+
+    def on_click(self, event):
+        self.canvas.focus_set()
+        index = self.index_at(event.y)
+        if index is None:
+            self.selection.clear()
+            self.redraw()
+        else:
+            self.select_index(index)
+
+    def on_toggle_click(self, event):
+        index = self.index_at(event.y)
+        if index is not None:
+            self.selection ^= {self.rows[index][0]}
+            self.anchor = index
+            self.redraw()
+
+    def on_range_click(self, event):
+        index = self.index_at(event.y)
+        if index is None:
+            return
+        first, last = sorted((self.anchor if self.anchor is not None else index, index))
+        self.selection = {key for key, _ in self.rows[first:last + 1]}
+        self.redraw()
+
+    def on_right_click(self, event):
+        index = self.index_at(event.y)
+        if index is None:
+            return
+        # Right-clicking outside the selection selects the clicked row, like a file browser
+        if self.rows[index][0] not in self.selection:
+            self.select_index(index)
+        if self.on_context_menu is not None:
+            self.on_context_menu(event)
+
+    def on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.top - 3)
+        elif event.num == 5 or event.delta < 0:
+            self.scroll_to(self.top + 3)
+
+    def move_selection(self, step):
+        if self.rows:
+            start = self.anchor if self.anchor is not None else (-1 if step > 0 else len(self.rows))
+            self.select_index(max(0, min(start + step, len(self.rows) - 1)))
+
+    def select_all(self, event=None):
+        self.selection = {key for key, _ in self.rows}
+        self.redraw()
+        return "break"
+
 class FBXToAnimConverterApp:
     def __init__(self, root):
         self.root = root
@@ -68,6 +257,22 @@ class FBXToAnimConverterApp:
         window_position = self.settings.get("window_position", "100x100")
         self.root.geometry(f"540x630+{window_position.split('x')[0]}+{window_position.split('x')[1]}")
 
+        # Nothing is loaded and no directory is chosen yet
+        self.fbx_file = None
+        self.export_dir = None
+        self.take_list = None
+        self.filter_job = None
+
+        # Cancel flag of the running background export, if any
+        self.cancel_event = None
+
+        # On-disk keyframe cache so re-opening an unchanged FBX file skips the FBX import (created by preload_exporter)
+        self.extraction_cache = None
+        self.scene_cache = None
+        self.busy = False
+        self.preload_thread = None
+        self.preload_error = None
+
         # Initialize theme-related variables before applying any theme
         self.blue_theme_var = tk.IntVar(value=1 if self.settings.get("theme") == "blue" else 0)
         self.orange_theme_var = tk.IntVar(value=1 if self.settings.get("theme") == "orange" else 0)
@@ -76,12 +281,58 @@ class FBXToAnimConverterApp:
         self.yellow_theme_var = tk.IntVar(value=1 if self.settings.get("theme") == "yellow" else 0)
         self.purple_theme_var = tk.IntVar(value=1 if self.settings.get("theme") == "purple" else 0)
 
+        # Leave bones and channels that never leave their rest pose out of exported files
+        self.prune_var = tk.IntVar(value=1 if self.settings.get("prune_static_bones") else 0)
+
         # Build UI components
         self.build_ui()
 
         # Apply the saved theme after building the UI
         self.apply_saved_theme()
 
+        # Once the window is up, report the startup time and load the FBX SDK in the background
+        self.root.after(0, self.on_window_shown)
+
+    def on_window_shown(self):
+        """Check the startup time against the budget and start preloading the exporter."""
+        startup_seconds = time.perf_counter() - process_start
+        logger.info("Window shown after %.3fs", startup_seconds)
+        if startup_seconds > startup_budget_seconds:
+            logger.warning("Startup took longer than the %.1fs budget", startup_budget_seconds)
+
+        self.preload_thread = threading.Thread(target=self.preload_exporter, daemon=True)
+        self.preload_thread.start()
+
+    def preload_exporter(self):
+        """
+        Import the FBX SDK and exporter modules and create the scene and extraction caches, off the main thread.
+
+        A failure (e.g. the FBX SDK is not installed) is kept in preload_error and raised by wait_for_exporter.
+        """
+        try:
+            import FBX_import, animExport
+            from animCache import ExtractionCache
+            self.scene_cache = FBX_import.SceneCache(self.settings.get("scene_cache_size", FBX_import.DEFAULT_MAX_SCENES))
+            if self.settings.get("extraction_cache", True):
+                self.extraction_cache = ExtractionCache()
+        except Exception as e:
+            logger.exception("Failed to load the exporter")
+            self.preload_error = e
+
+    def wait_for_exporter(self):
+        """
+        Make sure preload_exporter has finished (called from worker threads before using the exporter).
+
+        Raises:
+            RuntimeError: If preload_exporter failed.
+        """
+        if self.preload_thread is None:
+            self.preload_exporter()
+        else:
+            self.preload_thread.join()
+        if self.preload_error is not None:
+            raise RuntimeError(f"Could not load the exporter: {self.preload_error}") from self.preload_error
+
     def build_ui(self):
         """Build the user interface for the application."""
         # Create main frame
@@ -116,33 +367,28 @@ class FBXToAnimConverterApp:
         self.listbox_frame.pack(pady=10, padx=(5, 5), fill="both", expand=True)  # Increased left padding to 50px for testing
 
 
-        # Inside the build_ui method
+        # Filter box: matches names containing the text, then names containing its letters in order
+        self.search_entry = ctk.CTkEntry(self.listbox_frame, placeholder_text="Filter animations")
+        self.search_entry.pack(pady=(10, 0), padx=(25, 5), fill="x")
+        self.search_entry.bind("<KeyRelease>", self.schedule_filter)
 
-        self.anim_listbox = tk.Listbox(
+        # Only the visible rows are drawn, so files with thousands of takes load and scroll instantly
+        self.anim_listbox = VirtualListbox(
             self.listbox_frame,
-            height=10,
-            bg='#2E2E2E',  # Background color of the listbox
+            font=("Calibri", 14),  # Larger font size
+            bg='#2E2E2E',  # Background color of the list
             fg='white',  # Text color
-            highlightbackground='#2E2E2E',  # Same as background to hide the border
-            selectbackground='#4A90E2',  # Color for selected background (blue in this case)
-            selectforeground='white',  # Text color for selected items
-            highlightthickness=0,  # Removes the border thickness
-            relief="flat",  # Removes any 3D effect
-            selectmode="single",
-            borderwidth=0,  # Removes the border
-            font=("Calibri", 14)  # Larger font size
+            select_bg='#4A90E2',  # Color for selected background (blue in this case)
+            select_fg='white',  # Text color for selected items
+            on_context_menu=self.show_context_menu
         )
-
-        # Remove any underline (set in the select style)
-        self.anim_listbox.configure(activestyle="none")  # This disables the underline effect
-
         self.anim_listbox.pack(pady=5, padx=(25,5), fill="both", expand=True)
-        self.anim_listbox.bind('<Button-3>', self.show_context_menu)
 
-        # Right-click context menu for rename, delete, and export
+        # Right-click context menu for rename, delete, and export of the selected animations
         self.context_menu = Menu(self.root, tearoff=0)
-        self.context_menu.add_command(label="Export", command=self.export_single_animation)
+        self.context_menu.add_command(label="Export", command=self.export_selected_animations)
         self.context_menu.add_command(label="Rename", command=self.rename_animation)
+        self.context_menu.add_command(label="Rename by Pattern", command=self.rename_by_pattern)
         self.context_menu.add_command(label="Delete", command=self.delete_animation)
 
         # Custom Export Directory selection
@@ -161,6 +407,14 @@ class FBXToAnimConverterApp:
         self.export_all_button = ctk.CTkButton(self.main_frame, text="Export All Animations", command=self.export_all_animations_handler, width=25, state="disabled")
         self.export_all_button.pack(pady=10)
 
+        # Progress bar and cancel button, only shown while a background export is running
+        self.progress_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        self.progress_bar = ctk.CTkProgressBar(self.progress_frame, width=300)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", padx=(0, 5))
+        self.cancel_button = ctk.CTkButton(self.progress_frame, text="Cancel", command=self.cancel_export, width=80)
+        self.cancel_button.pack(side="left", padx=(5, 0))
+
         # Status label
         self.status_label = ctk.CTkLabel(self.main_frame, text="", text_color="green", wraplength=500, anchor="center", justify="center")
         self.status_label.pack(pady=10, fill="both")
@@ -197,6 +451,9 @@ class FBXToAnimConverterApp:
         ctk.CTkCheckBox(self.settings_frame, text="Yellow", variable=self.yellow_theme_var, command=self.apply_yellow_theme).pack(anchor="w", padx=10)
         ctk.CTkCheckBox(self.settings_frame, text="Purple", variable=self.purple_theme_var, command=self.apply_purple_theme).pack(anchor="w", padx=10)
 
+        ctk.CTkLabel(self.settings_frame, text="Export:").pack(pady=10)
+        ctk.CTkCheckBox(self.settings_frame, text="Skip bones that never move", variable=self.prune_var, command=self.toggle_pruning).pack(anchor="w", padx=10)
+
         # Store Save button as an instance variable for color updates
         self.save_button = ctk.CTkButton(self.settings_frame, text="Save", command=self.save_export_directory)
         self.save_button.pack(pady=20)
@@ -226,6 +483,14 @@ class FBXToAnimConverterApp:
         active_var.set(1)  # Set the active theme
 
 
+    def toggle_pruning(self):
+        self.settings["prune_static_bones"] = bool(self.prune_var.get())
+        self.save_settings()
+
+    def export_prune_mode(self):
+        """Return the pruning mode for exports (see animFilters.prune_keyframes), or None if pruning is off."""
+        return "rest" if self.prune_var.get() else None
+
     def apply_blue_theme(self):
         self.reset_theme_vars(self.blue_theme_var)
         self.update_ui_colors("blue")
@@ -278,6 +543,8 @@ class FBXToAnimConverterApp:
         self.status_label.configure(text_color=theme["CTkLabel"]["text_color"])
         self.settings_button.configure(fg_color=theme["CTkButton"]["fg_color"], text_color=theme["CTkButton"]["text_color"])
         self.browse_button.configure(fg_color=theme["CTkButton"]["fg_color"], text_color=theme["CTkButton"]["text_color"])
+        self.cancel_button.configure(fg_color=theme["CTkButton"]["fg_color"], text_color=theme["CTkButton"]["text_color"])
+        self.progress_bar.configure(progress_color=theme["CTkButton"]["fg_color"])
 
         # Settings frame widgets
         self.settings_export_dir_entry.configure(fg_color=theme["CTkFrame"]["fg_color"])
@@ -288,53 +555,127 @@ class FBXToAnimConverterApp:
         # Ensure immediate changes take effect by updating all widgets
         self.root.update()
 
+    def run_in_background(self, work, on_done, on_progress=None):
+        """
+        Run work on a worker thread so the window stays responsive.
+
+        work receives a report(*args) function it may call from the worker thread. Reports, the
+        result and any exception are handed back to the Tk main thread via root.after, where
+        on_progress(*args) and on_done(result, error) are called.
+        """
+        messages = queue.Queue()
+
+        def worker():
+            try:
+                result = work(lambda *args: messages.put(("progress", args)))
+            except Exception as e:
+                messages.put(("done", (None, e)))
+            else:
+                messages.put(("done", (result, None)))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(background_poll_interval, self.poll_background, messages, on_done, on_progress)
+
+    def poll_background(self, messages, on_done, on_progress):
+        """Deliver queued messages from a worker thread on the Tk main thread."""
+        while True:
+            try:
+                kind, payload = messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress" and on_progress is not None:
+                on_progress(*payload)
+            elif kind == "done":
+                on_done(*payload)
+                return
+        self.root.after(background_poll_interval, self.poll_background, messages, on_done, on_progress)
+
+    def set_busy(self, busy):
+        """Disable the buttons that start new work while background work is running."""
+        self.busy = busy
+        state = "disabled" if busy else "normal"
+        self.select_fbx_button.configure(state=state)
+        self.export_all_button.configure(state="disabled" if busy or not self.fbx_file else "normal")
+
     def select_fbx_file(self):
-        self.fbx_file = filedialog.askopenfilename(title="Select FBX File", filetypes=[("FBX files", "*.fbx")])
-        if self.fbx_file:
-            self.anim_listbox.delete(0, tk.END)  # Clear the listbox first
-            self.animations_with_originals, self.scene = load_fbx_animations(self.fbx_file)
-            self.animations = [cleaned_name for _, cleaned_name in self.animations_with_originals]
-            
-            for anim in self.animations:
-                self.anim_listbox.insert(tk.END, anim)
-            
+        fbx_file = filedialog.askopenfilename(title="Select FBX File", filetypes=[("FBX files", "*.fbx")])
+        if not fbx_file:
+            return
+
+        self.set_busy(True)
+        self.status_label.configure(text=f"Loading {fbx_file.split('/')[-1]}...", text_color="green")
+
+        def on_loaded(result, error):
+            if error is not None:
+                self.set_busy(False)
+                self.status_label.configure(text=f"Failed to load FBX file: {error}", text_color="red")
+                return
+
+            self.fbx_file = fbx_file
+            animations_with_originals, self.scene = result
+            self.take_list = TakeList(animations_with_originals)  # Renames never touch the scene cache's list
+
+            self.search_entry.delete(0, tk.END)
+            self.anim_listbox.selection.clear()
+            self.refresh_list()
+
             self.fbx_label.configure(text=f"{self.fbx_file.split('/')[-1]}")
-            self.export_all_button.configure(state="normal")
+            self.status_label.configure(text=f"Loaded {len(self.take_list)} animations.", text_color="green")
+            self.set_busy(False)
+
+        def work(report):
+            self.wait_for_exporter()
+            # Recently opened files are reused, older scenes are released
+            return self.scene_cache.load(fbx_file, self.extraction_cache)
+
+        self.run_in_background(work, on_loaded)
+
+    def schedule_filter(self, event=None):
+        """Refilter the list shortly after typing stops, so fast typing filters once."""
+        if self.filter_job is not None:
+            self.root.after_cancel(self.filter_job)
+        self.filter_job = self.root.after(filter_delay, self.refresh_list)
+
+    def refresh_list(self):
+        """Show the takes matching the filter box."""
+        self.filter_job = None
+        if self.take_list is None:
+            return
+        take_ids = self.take_list.filter(self.search_entry.get())
+        self.anim_listbox.set_rows((take_id, self.take_list.get(take_id).name) for take_id in take_ids)
+
+    def selected_takes(self):
+        """Return the Take of every selected row, in list order."""
+        return [self.take_list.get(take_id) for take_id in self.anim_listbox.selected_keys()]
 
     def show_context_menu(self, event):
-        try:
-            self.selected_animation_index = self.anim_listbox.nearest(event.y)
-            self.anim_listbox.selection_clear(0, tk.END)
-            self.anim_listbox.selection_set(self.selected_animation_index)
+        if self.anim_listbox.selection:
             self.context_menu.post(event.x_root, event.y_root)
-        except IndexError:
-            pass
 
-    def rename_animation(self):
-        index = self.selected_animation_index
-        original_name = self.anim_listbox.get(index)
+    def open_modal_window(self, title, window_width, window_height):
+        """
+        Open a window centered on the main window that blocks it until closed.
 
-        # Create the rename window
-        rename_window = ctk.CTkToplevel(self.root)
-        rename_window.title("Rename Animation")
-        rename_window.geometry("360x180")
+        Returns:
+            tuple: (the window, a function that closes it and re-enables the main window).
+        """
+        modal_window = ctk.CTkToplevel(self.root)
+        modal_window.title(title)
 
-        # Set the icon for the rename window
-        rename_window.iconbitmap("icon.ico")  # Set the icon here
+        # Set the icon for the modal window
+        modal_window.iconbitmap("icon.ico")  # Set the icon here
 
-        # Center the rename window
+        # Center the modal window
         self.root.update_idletasks()  # Update root dimensions
-        window_width = 360
-        window_height = 180
         screen_width = self.root.winfo_width()
         screen_height = self.root.winfo_height()
         x = self.root.winfo_x() + (screen_width // 2) - (window_width // 2)
         y = self.root.winfo_y() + (screen_height // 2) - (window_height // 2)
-        rename_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        modal_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
 
-        # Make the rename window modal and lock the main window
-        rename_window.grab_set()
-        rename_window.transient(self.root)  # Set the rename window as a child of the main window
+        # Make the window modal and lock the main window
+        modal_window.grab_set()
+        modal_window.transient(self.root)  # Set the window as a child of the main window
 
         # Disable the main window from being moved or interacted with
         self.root.attributes("-disabled", True)
@@ -342,59 +683,130 @@ class FBXToAnimConverterApp:
         # Handle window close to re-enable the main window
         def on_close():
             self.root.attributes("-disabled", False)
-            rename_window.grab_release()
-            rename_window.destroy()
-            # Unbind the flash event after closing the rename window
+            modal_window.grab_release()
+            modal_window.destroy()
+            # Unbind the flash event after closing the window
             self.root.unbind("<FocusIn>")
 
-        rename_window.protocol("WM_DELETE_WINDOW", on_close)
+        modal_window.protocol("WM_DELETE_WINDOW", on_close)
+
+        # Flash main window and play sound only when interaction is attempted with the main window while the window is active
+        def flash_main_window(event=None):
+            if modal_window.winfo_exists():  # Ensure the window is still open
+                self.root.bell()  # Play a system warning sound
+                self.root.after(100, lambda: self.root.configure(bg="red"))  # Flash red for a brief moment
+                self.root.after(300, lambda: self.root.configure(bg=""))  # Reset back to normal
+
+        # Defer binding the focus event until after the window is fully opened
+        def bind_focus_event():
+            self.root.bind("<FocusIn>", flash_main_window)
+
+        # Set a small delay before binding the event to ensure the window is fully initialized
+        modal_window.after(100, bind_focus_event)
+        return modal_window, on_close
+
+    def rename_animation(self):
+        takes = self.selected_takes()
+        if not takes:
+            return
+        take = takes[0]
+
+        # Create the rename window
+        rename_window, on_close = self.open_modal_window("Rename Animation", 360, 180)
 
         entry_box = ctk.CTkEntry(rename_window, width=300)
-        entry_box.insert(0, original_name)
+        entry_box.insert(0, take.name)
         entry_box.pack(pady=20)
 
         def commit_rename():
             new_name = entry_box.get()
             if new_name:
-                self.anim_listbox.delete(index)
-                self.anim_listbox.insert(index, new_name)
-                self.animations[index] = new_name
-                self.animations_with_originals[index] = (self.animations_with_originals[index][0], new_name)
+                try:
+                    self.take_list.rename(take.id, new_name)
+                except ValueError as e:
+                    self.status_label.configure(text=str(e), text_color="red")
+                    return
+                self.refresh_list()
                 self.status_label.configure(text=f"Animation renamed to: {new_name}")
                 on_close()
 
         rename_button = ctk.CTkButton(rename_window, text="Rename", command=commit_rename)
         rename_button.pack(pady=10)
 
-        # Flash main window and play sound only when interaction is attempted with the main window while rename window is active
-        def flash_main_window(event=None):
-            if rename_window.winfo_exists():  # Ensure the rename window is still open
-                self.root.bell()  # Play a system warning sound
-                self.root.after(100, lambda: self.root.configure(bg="red"))  # Flash red for a brief moment
-                self.root.after(300, lambda: self.root.configure(bg=""))  # Reset back to normal
+    def rename_by_pattern(self):
+        """Rename every selected animation matching a glob or regular expression pattern."""
+        takes = self.selected_takes()
+        if not takes:
+            return
 
-        # Defer binding the focus event until after the rename window is fully opened
-        def bind_focus_event():
-            self.root.bind("<FocusIn>", flash_main_window)
+        rename_window, on_close = self.open_modal_window(f"Rename {len(takes)} Animations", 360, 300)
+
+        ctk.CTkLabel(rename_window, text="Pattern (* and ?, or a regular expression):").pack(pady=(15, 0))
+        pattern_entry = ctk.CTkEntry(rename_window, width=300)
+        pattern_entry.insert(0, "*")
+        pattern_entry.pack(pady=5)
+
+        ctk.CTkLabel(rename_window, text="New name ({name} = old name, {n} = counter):").pack(pady=(10, 0))
+        replacement_entry = ctk.CTkEntry(rename_window, width=300)
+        replacement_entry.insert(0, "{name}")
+        replacement_entry.pack(pady=5)
+
+        regex_var = tk.IntVar(value=0)
+        ctk.CTkCheckBox(rename_window, text="Regular expression", variable=regex_var).pack(pady=5)
+
+        def commit_rename():
+            try:
+                renamed = self.take_list.rename_by_pattern([take.id for take in takes], pattern_entry.get(),
+                                                           replacement_entry.get(), regex=bool(regex_var.get()))
+            except ValueError as e:
+                self.status_label.configure(text=str(e), text_color="red")
+                return
+            self.refresh_list()
+            self.status_label.configure(text=f"Renamed {len(renamed)} animations.", text_color="green")
+            on_close()
 
-        # Set a small delay before binding the event to ensure the rename window is fully initialized
-        rename_window.after(100, bind_focus_event)
+        rename_button = ctk.CTkButton(rename_window, text="Rename", command=commit_rename)
+        rename_button.pack(pady=10)
 
     def delete_animation(self):
-        index = self.selected_animation_index
-        del self.animations[index]
-        del self.animations_with_originals[index]
-        self.anim_listbox.delete(index)
-        self.status_label.configure(text="Animation deleted.")
+        takes = self.selected_takes()
+        self.take_list.delete(take.id for take in takes)
+        self.refresh_list()
+        self.status_label.configure(text="Animation deleted." if len(takes) == 1 else f"{len(takes)} animations deleted.")
+
+    def export_selected_animations(self):
+        """Export the selected animation to a chosen file, or several selected animations to the export directory."""
+        takes = self.selected_takes()
+        if len(takes) > 1:
+            self.start_batch_export(takes)
+        else:
+            self.export_single_animation()
 
     def export_single_animation(self):
-        selected_index = self.anim_listbox.curselection()
-        if selected_index:
-            selected_animation = self.anim_listbox.get(selected_index)
+        takes = self.selected_takes()
+        if takes:
+            take = takes[0]
+            selected_animation = take.name
             save_path = filedialog.asksaveasfilename(defaultextension=".anim", filetypes=[("Anim files", "*.anim")], initialfile=f"{selected_animation}.anim")
             if save_path:
-                export_single_animation(selected_animation, save_path, self.scene)
-                self.status_label.configure(text=f"Exported {selected_animation} to {save_path}", text_color="green")
+                self.set_busy(True)
+                self.status_label.configure(text=f"Exporting {selected_animation}...", text_color="green")
+
+                def on_exported(result, error):
+                    self.set_busy(False)
+                    if error is not None:
+                        self.status_label.configure(text=f"Failed to export {selected_animation}: {error}", text_color="red")
+                    else:
+                        self.status_label.configure(text=f"Exported {selected_animation} to {save_path}", text_color="green")
+
+                scene = self.scene
+                prune = self.export_prune_mode()
+
+                def work(report):
+                    from animExport import export_single_animation
+                    return export_single_animation(take.stack, save_path, scene, prune=prune)
+
+                self.run_in_background(work, on_exported)
             else:
                 self.status_label.configure(text="Export canceled.", text_color="red")
         else:
@@ -404,12 +816,62 @@ class FBXToAnimConverterApp:
         if not self.fbx_file:
             self.status_label.configure(text="Error: No FBX file loaded!", text_color="red")
             return
+        self.start_batch_export(list(self.take_list))
+
+    def start_batch_export(self, takes):
+        """Export the given takes to the export directory in the background, with progress and cancel."""
         export_dir = self.export_dir or self.settings.get("default_export_dir")
         if not export_dir:
             self.status_label.configure(text="Error: Please select an export directory!", text_color="red")
             return
-        export_all_animations([anim_cleaned for _, anim_cleaned in self.animations_with_originals], export_dir, self.scene)
-        self.status_label.configure(text="All animations exported successfully!", text_color="green")
+
+        # Takes are found by their stack name and written under their (possibly renamed) name
+        animations = [take.stack for take in takes]
+        output_names = self.take_list.output_names(take.id for take in takes)
+        scene = self.scene
+        prune = self.export_prune_mode()
+        cancel_event = self.cancel_event = threading.Event()
+        started = time.perf_counter()
+
+        self.set_busy(True)
+        self.progress_bar.set(0)
+        self.progress_frame.pack(pady=(0, 10), before=self.status_label)
+        self.status_label.configure(text=f"Exporting 0/{len(animations)} animations...", text_color="green")
+
+        def on_progress(done, total, result):
+            elapsed = time.perf_counter() - started
+            rate = done / elapsed if elapsed > 0 else 0.0
+            self.progress_bar.set(done / total)
+            self.status_label.configure(text=f"Exported {done}/{total} animations ({rate:.1f} per second)", text_color="green")
+
+        def on_exported(results, error):
+            self.progress_frame.pack_forget()
+            self.set_busy(False)
+            self.cancel_event = None
+            if error is not None:
+                self.status_label.configure(text=f"Export failed: {error}", text_color="red")
+                return
+
+            failed = [output_names[anim] for anim, _, anim_error in results if anim_error]
+            if failed:
+                self.status_label.configure(text=f"{len(results) - len(failed)} animations exported, failed: {', '.join(failed)}", text_color="red")
+            elif cancel_event.is_set():
+                self.status_label.configure(text=f"Export cancelled after {len(results)} of {len(animations)} animations.", text_color="red")
+            else:
+                self.status_label.configure(text="All animations exported successfully!", text_color="green")
+
+        def work(report):
+            from animExport import export_all_animations
+            return export_all_animations(animations, export_dir, scene, progress=report, cancel_event=cancel_event,
+                                         output_names=output_names, prune=prune)
+
+        self.run_in_background(work, on_exported, on_progress)
+
+    def cancel_export(self):
+        """Stop the running batch export after the animation currently being exported."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.status_label.configure(text="Cancelling export...", text_color="red")
 
     def select_export_directory(self):
         self.export_dir = filedialog.askdirectory(title="Select Custom Export Directory")
@@ -467,17 +929,22 @@ class FBXToAnimConverterApp:
         else:
             self.apply_blue_theme()
 
-# Set up the main Tkinter window
-root = ctk.CTk()
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    # Set up the main Tkinter window
+    root = ctk.CTk()
 
-# Override the close button to ensure it properly closes the app
-def on_closing():
-    # Save window position before quitting
-    app.save_settings()
-    root.quit()  # Ends the mainloop properly, avoiding task killing issues
+    # Override the close button to ensure it properly closes the app
+    def on_closing():
+        # Save window position before quitting
+        app.save_settings()
+        if app.scene_cache is not None and not app.busy:
+            app.scene_cache.clear()  # Release the FBX SDK objects of every loaded scene (unless a worker still uses one)
+        root.quit()  # Ends the mainloop properly, avoiding task killing issues
 
 
-root.protocol("WM_DELETE_WINDOW", on_closing)
+    root.protocol("WM_DELETE_WINDOW", on_closing)
 
-app = FBXToAnimConverterApp(root)
-root.mainloop()
+    app = FBXToAnimConverterApp(root)
+    root.mainloop()
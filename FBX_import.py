@@ -1,24 +1,206 @@
-from fbx import FbxManager, FbxScene, FbxImporter, FbxAnimStack, FbxCriteria
+import os
+import logging
+import threading
+from collections import namedtuple, OrderedDict
+from fbx import FbxManager, FbxScene, FbxImporter, FbxAnimStack, FbxCriteria, FbxNode
+from animCurves import CHANNELS, CurvePool
+from animMetrics import span, count
 
-def load_fbx_animations(fbx_file):
+logger = logging.getLogger(__name__)
+
+# Default bounds of a SceneCache
+DEFAULT_MAX_SCENES = 4
+DEFAULT_MAX_SCENE_BYTES = 2 * 1024 ** 3  # 2 GiB
+
+# Rough in-memory size of an imported scene relative to the size of its FBX file
+SCENE_BYTES_PER_FILE_BYTE = 4
+
+# One row of the skeleton table, in scene node order
+SkeletonEntry = namedtuple("SkeletonEntry", ["node", "name", "child_count", "parent", "is_skeleton"])
+
+class SceneHandle:
+    """
+    A loaded FBX scene together with lookup tables that are built once at load time
+    and reused by every export.
+
+    A handle restored from the extraction cache has no scene at all: its takes are served
+    from the cached clips instead.
+
+    Attributes:
+        scene (FbxScene): The FBX scene, or None if the handle was restored from the extraction cache.
+        fbx_file (str): Path of the FBX file the scene was loaded from, if known.
+        stacks (dict): Mapping of animation stack name to FbxAnimStack.
+        skeleton (list): SkeletonEntry for every node in the scene, in scene order.
+        nodes_by_name (dict): Mapping of node name to its SkeletonEntry (first node wins on duplicates).
+        clips (dict): Mapping of animation name to an already extracted AnimationClip.
+        cache (ExtractionCache): The extraction cache the handle was loaded through, if any.
+        manager (FbxManager): The manager owning the scene, released by destroy().
+        curve_pool (CurvePool): Curves extracted by the running export batch, shared by every take that repeats
+            them, or None outside of a batch (see animExport.export_all_animations).
+        rest_poses (dict): Bone name to its rest value per channel index (see get_rest_pose). Kept by destroy().
+    """
+
+    def __init__(self, scene, fbx_file=None, clips=None, cache=None, manager=None, rest_poses=None):
+        self.scene = scene
+        self.manager = manager
+        self.fbx_file = fbx_file
+        self.clips = clips or {}
+        self.cache = cache
+        self.curve_pool = None
+        self.stacks = build_stack_index(scene) if scene is not None else {}
+        self.skeleton = build_skeleton_table(scene) if scene is not None else []
+        self.nodes_by_name = {}
+        for entry in self.skeleton:
+            self.nodes_by_name.setdefault(entry.name, entry)
+        if rest_poses is None:
+            rest_poses = {name: get_rest_pose(entry.node) for name, entry in self.nodes_by_name.items()}
+        self.rest_poses = rest_poses
+
+    def find_stack(self, name):
+        """Return the animation stack with the given name, or None."""
+        return self.stacks.get(name)
+
+    def get_child_count(self, bone_name):
+        """Return the child count of the named node, or 0 if the node is unknown."""
+        entry = self.nodes_by_name.get(bone_name)
+        return entry.child_count if entry else 0
+
+    def estimated_bytes(self):
+        """Estimate the memory held by the handle: the imported scene (from its file size), extracted clips and pooled curves."""
+        total = sum(clip.nbytes for clip in self.clips.values())
+        if self.curve_pool is not None:
+            total += self.curve_pool.nbytes
+        if self.scene is not None and self.fbx_file is not None:
+            total += os.path.getsize(self.fbx_file) * SCENE_BYTES_PER_FILE_BYTE
+        return total
+
+    def destroy(self):
+        """
+        Release the FBX SDK objects of the scene.
+
+        Takes that were already extracted into clips can still be exported afterwards, nothing else.
+        Whoever loads a scene releases it: SceneCache in the GUI, animConvert.convert_file on the
+        command line and in the watch service, and every parallel export worker when it exits.
+        """
+        if self.scene is not None:
+            self.scene.Destroy()
+        if self.manager is not None:
+            self.manager.Destroy()
+        self.scene = None
+        self.manager = None
+        self.stacks = {}
+        self.skeleton = []
+        self.nodes_by_name = {}
+
+def as_scene_handle(scene):
+    """
+    Wrap a raw FbxScene in a SceneHandle, or return the argument if it already is one.
+
+    Args:
+        scene (FbxScene or SceneHandle): The scene to wrap.
+
+    Returns:
+        SceneHandle: A handle for the scene.
+    """
+    if isinstance(scene, SceneHandle):
+        return scene
+    return SceneHandle(scene)
+
+def get_rest_pose(node):
+    """
+    Read a node's rest pose: its local transform as stored on the node, outside of any animation.
+
+    Args:
+        node (FbxNode): The node (bone).
+
+    Returns:
+        tuple: The rest value of every channel, in channel index order.
+    """
+    properties = {"translate": node.LclTranslation.Get(), "rotate": node.LclRotation.Get(), "scale": node.LclScaling.Get()}
+    return tuple(float(properties[transform]["XYZ".index(axis)]) for transform, axis in CHANNELS)
+
+def build_stack_index(scene):
+    """
+    Map every animation stack in the scene by its current name.
+
+    Args:
+        scene (FbxScene): The FBX scene.
+
+    Returns:
+        dict: Mapping of stack name to FbxAnimStack (first stack wins on duplicate names).
+    """
+    stacks = {}
+    criteria = FbxCriteria.ObjectType(FbxAnimStack.ClassId)
+    for i in range(scene.GetSrcObjectCount(criteria)):
+        anim_stack = scene.GetSrcObject(criteria, i)
+        stacks.setdefault(anim_stack.GetName(), anim_stack)
+    return stacks
+
+def build_skeleton_table(scene):
+    """
+    Walk every node in the scene once and record what the exporter needs about it.
+
+    Args:
+        scene (FbxScene): The FBX scene.
+
+    Returns:
+        list: A SkeletonEntry per node, in the same order as the scene's node list.
+    """
+    skeleton = []
+    criteria = FbxCriteria.ObjectType(FbxNode.ClassId)
+    for i in range(scene.GetSrcObjectCount(criteria)):
+        node = scene.GetSrcObject(criteria, i)
+        parent = node.GetParent()
+        skeleton.append(SkeletonEntry(
+            node=node,
+            name=node.GetName(),
+            child_count=node.GetChildCount(),
+            parent=parent.GetName() if parent else None,
+            is_skeleton=node.GetSkeleton() is not None,
+        ))
+    return skeleton
+
+def load_fbx_animations(fbx_file, cache=None):
     """
     Load animations from an FBX file and rename them to remove '|' and their prefixes.
 
+    When an ExtractionCache is given and holds this file's content, the FBX import is skipped
+    entirely and the returned handle serves the cached keyframes. On a cache miss the file is
+    imported, every take is extracted once and the result is stored in the cache.
+
     Args:
         fbx_file (str): Path to the FBX file.
+        cache (ExtractionCache): Optional on-disk extraction cache.
 
     Returns:
-        tuple: A tuple containing a list of tuples with original and cleaned animation names, and the FBX scene.
+        tuple: A tuple containing a list of tuples with original and cleaned animation names, and a SceneHandle
+            for the loaded scene.
     """
+    if cache is not None:
+        with span("cache_load"):
+            cache_key = cache.key_for(fbx_file)
+            cached = cache.load(cache_key)
+        if cached is not None:
+            count("cache_hits")
+            animations_with_originals, clips, rest_poses = cached
+            logger.info("Loaded %d animations from the extraction cache for %s", len(animations_with_originals), fbx_file)
+            return animations_with_originals, SceneHandle(None, fbx_file, {clip.name: clip for clip in clips}, cache, rest_poses=rest_poses)
+        count("cache_misses")
+
     manager = FbxManager.Create()
     importer = FbxImporter.Create(manager, "")
     scene = FbxScene.Create(manager, "Scene")
 
-    if not importer.Initialize(fbx_file, -1, manager.GetIOSettings()):
-        raise Exception(f"Failed to initialize FBX importer for file: {fbx_file}")
+    with span("import"):
+        try:
+            if not importer.Initialize(fbx_file, -1, manager.GetIOSettings()):
+                raise Exception(f"Failed to initialize FBX importer for file: {fbx_file}")
 
-    if not importer.Import(scene):
-        raise Exception(f"Failed to import FBX file: {fbx_file}")
+            if not importer.Import(scene):
+                raise Exception(f"Failed to import FBX file: {fbx_file}")
+        except BaseException:
+            manager.Destroy()  # Also destroys the importer and the scene
+            raise
 
     importer.Destroy()
 
@@ -33,7 +215,90 @@ def load_fbx_animations(fbx_file):
         anim_stack.SetName(cleaned_name)  # Rename the animation in memory
         animations_with_originals.append((original_name, cleaned_name))
 
-    return animations_with_originals, scene
+    # Build the stack map and skeleton table once, after the stacks have been renamed
+    with span("scene_index"):
+        handle = SceneHandle(scene, fbx_file, cache=cache, manager=manager)
+    logger.info("Loaded %d animations from %s", len(animations_with_originals), fbx_file)
+
+    if cache is not None:
+        from animExport import get_animation_clip
+        handle.curve_pool = CurvePool()
+        clips = [get_animation_clip(cleaned_name, handle) for _, cleaned_name in animations_with_originals]
+        handle.curve_pool = None  # The clips keep the shared curves
+        handle.clips = {clip.name: clip for clip in clips}
+        with span("cache_store"):
+            cache.store(cache_key, animations_with_originals, clips, handle.rest_poses)
+
+    return animations_with_originals, handle
+
+class SceneCache:
+    """
+    Recently loaded FBX scenes, so re-opening a file does not import it again.
+
+    The cache owns the scenes it holds: the least recently used ones are released with
+    SceneHandle.destroy() once there are more than max_scenes or their estimated memory exceeds
+    max_bytes. A file is loaded again if its size or modification time changed. The most recently
+    loaded scene is never evicted, so the caller's current scene stays valid; callers must not keep
+    using older handles after loading further files.
+    """
+
+    def __init__(self, max_scenes=DEFAULT_MAX_SCENES, max_bytes=DEFAULT_MAX_SCENE_BYTES):
+        """
+        Args:
+            max_scenes (int): Maximum number of scenes kept loaded.
+            max_bytes (int): Maximum estimated memory of all kept scenes in bytes.
+        """
+        self.max_scenes = max_scenes
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (path, size, mtime_ns) -> (animations_with_originals, SceneHandle, estimated bytes)
+        self._lock = threading.Lock()
+
+    def load(self, fbx_file, cache=None):
+        """
+        Load an FBX file through the cache, with the same arguments and result as load_fbx_animations.
+        """
+        path = os.path.abspath(fbx_file)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                count("scene_cache_hits")
+                logger.info("Reusing the loaded scene of %s", fbx_file)
+                return entry[0], entry[1]
+
+        animations_with_originals, handle = load_fbx_animations(fbx_file, cache)
+
+        with self._lock:
+            # Older versions of the file are outdated now
+            for stale in [other for other in self.entries if other[0] == path]:
+                self._release(stale)
+            self.entries[key] = (animations_with_originals, handle, handle.estimated_bytes())
+            self._evict(keep=key)
+        return animations_with_originals, handle
+
+    def clear(self):
+        """Release every cached scene."""
+        with self._lock:
+            for key in list(self.entries):
+                self._release(key)
+
+    def _evict(self, keep):
+        while len(self.entries) > 1:
+            total = sum(estimated for _, _, estimated in self.entries.values())
+            if len(self.entries) <= self.max_scenes and total <= self.max_bytes:
+                break
+            oldest = next(iter(self.entries))
+            if oldest == keep:
+                break
+            self._release(oldest)
+
+    def _release(self, key):
+        _, handle, _ = self.entries.pop(key)
+        logger.debug("Releasing the scene of %s", handle.fbx_file)
+        handle.destroy()
 
 def clean_animation_name(name):
     """
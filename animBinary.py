@@ -0,0 +1,324 @@
+import sys
+import mmap
+import argparse
+import numpy as np
+from animCurves import CHANNEL_COUNT, ChannelCurve, AnimationClip, get_end_time, pack_clips, unpack_clips
+from animWriter import atomic_write, write_anim_file
+
+# File signature and format version of .animb files
+MAGIC = b"ANIMBIN\0"
+FORMAT_VERSION = 1
+
+# Every section starts at a multiple of this, so arrays can be viewed in place from a memory map
+SECTION_ALIGNMENT = 16
+
+# Value storage: 32-bit floats (compact), 64-bit floats (lossless) or 16-bit integers quantized per channel
+VALUE_FORMATS = {"float32": np.dtype("<f4"), "float64": np.dtype("<f8"), "uint16": np.dtype("<u2")}
+QUANTIZED_MAX = np.iinfo(np.uint16).max
+
+# Fixed-size file header, followed by the name blob, the bone table, the channel table, all key times and all key values
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("value_format", "S8"),
+    ("time_unit", "S16"),
+    ("start_time", "<i8"),
+    ("end_time", "<i8"),
+    ("bone_count", "<u4"),
+    ("channel_count", "<u4"),
+    ("key_count", "<u8"),
+    ("names_offset", "<u8"),
+    ("names_size", "<u8"),
+    ("bones_offset", "<u8"),
+    ("channels_offset", "<u8"),
+    ("times_offset", "<u8"),
+    ("values_offset", "<u8"),
+])
+
+# One row per bone: its name as a slice of the name blob and its channels as a slice of the channel table
+BONE_DTYPE = np.dtype([
+    ("name_offset", "<u4"),
+    ("name_size", "<u4"),
+    ("child_count", "<u4"),
+    ("first_channel", "<u4"),
+    ("channel_count", "<u4"),
+])
+
+# One row per channel: its keys as a slice of the time/value arrays; value = offset + stored * scale
+CHANNEL_DTYPE = np.dtype([
+    ("channel_index", "<u4"),
+    ("bone", "<u4"),
+    ("first_key", "<u8"),
+    ("key_count", "<u8"),
+    ("scale", "<f8"),
+    ("offset", "<f8"),
+])
+
+TIME_DTYPE = np.dtype("<i4")
+
+def _align(position):
+    return -(-position // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+def _quantize(values):
+    """Map a channel's values onto the full uint16 range, returning (stored values, scale, offset)."""
+    low, high = float(values.min()), float(values.max())
+    scale = (high - low) / QUANTIZED_MAX if high > low else 0.0
+    if scale == 0.0:
+        return np.zeros(len(values), dtype=VALUE_FORMATS["uint16"]), 0.0, low
+    return np.round((values - low) / scale).astype(VALUE_FORMATS["uint16"]), scale, low
+
+def write_binary_file(save_path, keyframe_data, start_time, end_time, precision=None, time_unit="pal", value_format="float32"):
+    """
+    Write keyframes to a binary .animb file atomically.
+
+    Takes the same keyframe data as animWriter.write_anim_file. All key times and values end up in
+    two contiguous arrays, addressed through the bone and channel tables, so a loader can map the
+    file and use them without parsing or copying.
+
+    Args:
+        save_path (str): The path to save the .animb file.
+        keyframe_data (list): (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+        start_time (int): First frame of the animation.
+        end_time (int): Last frame of the animation.
+        precision (int): Number of decimals to round values to, or None to keep full precision.
+        time_unit (str): The .anim timeUnit matching the frame rate of the keys.
+        value_format (str): "float32", "float64" (lossless) or "uint16" (quantized per channel).
+
+    Returns:
+        int: Number of bytes written.
+    """
+    value_dtype = VALUE_FORMATS[value_format]
+    names = bytearray()
+    bones = np.zeros(len(keyframe_data), dtype=BONE_DTYPE)
+    channel_rows = []
+    times = []
+    values = []
+    key_count = 0
+
+    for bone, (bone_name, child_count, channels) in enumerate(keyframe_data):
+        encoded = bone_name.encode("utf-8")
+        bones[bone] = (len(names), len(encoded), child_count, len(channel_rows), 0)
+        names += encoded
+        for channel_index, curve in enumerate(channels):
+            if curve is None or not len(curve):
+                continue
+            channel_values = curve.values if precision is None else np.round(curve.values, precision) + 0.0
+            scale, offset = 1.0, 0.0
+            if value_format == "uint16":
+                channel_values, scale, offset = _quantize(channel_values)
+            channel_rows.append((channel_index, bone, key_count, len(curve), scale, offset))
+            times.append(curve.times.astype(TIME_DTYPE))
+            values.append(channel_values.astype(value_dtype))
+            key_count += len(curve)
+        bones["channel_count"][bone] = len(channel_rows) - bones["first_channel"][bone]
+
+    channels = np.array(channel_rows, dtype=CHANNEL_DTYPE)
+    times = np.concatenate(times) if times else np.empty(0, dtype=TIME_DTYPE)
+    values = np.concatenate(values) if values else np.empty(0, dtype=value_dtype)
+
+    # Lay out the sections one after another, each aligned
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    sections = [("names_offset", bytes(names)), ("bones_offset", bones), ("channels_offset", channels), ("times_offset", times), ("values_offset", values)]
+    position = HEADER_DTYPE.itemsize
+    for field, data in sections:
+        position = _align(position)
+        header[field] = position
+        position += len(data) if isinstance(data, bytes) else data.nbytes
+
+    header["magic"] = MAGIC
+    header["version"] = FORMAT_VERSION
+    header["value_format"] = value_format.encode("ascii")
+    header["time_unit"] = time_unit.encode("ascii")
+    header["start_time"] = start_time
+    header["end_time"] = end_time
+    header["bone_count"] = len(bones)
+    header["channel_count"] = len(channels)
+    header["key_count"] = key_count
+    header["names_size"] = len(names)
+
+    written = 0
+    with atomic_write(save_path, binary=True) as file:
+        written += file.write(header.tobytes())
+        for field, data in sections:
+            written += file.write(b"\0" * (int(header[field][0]) - written))
+            written += file.write(data if isinstance(data, bytes) else data.tobytes())
+    return written
+
+class BinaryAnimation:
+    """
+    A memory-mapped .animb file.
+
+    The tables and key arrays are read-only numpy views into the mapping; nothing is parsed or copied
+    until a channel is decoded. Close the file (or use it as a context manager) when done.
+
+    Attributes:
+        header (np.void): The file header (see HEADER_DTYPE).
+        names (bytes-like): The bone name blob.
+        bones (np.ndarray): The bone table (see BONE_DTYPE).
+        channels (np.ndarray): The channel table (see CHANNEL_DTYPE).
+        times (np.ndarray): Key times of every channel, int32 frames.
+        values (np.ndarray): Stored key values of every channel, in the file's value format.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = np.frombuffer(self._map, dtype=HEADER_DTYPE, count=1).copy()[0]
+        if header["magic"] != MAGIC.rstrip(b"\0") or header["version"] != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"Not a version {FORMAT_VERSION} .animb file: {path}")
+
+        self.header = header
+        self.value_format = header["value_format"].decode("ascii")
+        self.time_unit = header["time_unit"].decode("ascii")
+        self.start_time = int(header["start_time"])
+        self.end_time = int(header["end_time"])
+        self.names = memoryview(self._map)[header["names_offset"]:header["names_offset"] + header["names_size"]]
+        self.bones = self._view("bones_offset", BONE_DTYPE, header["bone_count"])
+        self.channels = self._view("channels_offset", CHANNEL_DTYPE, header["channel_count"])
+        self.times = self._view("times_offset", TIME_DTYPE, header["key_count"])
+        self.values = self._view("values_offset", VALUE_FORMATS[self.value_format], header["key_count"])
+
+    def _view(self, field, dtype, count):
+        return np.frombuffer(self._map, dtype=dtype, count=int(count), offset=int(self.header[field]))
+
+    def bone_name(self, bone):
+        """Return the name of the bone at the given row of the bone table."""
+        row = self.bones[bone]
+        return bytes(self.names[row["name_offset"]:row["name_offset"] + row["name_size"]]).decode("utf-8")
+
+    def decode_channel(self, channel):
+        """
+        Decode one row of the channel table into a ChannelCurve (dequantizing if needed).
+
+        Args:
+            channel (int): Row of the channel table.
+
+        Returns:
+            ChannelCurve: The channel's keys as int64 frames and float64 values.
+        """
+        row = self.channels[channel]
+        keys = slice(int(row["first_key"]), int(row["first_key"] + row["key_count"]))
+        values = self.values[keys].astype(np.float64)
+        if self.value_format == "uint16":
+            values = row["offset"] + values * row["scale"]
+        return ChannelCurve(self.times[keys], values)
+
+    def to_clip(self, name):
+        """
+        Decode the whole file into an AnimationClip in the exporter's layout.
+
+        Args:
+            name (str): Name of the clip.
+
+        Returns:
+            AnimationClip: The clip, bones in file order.
+        """
+        bones = []
+        for bone in range(len(self.bones)):
+            row = self.bones[bone]
+            channels = [None] * CHANNEL_COUNT
+            for channel in range(row["first_channel"], row["first_channel"] + row["channel_count"]):
+                channels[self.channels[channel]["channel_index"]] = self.decode_channel(channel)
+            bones.append((self.bone_name(bone), int(row["child_count"]), channels))
+        return AnimationClip(name, bones)
+
+    def close(self):
+        """Unmap the file. Views taken from the tables or key arrays must not be used afterwards."""
+        if self.names is not None:
+            self.names.release()
+        # Drop the views before closing the mapping they point into
+        self.names = self.bones = self.channels = self.times = self.values = None
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_pack_file(save_path, clips, metadata=None):
+    """
+    Write several takes to a single .animpack file atomically.
+
+    The file is a numpy .npz archive of animCurves.pack_clips: every unique channel is stored once
+    and each take references the channels it uses, so takes sharing channels cost no extra space.
+
+    Args:
+        save_path (str): The path to save the .animpack file.
+        clips (list): AnimationClip objects, bones in the order they are written to .anim files.
+        metadata (dict): Extra JSON-serializable data stored with the takes, e.g. the time unit.
+
+    Returns:
+        int: Number of unique channels stored.
+    """
+    arrays = pack_clips(clips, metadata)
+    with atomic_write(save_path, binary=True) as file:
+        np.savez(file, **arrays)
+    return len(arrays["counts"])
+
+def read_pack_file(path):
+    """
+    Read the takes of a .animpack file.
+
+    Args:
+        path (str): The .animpack file.
+
+    Returns:
+        tuple: (list of AnimationClip, metadata dict). Channels shared between takes are the same ChannelCurve object.
+    """
+    with np.load(path, allow_pickle=False) as arrays:
+        return unpack_clips({name: arrays[name] for name in arrays.files})
+
+def anim_to_binary(anim_path, binary_path, value_format="float64"):
+    """
+    Convert a text .anim file to .animb.
+
+    With the default float64 values the conversion is lossless: binary_to_anim gives back the same text.
+
+    Args:
+        anim_path (str): The .anim file to read.
+        binary_path (str): The .animb file to write.
+        value_format (str): Value storage of the binary file (see VALUE_FORMATS).
+
+    Returns:
+        int: Number of bytes written.
+    """
+    from animReader import read_anim_file
+    header, clip = read_anim_file(anim_path)
+    start_time = int(header.get("startTime", 0))
+    end_time = int(header.get("endTime", get_end_time(clip.bones) or 0))
+    return write_binary_file(binary_path, clip.bones, start_time, end_time, None, header.get("timeUnit", "pal"), value_format)
+
+def binary_to_anim(binary_path, anim_path, precision=None):
+    """
+    Convert a .animb file to text .anim.
+
+    Args:
+        binary_path (str): The .animb file to read.
+        anim_path (str): The .anim file to write.
+        precision (int): Number of decimals for values, or None to keep full precision.
+
+    Returns:
+        int: Number of characters written.
+    """
+    with BinaryAnimation(binary_path) as animation:
+        clip = animation.to_clip("")
+        return write_anim_file(anim_path, clip.bones, animation.start_time, animation.end_time, precision, animation.time_unit)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="animBinary", description="Convert between text .anim and binary .animb files.")
+    parser.add_argument("input", help=".anim or .animb file")
+    parser.add_argument("output", help="file to write, in the other format")
+    parser.add_argument("--values", choices=sorted(VALUE_FORMATS), default="float64", help="value storage when writing .animb (default: %(default)s, lossless)")
+    parser.add_argument("--precision", type=int, default=None, help="decimals written when converting to .anim (default: full precision)")
+    args = parser.parse_args(argv)
+
+    if args.input.lower().endswith(".animb"):
+        binary_to_anim(args.input, args.output, args.precision)
+    else:
+        anim_to_binary(args.input, args.output, args.values)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import os
+import json
+import hashlib
+import zipfile
+import tempfile
+import numpy as np
+from animCurves import EXPORTER_VERSION, pack_clips, unpack_clips
+
+# Default cache location and size limit
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".animCreator", "cache")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted keyframes, so repeat exports of an unchanged FBX file skip the FBX import.
+
+    Entries are keyed by a content hash of the FBX file, the exporter version and the extraction
+    settings. File hashes are remembered by path, size and modification time so an unchanged file is
+    not re-hashed. The least recently used entries are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): Directory holding the cache (default is ~/.animCreator/cache).
+            max_bytes (int): Maximum total size of cached entries in bytes.
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+
+    def key_for(self, fbx_file, settings=None):
+        """
+        Compute the cache key for an FBX file.
+
+        Args:
+            fbx_file (str): Path to the FBX file.
+            settings (dict): Extraction settings that change the extracted data.
+
+        Returns:
+            str: The cache key.
+        """
+        key = hashlib.blake2b(digest_size=16)
+        key.update(self.file_digest(fbx_file).encode("ascii"))
+        key.update(EXPORTER_VERSION.encode("ascii"))
+        key.update(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+        return key.hexdigest()
+
+    def file_digest(self, fbx_file):
+        """
+        Hash the content of a file, reusing the stored digest if its size and modification time are unchanged.
+
+        Args:
+            fbx_file (str): Path to the file.
+
+        Returns:
+            str: Hex digest of the file content.
+        """
+        path = os.path.abspath(fbx_file)
+        stat = os.stat(path)
+        index = self._read_index()
+        known = index.get(path)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["digest"]
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+        index[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest.hexdigest()}
+        self._write_index(index)
+        return index[path]["digest"]
+
+    def load(self, key):
+        """
+        Load a cached extraction.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            tuple: (animations_with_originals, list of AnimationClip, rest poses by bone name), or None on a cache miss.
+        """
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                clips, metadata = unpack_clips({name: arrays[name] for name in arrays.files})
+            os.utime(path)  # Mark as recently used for eviction
+        except FileNotFoundError:
+            return None  # Not cached, or evicted by another process while loading
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            self._discard(path)  # Truncated or corrupt entry
+            return None
+
+        rest_poses = {bone_name: tuple(rest) for bone_name, rest in metadata["rest_poses"].items()}
+        return [tuple(names) for names in metadata["animations"]], clips, rest_poses
+
+    def store(self, key, animations_with_originals, clips, rest_poses=None):
+        """
+        Store an extraction and evict old entries if the cache is over its size limit.
+
+        Args:
+            key (str): The cache key.
+            animations_with_originals (list): (original name, cleaned name) tuples of the file's takes.
+            clips (list): AnimationClip objects of the file's takes.
+            rest_poses (dict): Bone name to rest value per channel index (see SceneHandle.rest_poses).
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        metadata = {"animations": [list(names) for names in animations_with_originals], "rest_poses": rest_poses or {}}
+        arrays = pack_clips(clips, metadata)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes, and forget the hashes of deleted FBX files."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+        # The hash index has a record per FBX file ever cached, so it would otherwise keep growing
+        index = self._read_index()
+        existing = {path: known for path, known in index.items() if os.path.exists(path)}
+        if len(existing) != len(index):
+            self._write_index(existing)
+
+    def clear(self):
+        """Remove every cached entry and the file hash index."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npz") or entry.name == "index.json":
+                os.unlink(entry.path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _discard(self, path):
+        """Delete a cache entry, ignoring entries that are already gone."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(temp_path, self.index_path)
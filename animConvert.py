@@ -0,0 +1,352 @@
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import fnmatch
+import argparse
+from animMetrics import get_report, reset_report
+
+logger = logging.getLogger(__name__)
+
+# Default output layout: one folder per FBX file, one .anim (or binary .animb) per take
+DEFAULT_LAYOUT = "{fbx}/{take}.anim"
+DEFAULT_BINARY_LAYOUT = "{fbx}/{take}.animb"
+
+# Pack file of all takes of an FBX file, relative to the output directory
+PACK_LAYOUT = "{fbx_dir}/{fbx}.animpack"
+
+def find_fbx_files(paths):
+    """
+    Expand files and directory trees into a sorted list of FBX files.
+
+    Args:
+        paths (list): FBX file paths and/or directories to search recursively.
+
+    Returns:
+        list: (fbx_file, root) tuples, root being the directory the file was found under ("." for a bare file name).
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, files in os.walk(path):
+                for name in files:
+                    if name.lower().endswith(".fbx"):
+                        found.append((os.path.join(directory, name), path))
+        else:
+            found.append((path, os.path.dirname(path) or os.curdir))
+    return sorted(found)
+
+def select_takes(animations, include=None, exclude=None):
+    """
+    Filter take names with glob patterns.
+
+    Args:
+        animations (list): Cleaned take names.
+        include (list): Glob patterns a take must match at least one of (default is every take).
+        exclude (list): Glob patterns of takes to leave out.
+
+    Returns:
+        list: The selected take names, in their original order.
+    """
+    selected = []
+    for anim in animations:
+        if include and not any(fnmatch.fnmatchcase(anim, pattern) for pattern in include):
+            continue
+        if exclude and any(fnmatch.fnmatchcase(anim, pattern) for pattern in exclude):
+            continue
+        selected.append(anim)
+    return selected
+
+def output_path(output_dir, relative_path):
+    """
+    Join a path from the layout to the output directory.
+
+    Args:
+        output_dir (str): Root directory for the exported files.
+        relative_path (str): The expanded layout path.
+
+    Returns:
+        str: The normalized output path.
+
+    Raises:
+        ValueError: If the path leads outside output_dir, e.g. because it is absolute or goes up with "..".
+    """
+    path = os.path.normpath(os.path.join(output_dir, relative_path))
+    base = os.path.abspath(output_dir)
+    try:
+        inside = os.path.commonpath([base, os.path.abspath(path)]) == base
+    except ValueError:  # Different drives
+        inside = False
+    if not inside:
+        raise ValueError(f"Output path {relative_path} is outside the output directory {output_dir}")
+    return path
+
+def read_clip_ranges(path):
+    """
+    Read the clips to cut out of takes from a CSV file.
+
+    Every row is "take,clip,first frame,last frame", frames being at the original frame rate. A first
+    row without frame numbers is a header; empty rows and rows starting with "#" are skipped.
+
+    Args:
+        path (str): The CSV file.
+
+    Returns:
+        dict: Take name to a list of (clip name, first frame, last frame) tuples, in file order.
+
+    Raises:
+        ValueError: If a row is malformed, a range does not end after it starts or a clip name is used twice.
+    """
+    clip_ranges = {}
+    clip_names = set()
+    first_row = True
+    with open(path, newline="") as f:
+        for line_number, row in enumerate(csv.reader(f), 1):
+            row = [value.strip() for value in row]
+            if not any(row) or row[0].startswith("#"):
+                continue
+            is_first_row, first_row = first_row, False
+            if len(row) != 4:
+                raise ValueError(f"{path}:{line_number}: expected take,clip,first frame,last frame")
+            take, clip, start, end = row
+            try:
+                start, end = int(start), int(end)
+            except ValueError:
+                if is_first_row:
+                    continue  # Header
+                raise ValueError(f"{path}:{line_number}: frames must be whole numbers")
+            if end <= start:
+                raise ValueError(f"{path}:{line_number}: clip {clip} must end after its first frame")
+            # Clips are written under their own name, so two clips of one name would overwrite each other
+            if clip in clip_names:
+                raise ValueError(f"{path}:{line_number}: clip name {clip} is used twice")
+            clip_names.add(clip)
+            clip_ranges.setdefault(take, []).append((clip, start, end))
+    return clip_ranges
+
+def convert_files(paths, output_dir, include=None, exclude=None, layout=None, original_fps=25, target_fps=25,
+                  workers=1, precision=None, cache_dir=None, use_cache=True, reduce_tolerances=None, incremental=False, bake=False,
+                  binary_values=None, pack=False, stream=False, prune=None, clip_ranges=None):
+    """
+    Convert FBX files to .anim files without any GUI.
+
+    Args:
+        paths (list): FBX files and/or directories to search recursively.
+        output_dir (str): Root directory for the exported files.
+        include (list): Glob patterns of take names to export (default is every take).
+        exclude (list): Glob patterns of take names to skip.
+        layout (str): Output path template relative to output_dir. Fields: {fbx} (FBX file name without
+            extension), {fbx_dir} (FBX directory relative to the searched directory) and {take}. Default is
+            DEFAULT_LAYOUT, or DEFAULT_BINARY_LAYOUT for binary output.
+        original_fps (int): Original FPS of animations.
+        target_fps (int): Desired FPS of exported animations.
+        workers (int): Number of worker processes per FBX file (None uses every CPU).
+        precision (int): Number of decimals written for key values (default is None, full precision).
+        cache_dir (str): Extraction cache directory (default is the shared user cache).
+        use_cache (bool): Whether to use the on-disk extraction cache.
+        reduce_tolerances (dict): Per-transform key reduction tolerances, or None to write every key.
+        incremental (bool): Only rewrite takes that changed since the last incremental export to output_dir.
+        bake (bool): Evaluate constant and cubic curves on every frame instead of writing their raw keys.
+        binary_values (str): None for text .anim files, or the value format ("float32", "float64", "uint16")
+            of binary .animb files.
+        pack (bool): Also write the takes of each FBX file to one .animpack file (see PACK_LAYOUT) in which
+            channels shared between takes are stored once.
+        stream (bool): Export one bone at a time so memory stays bounded on very long takes. The extraction
+            cache is not used, since storing it needs every take in memory.
+        prune (str): Leave out channels and bones that never leave their rest pose ("rest"), or also bones
+            held still in any pose ("static"); None exports every animated bone. What was left out is listed
+            per take under "pruned" in the summary.
+        clip_ranges (dict): Take name to (clip name, first frame, last frame) tuples (see read_clip_ranges). Only takes
+            with ranges are exported then, one file per clip, {take} in the layout being the clip name.
+
+    Returns:
+        dict: A machine-readable summary of the run. Timings and counters of the run are collected
+            in animMetrics.get_report().
+    """
+    cache = create_cache(cache_dir, use_cache, stream)
+    reset_report()
+    started = time.perf_counter()
+    summary = {"files": [], "exported": 0, "failed": 0}
+
+    for fbx_file, root in find_fbx_files(paths):
+        file_summary = convert_file(fbx_file, root, output_dir, cache, include, exclude, layout, original_fps, target_fps,
+                                    workers, precision, reduce_tolerances, incremental, bake, binary_values, pack, stream, prune, clip_ranges)
+        summary["files"].append(file_summary)
+        if file_summary["error"]:
+            summary["failed"] += 1
+        for take in file_summary["takes"]:
+            summary["failed" if take["error"] else "exported"] += 1
+
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+def create_cache(cache_dir=None, use_cache=True, stream=False):
+    """Create the extraction cache convert_file uses, or return None if it is disabled (streaming never uses it)."""
+    if not use_cache or stream:
+        return None
+    from animCache import ExtractionCache
+    return ExtractionCache(cache_dir)
+
+def convert_file(fbx_file, root, output_dir, cache=None, include=None, exclude=None, layout=None, original_fps=25, target_fps=25,
+                 workers=1, precision=None, reduce_tolerances=None, incremental=False, bake=False, binary_values=None, pack=False,
+                 stream=False, prune=None, clip_ranges=None):
+    """
+    Convert the takes of one FBX file (see convert_files for the options).
+
+    Args:
+        fbx_file (str): The FBX file.
+        root (str): Directory {fbx_dir} in the layout is relative to, or None for the FBX file's own directory.
+        output_dir (str): Root directory for the exported files.
+        cache (ExtractionCache): The extraction cache to load through (see create_cache), or None.
+
+    Returns:
+        dict: The file's entry of the convert_files summary: "fbx", "takes" (name, path, error and pruning
+            report of each exported take), "pack" and "error" (set if the file could not be loaded or the
+            layout leads outside output_dir).
+    """
+    # Imported here so the command line starts without loading the FBX SDK until there is work to do
+    from FBX_import import load_fbx_animations
+    from animExport import export_all_animations
+
+    if layout is None:
+        layout = DEFAULT_BINARY_LAYOUT if binary_values else DEFAULT_LAYOUT
+    file_summary = {"fbx": fbx_file, "takes": [], "pack": None, "error": None}
+    try:
+        animations_with_originals, scene = load_fbx_animations(fbx_file, cache)
+    except Exception as e:
+        file_summary["error"] = f"{type(e).__name__}: {e}"
+        logger.error("Failed to load %s: %s", fbx_file, file_summary["error"])
+        return file_summary
+
+    # The scene is released once its takes are exported; a long-running caller (animWatch) must not accumulate scenes
+    try:
+        animations = select_takes([cleaned for _, cleaned in animations_with_originals], include, exclude)
+        if clip_ranges is not None:
+            animations = [anim for anim in animations if anim in clip_ranges]
+        if not animations:
+            return file_summary
+
+        fbx_name = os.path.splitext(os.path.basename(fbx_file))[0]
+        fbx_dir = os.path.relpath(os.path.dirname(fbx_file) or os.curdir, root) if root else os.curdir
+        name_template = layout.format(
+            fbx=fbx_name.replace("{", "{{").replace("}", "}}"),
+            fbx_dir=fbx_dir.replace("{", "{{").replace("}", "}}"),
+            take="{anim}",
+        )
+
+        # Refuse layouts that would write anywhere but below output_dir before anything is written
+        output_names = [clip[0] for anim in animations for clip in clip_ranges[anim]] if clip_ranges is not None else animations
+        try:
+            for output_name in output_names:
+                output_path(output_dir, name_template.format(anim=output_name))
+            pack_path = output_path(output_dir, PACK_LAYOUT.format(fbx=fbx_name, fbx_dir=fbx_dir)) if pack else None
+        except ValueError as e:
+            file_summary["error"] = str(e)
+            logger.error("Failed to convert %s: %s", fbx_file, e)
+            return file_summary
+
+        if pack_path is not None:
+            os.makedirs(os.path.dirname(pack_path), exist_ok=True)
+
+        pruned = {}
+        results = export_all_animations(animations, output_dir, scene, original_fps, target_fps,
+                                        workers=workers, precision=precision, name_template=name_template,
+                                        reduce_tolerances=reduce_tolerances, incremental=incremental, bake=bake,
+                                        binary_values=binary_values, pack_path=pack_path, stream=stream,
+                                        prune=prune, pruned=pruned, clip_ranges=clip_ranges)
+        if pack_path is not None and not any(error for _, _, error in results):
+            file_summary["pack"] = pack_path
+        for anim, save_path, error in results:
+            file_summary["takes"].append({"name": anim, "path": save_path, "error": error, "pruned": pruned.get(anim)})
+        return file_summary
+    finally:
+        scene.destroy()
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="animConvert", description="Convert FBX animation takes to Maya .anim files.")
+    parser.add_argument("inputs", nargs="+", help="FBX files or directories to search recursively")
+    parser.add_argument("--summary", metavar="PATH", help="write a JSON summary to PATH ('-' for stdout)")
+    add_conversion_arguments(parser)
+    return parser
+
+def add_conversion_arguments(parser):
+    """Add the output and export options shared by every command that converts FBX files (see conversion_options)."""
+    parser.add_argument("-o", "--output-dir", required=True, help="root directory for the exported .anim files")
+    parser.add_argument("-t", "--take", action="append", dest="include", metavar="GLOB", help="only export takes matching this pattern (repeatable)")
+    parser.add_argument("-x", "--exclude", action="append", metavar="GLOB", help="skip takes matching this pattern (repeatable)")
+    parser.add_argument("--layout", default=None, help=f"output path template relative to --output-dir, fields {{fbx}}, {{fbx_dir}} and {{take}} (default: {DEFAULT_LAYOUT}, or {DEFAULT_BINARY_LAYOUT} with --binary)")
+    parser.add_argument("--original-fps", type=int, default=25, help="frame rate of the FBX animations (default: %(default)s)")
+    parser.add_argument("--target-fps", type=int, default=25, help="frame rate of the exported animations (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes per FBX file, 0 for every CPU (default: %(default)s)")
+    parser.add_argument("--precision", type=int, default=None, help="decimals written for key values (default: full precision)")
+    parser.add_argument("--binary", nargs="?", const="float32", choices=("float32", "float64", "uint16"), metavar="VALUES",
+                        help="write binary .animb files with float32 (default), float64 (lossless) or uint16 (quantized) values")
+    parser.add_argument("--bake", action="store_true", help="evaluate Bezier and stepped curves on every frame instead of writing their raw keys")
+    parser.add_argument("--pack", action="store_true", help="also write each FBX file's takes to one .animpack file that stores shared channels once")
+    parser.add_argument("--stream", action="store_true", help="export one bone at a time to bound memory on very long takes (disables the extraction cache)")
+    parser.add_argument("--clips", metavar="CSV", help="cut clips out of takes instead of exporting whole takes; rows: take,clip,first frame,last frame (at --original-fps); Bezier and stepped curves are baked as with --bake")
+    parser.add_argument("--prune", nargs="?", const="rest", choices=("rest", "static"), metavar="MODE",
+                        help="leave out channels and bones that never leave their rest pose; MODE 'static' also drops bones held still in any other pose (default MODE: rest)")
+    parser.add_argument("--reduce", action="store_true", help="drop keys that linear interpolation reproduces within tolerance")
+    parser.add_argument("--tolerances", type=float, nargs=3, metavar=("TRANSLATE", "ROTATE", "SCALE"), help="key reduction tolerances (implies --reduce)")
+    parser.add_argument("--incremental", action="store_true", help="only rewrite takes that changed since the last --incremental run")
+    parser.add_argument("--cache-dir", default=None, help="extraction cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the extraction cache")
+    parser.add_argument("--report", metavar="PATH", help="write per-phase timings and counters as JSON to PATH")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every take and bone")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log warnings and errors")
+
+def conversion_options(args):
+    """
+    Turn the options added by add_conversion_arguments into keyword arguments of convert_files.
+
+    Raises:
+        OSError, ValueError: If the --clips file cannot be read (see read_clip_ranges).
+    """
+    reduce_tolerances = None
+    if args.tolerances:
+        reduce_tolerances = dict(zip(("translate", "rotate", "scale"), args.tolerances))
+    elif args.reduce:
+        reduce_tolerances = {}
+
+    return dict(
+        include=args.include, exclude=args.exclude, layout=args.layout,
+        original_fps=args.original_fps, target_fps=args.target_fps, workers=args.workers or None,
+        precision=args.precision, cache_dir=args.cache_dir, use_cache=not args.no_cache,
+        reduce_tolerances=reduce_tolerances, incremental=args.incremental, bake=args.bake,
+        binary_values=args.binary, pack=args.pack, stream=args.stream, prune=args.prune,
+        clip_ranges=read_clip_ranges(args.clips) if args.clips else None,
+    )
+
+def configure_logging(args):
+    """Log to stderr at the level chosen with -v / -q, which keeps stdout clean for JSON output."""
+    level = logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO
+    logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s", stream=sys.stderr)
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    configure_logging(args)
+    try:
+        options = conversion_options(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    summary = convert_files(args.inputs, args.output_dir, **options)
+
+    if args.summary == "-":
+        json.dump(summary, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+    elif args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=4)
+    if args.report:
+        get_report().write_json(args.report)
+
+    logger.info("%d animations exported, %d failed in %ss", summary["exported"], summary["failed"], summary["seconds"])
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
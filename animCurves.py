@@ -0,0 +1,351 @@
+import json
+import hashlib
+import numpy as np
+
+# Bump whenever extraction output changes, so cached extractions are not reused
+EXPORTER_VERSION = "4"
+
+# Key times are stored as whole frames, key values as doubles: 16 bytes per key.
+TIME_DTYPE = np.int64
+VALUE_DTYPE = np.float64
+
+# FbxAnimCurveDef interpolation codes (kept here so this module does not need the FBX SDK)
+INTERPOLATION_CONSTANT = 0x02
+INTERPOLATION_LINEAR = 0x04
+INTERPOLATION_CUBIC = 0x08
+
+# FbxAnimLayer blend modes
+BLEND_ADDITIVE = 0
+BLEND_OVERRIDE = 1
+BLEND_OVERRIDE_PASSTHROUGH = 2
+
+# Transform channels in .anim channel index order (matches animExport.get_transform_key)
+CHANNELS = (
+    ("translate", "X"), ("translate", "Y"), ("translate", "Z"),
+    ("rotate", "X"), ("rotate", "Y"), ("rotate", "Z"),
+    ("scale", "X"), ("scale", "Y"), ("scale", "Z"),
+)
+CHANNEL_NAMES = tuple(f"{transform}{axis}" for transform, axis in CHANNELS)
+CHANNEL_COUNT = len(CHANNELS)
+CHANNEL_INDEX = {channel: index for index, channel in enumerate(CHANNELS)}
+
+
+class ChannelCurve:
+    """
+    Keyframes of a single transform channel (e.g. translateX) of one bone, stored as contiguous arrays.
+
+    Attributes:
+        times (np.ndarray): Key times in frames.
+        values (np.ndarray): Key values.
+        interpolation (np.ndarray or None): Per-key interpolation codes, or None if every key is linear.
+        tangents (np.ndarray or None): (n, 2) array of left/right derivatives in value per frame, or None if no key is cubic.
+
+    A curve is not modified once it has been hashed: hash_curve keeps its digest on the curve.
+    """
+    __slots__ = ("times", "values", "interpolation", "tangents", "_digest")
+
+    def __init__(self, times, values, interpolation=None, tangents=None):
+        self.times = np.asarray(times, dtype=TIME_DTYPE)
+        self.values = np.asarray(values, dtype=VALUE_DTYPE)
+        self.interpolation = interpolation
+        self.tangents = tangents
+        self._digest = None
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def nbytes(self):
+        """Memory used by the key arrays in bytes."""
+        total = self.times.nbytes + self.values.nbytes
+        if self.interpolation is not None:
+            total += self.interpolation.nbytes
+        if self.tangents is not None:
+            total += self.tangents.nbytes
+        return total
+
+    @property
+    def end_time(self):
+        """The last key time of the curve, or 0 if it has no keys."""
+        return int(self.times.max()) if len(self.times) else 0
+
+
+class AnimationClip:
+    """
+    Extracted keyframes of one take, independent of the FBX SDK.
+
+    Attributes:
+        name (str): The animation (stack) name.
+        bones (list): (bone_name, child_count, channels) tuples in scene order, channels being
+            a ChannelCurve or None per channel index.
+    """
+    __slots__ = ("name", "bones")
+
+    def __init__(self, name, bones):
+        self.name = name
+        self.bones = bones
+
+    @property
+    def nbytes(self):
+        """Memory used by all key arrays of the clip in bytes."""
+        return sum(curve.nbytes for _, _, channels in self.bones for curve in channels if curve is not None)
+
+
+def read_fbx_curve(curve):
+    """
+    Read every key of an FbxAnimCurve into a ChannelCurve.
+
+    Interpolation codes are only kept when at least one key is not linear, and
+    tangents only when at least one key is cubic. The SDK reports derivatives per
+    second; they are converted to per frame using the curve's own key times.
+
+    Args:
+        curve (FbxAnimCurve): The animation curve to read.
+
+    Returns:
+        ChannelCurve: The curve's keys, or None if the curve has no keys.
+    """
+    count = curve.KeyGetCount()
+    if count == 0:
+        return None
+
+    times = np.fromiter((curve.KeyGetTime(i).GetFrameCount() for i in range(count)), dtype=TIME_DTYPE, count=count)
+    values = np.fromiter((curve.KeyGetValue(i) for i in range(count)), dtype=VALUE_DTYPE, count=count)
+    interpolation = np.fromiter((int(curve.KeyGetInterpolation(i)) for i in range(count)), dtype=np.uint8, count=count)
+
+    tangents = None
+    if (interpolation == INTERPOLATION_CUBIC).any():
+        tangents = np.empty((count, 2), dtype=VALUE_DTYPE)
+        for i in range(count):
+            tangents[i, 0] = curve.KeyGetLeftDerivative(i)
+            tangents[i, 1] = curve.KeyGetRightDerivative(i)
+
+        # Frames per second of the time mode GetFrameCount() used, from the widest span of keys
+        span = curve.KeyGetTime(count - 1).GetSecondDouble() - curve.KeyGetTime(0).GetSecondDouble()
+        if span > 0:
+            tangents /= (times[-1] - times[0]) / span
+
+    if (interpolation == INTERPOLATION_LINEAR).all():
+        interpolation = None
+
+    return ChannelCurve(times, values, interpolation, tangents)
+
+
+def get_end_time(keyframe_data):
+    """
+    Get the last key time across all bones and channels.
+
+    Args:
+        keyframe_data (list): List of (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+
+    Returns:
+        int: The maximum key time, or None if there are no keys.
+    """
+    end_times = [curve.end_time for _, _, curves in keyframe_data for curve in curves if curve is not None and len(curve)]
+    return max(end_times) if end_times else None
+
+
+def hash_clip(clip, settings=None):
+    """
+    Hash the keyframe content of a clip together with the settings it is exported with.
+
+    Two clips get the same digest only if their bones, child counts and every key array are
+    identical and they were extracted by the same exporter version.
+
+    Args:
+        clip (AnimationClip): The clip to hash.
+        settings (dict): JSON-serializable export settings that change the written output.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = ClipDigest(settings)
+    for bone_name, child_count, channels in clip.bones:
+        digest.update(bone_name, child_count, channels)
+    return digest.hexdigest()
+
+
+class ClipDigest:
+    """
+    Incremental form of hash_clip, fed one bone at a time so a take can be hashed while it is streamed.
+    """
+
+    def __init__(self, settings=None):
+        """
+        Args:
+            settings (dict): JSON-serializable export settings that change the written output.
+        """
+        self._digest = hashlib.blake2b(digest_size=16)
+        self._digest.update(EXPORTER_VERSION.encode("ascii"))
+        self._digest.update(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+
+    def update(self, bone_name, child_count, channels):
+        """Add the next bone of the clip, in clip order."""
+        self._digest.update(json.dumps([bone_name, child_count]).encode("utf-8"))
+        for curve in channels:
+            self._digest.update(b"-" if curve is None else hash_curve(curve))
+
+    def hexdigest(self):
+        """Return the digest of the bones added so far, equal to hash_clip of a clip holding them."""
+        return self._digest.hexdigest()
+
+
+def hash_curve(curve):
+    """
+    Hash the content of a single channel: its key times, values, interpolation and tangents.
+
+    The digest is computed once per curve and kept on it, so interning, clip digests and the
+    writer's format cache all reuse it.
+
+    Args:
+        curve (ChannelCurve): The curve to hash.
+
+    Returns:
+        bytes: 16-byte digest, equal for two curves only if all their key arrays are identical.
+    """
+    if curve._digest is not None:
+        return curve._digest
+    digest = hashlib.blake2b(digest_size=16)
+    # Lengths first, so different splits of the same bytes never collide
+    digest.update(np.array([len(curve), curve.interpolation is not None, curve.tangents is not None], dtype=np.int64).tobytes())
+    for array in (curve.times, curve.values, curve.interpolation, curve.tangents):
+        if array is not None:
+            digest.update(np.ascontiguousarray(array).tobytes())
+    curve._digest = digest.digest()
+    return curve._digest
+
+
+class CurvePool:
+    """
+    Content-addressed store of curves, so identical channels share a single ChannelCurve.
+
+    Takes of one file often repeat channels exactly (static scale, untouched fingers, shared
+    idle poses). Interning them keeps one copy of each in memory, and lets anything keyed by
+    curve (the extraction cache, pack files, the writer's format cache) handle it once.
+
+    Attributes:
+        curves (dict): Content digest (see hash_curve) to the shared ChannelCurve.
+        shared (int): Number of interned curves that were already in the pool.
+    """
+
+    def __init__(self):
+        self.curves = {}
+        self.shared = 0
+
+    @property
+    def nbytes(self):
+        """Memory used by the key arrays of the pooled curves in bytes."""
+        return sum(curve.nbytes for curve in self.curves.values())
+
+    def intern(self, curve):
+        """
+        Return the pooled curve with the same content, adding this one if it is new.
+
+        Args:
+            curve (ChannelCurve): The curve to intern, or None.
+
+        Returns:
+            ChannelCurve: The shared curve (None for None).
+        """
+        if curve is None:
+            return None
+        pooled = self.curves.setdefault(hash_curve(curve), curve)
+        if pooled is not curve:
+            self.shared += 1
+        return pooled
+
+
+def pack_clips(clips, metadata=None):
+    """
+    Flatten clips into a few contiguous arrays suitable for np.savez.
+
+    Identical curves are stored once and referenced by every channel that uses them.
+
+    Args:
+        clips (list): AnimationClip objects to pack.
+        metadata (dict): Extra JSON-serializable data stored alongside the clips.
+
+    Returns:
+        dict: Array name to np.ndarray. The clip/bone/channel layout is stored as JSON in "layout".
+    """
+    curves = []
+    ids_by_object = {}
+    ids_by_digest = {}
+    layout = {"version": EXPORTER_VERSION, "metadata": metadata or {}, "clips": []}
+
+    for clip in clips:
+        bones = []
+        for bone_name, child_count, channels in clip.bones:
+            ids = []
+            for curve in channels:
+                if curve is None:
+                    ids.append(-1)
+                    continue
+                # Curves interned by a CurvePool are recognized by identity without hashing them again
+                curve_id = ids_by_object.get(id(curve))
+                if curve_id is None:
+                    curve_id = ids_by_digest.setdefault(hash_curve(curve), len(curves))
+                    if curve_id == len(curves):
+                        curves.append(curve)
+                    ids_by_object[id(curve)] = curve_id
+                ids.append(curve_id)
+            bones.append([bone_name, child_count, ids])
+        layout["clips"].append({"name": clip.name, "bones": bones})
+
+    counts = np.array([len(curve) for curve in curves], dtype=np.int64)
+    empty_times = np.empty(0, dtype=TIME_DTYPE)
+    empty_values = np.empty(0, dtype=VALUE_DTYPE)
+    interpolated = [curve.interpolation is not None for curve in curves]
+    tangential = [curve.tangents is not None for curve in curves]
+
+    return {
+        "layout": np.frombuffer(json.dumps(layout).encode("utf-8"), dtype=np.uint8),
+        "counts": counts,
+        "has_interpolation": np.array(interpolated, dtype=bool),
+        "has_tangents": np.array(tangential, dtype=bool),
+        "times": np.concatenate([curve.times for curve in curves]) if curves else empty_times,
+        "values": np.concatenate([curve.values for curve in curves]) if curves else empty_values,
+        "interpolation": np.concatenate([curve.interpolation for curve in curves if curve.interpolation is not None] or [np.empty(0, dtype=np.uint8)]),
+        "tangents": np.concatenate([curve.tangents for curve in curves if curve.tangents is not None] or [np.empty((0, 2), dtype=VALUE_DTYPE)]),
+    }
+
+
+def unpack_clips(arrays):
+    """
+    Rebuild clips from the arrays produced by pack_clips.
+
+    The returned curves are views into the packed arrays, so no key data is copied.
+
+    Args:
+        arrays (Mapping): Array name to np.ndarray, e.g. an opened np.load result.
+
+    Returns:
+        tuple: (list of AnimationClip, metadata dict).
+    """
+    layout = json.loads(bytes(arrays["layout"]).decode("utf-8"))
+    counts = arrays["counts"]
+    times = arrays["times"]
+    values = arrays["values"]
+    interpolation = arrays["interpolation"]
+    tangents = arrays["tangents"]
+
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    interp_offsets = np.concatenate(([0], np.cumsum(np.where(arrays["has_interpolation"], counts, 0))))
+    tangent_offsets = np.concatenate(([0], np.cumsum(np.where(arrays["has_tangents"], counts, 0))))
+
+    curves = []
+    for i in range(len(counts)):
+        start, end = offsets[i], offsets[i + 1]
+        curve_interpolation = interpolation[interp_offsets[i]:interp_offsets[i + 1]] if arrays["has_interpolation"][i] else None
+        curve_tangents = tangents[tangent_offsets[i]:tangent_offsets[i + 1]] if arrays["has_tangents"][i] else None
+        curves.append(ChannelCurve(times[start:end], values[start:end], curve_interpolation, curve_tangents))
+
+    clips = []
+    for clip in layout["clips"]:
+        bones = [
+            (bone_name, child_count, [curves[curve_id] if curve_id >= 0 else None for curve_id in ids])
+            for bone_name, child_count, ids in clip["bones"]
+        ]
+        clips.append(AnimationClip(clip["name"], bones))
+
+    return clips, layout["metadata"]
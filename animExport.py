@@ -1,5 +1,19 @@
 import os
-from fbx import FbxManager, FbxScene, FbxImporter, FbxAnimStack, FbxCriteria, FbxNode, FbxAnimCurve, FbxAnimCurveKey, FbxAnimLayer, FbxAnimCurveDef, FbxAnimCurveNode, FbxAnimCurveFilter, FbxAnimCurveFilterKeyReducer, FbxAnimCurveFilterConstantKeyReducer, FbxAnimCurveFilterUnroll, FbxAnimCurveFilterTSS, FbxAnimCurveFilterMatrixConverter, FbxAnimCurveFilterResample, FbxAnimCurveFilterKeySync, FbxAnimCurveFilterGimbleKiller, FbxAnimCurveFilterUnroll, FbxAnimCurveFilterConstantKeyReducer, FbxAnimCurveFilterTSS, FbxAnimCurveFilterMatrixConverter, FbxAnimCurveFilterResample, FbxAnimCurveFilterKeySync, FbxAnimCurveFilterGimbleKiller
+import math
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util as multiprocessing_util
+from fbx import FbxAnimLayer
+from FBX_import import as_scene_handle
+from animCache import ExtractionCache
+from animManifest import ExportManifest
+from animCurves import CHANNELS, CHANNEL_COUNT, CHANNEL_INDEX, BLEND_OVERRIDE, AnimationClip, CurvePool, read_fbx_curve, get_end_time, hash_clip, ClipDigest
+from animFilters import reduce_keyframes, resample_keyframes, bake_keyframes, blend_curves, prune_keyframes, slice_keyframes
+from animWriter import FormatCache, write_anim_file, get_time_unit
+from animBinary import write_binary_file, write_pack_file
+from animMetrics import span, count, get_report, reset_report
+
+logger = logging.getLogger(__name__)
 
 def find_bone_recursive(node, bone_name):
     """
@@ -29,129 +43,539 @@ def get_transform_key(transform, axis):
     rotateX = 3, rotateY = 4, rotateZ = 5
     scaleX = 6, scaleY = 7, scaleZ = 8
     """
-    key_map = {
-        'translate': {'X': 0, 'Y': 1, 'Z': 2},
-        'rotate': {'X': 3, 'Y': 4, 'Z': 5},
-        'scale': {'X': 6, 'Y': 7, 'Z': 8}
-    }
-    return key_map[transform][axis]
+    return CHANNEL_INDEX[(transform, axis)]
 
-def export_single_animation(anim_original, save_path, scene, original_fps=25, target_fps=25):
+def export_single_animation(anim_original, save_path, scene, original_fps=25, target_fps=25, precision=None,
+                            reduce_tolerances=None, bake=False, binary_values=None, previous_digest=None, format_cache=None,
+                            packed=None, stream=False, prune=None, pruned=None, frame_range=None, incremental=False):
     """
     Export a single animation to the specified path in .anim format.
     Args:
         anim_original (str): The original animation name.
         save_path (str): The path to save the exported animation.
-        scene (FbxScene): The FBX scene containing the animation.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animation.
         original_fps (int): The frame rate of the original animation (default is 25).
         target_fps (int): The desired frame rate of the exported animation (default is 25).
+        precision (int): Number of decimals written for key values (default is None, full precision).
+        reduce_tolerances (dict): Per-transform tolerances ("translate", "rotate", "scale") for key reduction,
+            or None to write every key (default). An empty dict uses animFilters.DEFAULT_TOLERANCES.
+        bake (bool): Evaluate constant and cubic (Bezier) curves on every frame instead of writing their raw
+            keys, which the .anim file would interpolate linearly (default is False).
+        binary_values (str): None to write a text .anim file (default), or the value format ("float32",
+            "float64" or "uint16") of a binary .animb file (see animBinary).
+        previous_digest (str): Digest of the file already at save_path (see ExportManifest). In incremental mode
+            the file is left as it is if the take still has this digest.
+        format_cache (FormatCache): Formatted channels shared by a batch of text exports, or None.
+        packed (list): If given, the take as written (after resampling, baking and reduction) is appended to it
+            as an AnimationClip, for a pack file (see animBinary.write_pack_file).
+        stream (bool): Extract, process and write one bone at a time instead of holding the whole take in memory
+            (see export_streaming). Ignored when packing or exporting a frame range.
+        prune (str): None to export every animated bone (default), or the animFilters.prune_keyframes mode
+            ("rest" or "static") for leaving out channels and bones that never leave their rest pose.
+        pruned (list): If given and the take is written with pruning, the pruning report (see
+            animFilters.prune_keyframes) is appended to it.
+        frame_range (tuple): (first frame, last frame) of the take to export as a clip starting at frame 0, in
+            frames at original_fps, or None for the whole take. Keys on the range's boundaries are interpolated
+            (see animFilters.slice_curve), and constant and cubic curves are always baked so the clip plays
+            back like its range of the take. The range must lie within the take's keys. To cut several clips
+            from one take, keep its extracted clip in scene.clips so it is not extracted again for every range
+            (see export_all_animations).
+        incremental (bool): Compute the take's digest, for an ExportManifest, and keep the existing file if the
+            digest equals previous_digest (default is False, always write without hashing).
+
+    Returns:
+        str: Digest of the take's keyframes and export settings, or None if not incremental.
+    """
+    settings = {"original_fps": original_fps, "target_fps": target_fps, "precision": precision, "reduce_tolerances": reduce_tolerances, "bake": bake,
+                "binary_values": binary_values, "prune": prune, "frame_range": frame_range}
+    if stream and packed is None and frame_range is None:
+        return export_streaming(anim_original, save_path, scene, settings, pruned, incremental)
+
+    # Extract keyframe data (or reuse the cached extraction)
+    clip = get_animation_clip(anim_original, scene)
+    digest = hash_clip(clip, settings) if incremental else None
+    unchanged = incremental and digest == previous_digest and os.path.exists(save_path)
+    if unchanged and packed is None:
+        logger.info("Animation %s is unchanged, keeping %s", anim_original, save_path)
+        count("takes_unchanged")
+        return digest
+
+    if not unchanged:
+        logger.info("Exporting animation: %s to %s", anim_original, save_path)
+
+    # Skip the first bone entirely (assumed to be the armature)
+    keyframe_data = clip.bones
+    if len(keyframe_data) > 1:
+        keyframe_data = keyframe_data[1:]  # Exclude the first bone in the list
+
+    # Cut the clip out of the take, starting at frame 0
+    if frame_range is not None:
+        start, end = frame_range
+        with span("slicing"):
+            keyframe_data = slice_keyframes(keyframe_data, start, end)
+        take_end_time = end - start
+    else:
+        take_end_time = get_end_time(keyframe_data)
+
+    # Leave out channels and bones that never leave their rest pose; the take keeps its length
+    if prune is not None:
+        with span("pruning"):
+            keyframe_data, report = prune_keyframes(keyframe_data, as_scene_handle(scene).rest_poses, prune)
+        log_pruning(anim_original, report)
+        if pruned is not None:
+            pruned.append(report)
+
+    # If frame rate conversion is needed, evaluate every channel on the target frame grid
+    if original_fps != target_fps:
+        logger.debug("Resampling keyframes from %s to %s FPS", original_fps, target_fps)
+        with span("resampling"):
+            keyframe_data = resample_keyframes(keyframe_data, original_fps, target_fps)
+    elif bake or frame_range is not None:
+        # Resampling already evaluates every frame, otherwise bake non-linear curves on the original frames.
+        # A slice's boundary keys follow the curve's interpolation, which the linear .anim keys cannot.
+        with span("baking"):
+            keyframe_data = bake_keyframes(keyframe_data)
+
+    # Drop keys that linear interpolation reproduces within tolerance
+    if reduce_tolerances is not None:
+        with span("reduction"):
+            keyframe_data, keys_before, keys_after = reduce_keyframes(keyframe_data, reduce_tolerances)
+        logger.debug("Reduced keys from %d to %d", keys_before, keys_after)
+
+    # Determine start and end times from the last key of every curve
+    start_time = 0  # First frame should always be 0
+    end_time = get_end_time(keyframe_data)
+    if end_time is None:
+        end_time = 0
+    if take_end_time is not None:
+        end_time = max(end_time, scale_end_time(take_end_time, original_fps, target_fps))
+    logger.debug("Calculated frame range: start_time=%d, end_time=%d", start_time, end_time)
+
+    # A pack file needs every take, including the unchanged ones that are not rewritten
+    if packed is not None:
+        packed.append(AnimationClip(anim_original, keyframe_data))
+        if unchanged:
+            logger.info("Animation %s is unchanged, keeping %s", anim_original, save_path)
+            count("takes_unchanged")
+            return digest
+
+    # Write the data to the .anim (or .animb) file
+    with span("writing"):
+        if binary_values is None:
+            bytes_written = write_anim_file(save_path, keyframe_data, start_time, end_time, precision, get_time_unit(target_fps), format_cache)
+        else:
+            bytes_written = write_binary_file(save_path, keyframe_data, start_time, end_time, precision, get_time_unit(target_fps), binary_values)
+    count("keys_written", sum(len(curve) for _, _, channels in keyframe_data for curve in channels if curve is not None))
+    count("bytes_written", bytes_written)
+    count("takes_exported")
+
+    logger.debug("Animation %s exported successfully.", anim_original)
+    return digest
+
+def export_streaming(anim_original, save_path, scene, settings, pruned=None, incremental=False):
+    """
+    Export a single animation one bone at a time, so peak memory follows the largest bone, not the take.
+
+    The frame range is read from the last key of every curve before any key is extracted, so the
+    header can be written first; each bone is then extracted, resampled or baked, reduced, written
+    and dropped before the next one. The output is identical to export_single_animation's.
+
+    In incremental mode the take's digest is computed along the way, so unlike export_single_animation
+    an unchanged take is still rewritten. Binary files need every key to lay out their tables and are only written
+    once the processed take is complete. Formatted channels are not cached (see animWriter.FormatCache),
+    as that would hold on to text from every bone.
+
+    Args:
+        anim_original (str): The original animation name.
+        save_path (str): The path to save the exported animation.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animation.
+        settings (dict): The keyword settings of export_single_animation (original_fps, target_fps, precision,
+            reduce_tolerances, bake, binary_values, prune).
+        pruned (list): If given and pruning is enabled, the pruning report is appended to it.
+        incremental (bool): Compute the take's digest.
+
+    Returns:
+        str: Digest of the take's keyframes and export settings as export_single_animation returns it, or None
+            if not incremental.
+    """
+    scene = as_scene_handle(scene)
+    original_fps, target_fps = settings["original_fps"], settings["target_fps"]
+
+    # A take restored from the extraction cache is already in memory, otherwise read it from its stack
+    clip = scene.clips.get(anim_original)
+    if clip is not None:
+        bones = iter(clip.bones)
+        bone_end_times = [get_end_time([bone]) or 0 for bone in clip.bones]
+    else:
+        with span("stack_lookup"):
+            anim_stack = scene.find_stack(anim_original)
+        if anim_stack is None:
+            raise Exception(f"Animation stack not found: {anim_original}")
+        with span("frame_range"):
+            bone_end_times = [end_time for _, end_time in get_bone_end_times(anim_stack, scene)]
+        bones = (
+            (bone_name, scene.get_child_count(bone_name), channels)
+            for bone_name, channels in iter_bones_with_keyframes(anim_stack, scene)
+        )
+
+    # The first bone is skipped as in export_single_animation, and resampling rounds the end outwards
+    if len(bone_end_times) > 1:
+        bone_end_times = bone_end_times[1:]
+    start_time = 0
+    end_time = scale_end_time(max(bone_end_times, default=0), original_fps, target_fps)
+    logger.debug("Frame range from curve metadata: start_time=%d, end_time=%d", start_time, end_time)
+
+    logger.info("Streaming animation: %s to %s", anim_original, save_path)
+    digest = ClipDigest(settings) if incremental else None
+    prune = settings.get("prune")
+    report = {"bones": [], "channels": {}} if prune is not None else None
+    keyframe_data = _stream_keyframes(bones, digest, original_fps, target_fps, settings["bake"], settings["reduce_tolerances"],
+                                      prune, scene.rest_poses, report)
+
+    with span("streaming"):
+        if settings["binary_values"] is None:
+            bytes_written = write_anim_file(save_path, keyframe_data, start_time, end_time, settings["precision"],
+                                            get_time_unit(target_fps))
+        else:
+            bytes_written = write_binary_file(save_path, list(keyframe_data), start_time, end_time, settings["precision"],
+                                              get_time_unit(target_fps), settings["binary_values"])
+    count("bytes_written", bytes_written)
+    count("takes_exported")
+    if report is not None:
+        log_pruning(anim_original, report)
+        if pruned is not None:
+            pruned.append(report)
+
+    logger.debug("Animation %s exported successfully.", anim_original)
+    return digest.hexdigest() if digest is not None else None
+
+def _stream_keyframes(bones, digest, original_fps, target_fps, bake, reduce_tolerances, prune=None, rest_poses=None, report=None):
+    """
+    Hash, transform and yield (bone_name, child_count, channels) one bone at a time, skipping the first bone if there are others.
+
+    Pruned bones are not yielded; what was pruned is added to report. digest may be None to skip hashing.
+    """
+    def process(bone):
+        keyframe_data = [bone]
+        if prune is not None:
+            with span("pruning"):
+                keyframe_data, bone_report = prune_keyframes(keyframe_data, rest_poses, prune)
+            report["bones"].extend(bone_report["bones"])
+            report["channels"].update(bone_report["channels"])
+            if not keyframe_data:
+                return None
+        if original_fps != target_fps:
+            with span("resampling"):
+                keyframe_data = resample_keyframes(keyframe_data, original_fps, target_fps)
+        elif bake:
+            with span("baking"):
+                keyframe_data = bake_keyframes(keyframe_data)
+        if reduce_tolerances is not None:
+            with span("reduction"):
+                keyframe_data, _, _ = reduce_keyframes(keyframe_data, reduce_tolerances)
+        count("keys_written", sum(len(curve) for curve in keyframe_data[0][2] if curve is not None))
+        return keyframe_data[0]
+
+    first = None
+    for index, bone in enumerate(bones):
+        if digest is not None:
+            digest.update(*bone)
+        curves = [curve for curve in bone[2] if curve is not None]
+        count("curves", len(curves))
+        count("keys", sum(len(curve) for curve in curves))
+        if index == 0:
+            # Held back until it is known whether other bones follow (a lone bone is exported)
+            first = bone
+            continue
+        first = None
+        bone = process(bone)
+        if bone is not None:
+            yield bone
+    if first is not None:
+        first = process(first)
+        if first is not None:
+            yield first
+
+def scale_end_time(end_time, original_fps, target_fps):
+    """Return the last frame of a take ending at end_time once it is resampled (see animFilters.resample_curve)."""
+    if original_fps == target_fps:
+        return end_time
+    return math.ceil(end_time * (target_fps / original_fps) - 1e-9)
+
+def log_pruning(anim_name, report):
+    """Log and count what prune_keyframes left out of a take."""
+    channels = sum(len(names) for names in report["channels"].values())
+    count("bones_pruned", len(report["bones"]))
+    count("channels_pruned", channels)
+    if report["bones"] or channels:
+        logger.info("Pruned %d static bones and %d static channels of other bones from %s", len(report["bones"]), channels, anim_name)
+    if report["bones"]:
+        logger.debug("Pruned bones of %s: %s", anim_name, ", ".join(report["bones"]))
+    for bone_name, names in report["channels"].items():
+        logger.debug("Pruned channels of %s in %s: %s", bone_name, anim_name, ", ".join(names))
+
+def get_animation_clip(anim_name, scene):
+    """
+    Get the extracted keyframes of one animation as an SDK-independent AnimationClip.
+
+    Args:
+        anim_name (str): The animation (stack) name.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animation.
+
+    Returns:
+        AnimationClip: The animation's bones and channels, in scene order.
     """
-    print(f"Exporting animation: {anim_original} to {save_path}")
+    scene = as_scene_handle(scene)
+
+    # Reuse a clip that was already extracted (e.g. restored from the extraction cache)
+    clip = scene.clips.get(anim_name)
+    if clip is not None:
+        return clip
 
     # Find the correct animation stack in the FBX scene
-    anim_stack_count = scene.GetSrcObjectCount(FbxCriteria.ObjectType(FbxAnimStack.ClassId))
-    
-    for i in range(anim_stack_count):
-        anim_stack = scene.GetSrcObject(FbxCriteria.ObjectType(FbxAnimStack.ClassId), i)
-
-        if anim_stack.GetName() == anim_original:
-            print(f"Found animation stack: {anim_original}")
-
-            # Extract keyframe data
-            keyframe_data = get_bones_with_keyframes(anim_stack, scene)
-
-            # Skip the first bone entirely (assumed to be the armature)
-            if len(keyframe_data) > 1:
-                keyframe_data = keyframe_data[1:]  # Exclude the first bone in the list
-
-            # Collect all keyframe times to determine start and end times
-            all_keyframe_times = [kf['time'] for _, bone_keyframes in keyframe_data for kf in bone_keyframes]
-
-            if all_keyframe_times:
-                start_time = 0  # First frame should always be 0
-                end_time = max(all_keyframe_times)  # Use the max frame as the end time
-                print(f"Calculated frame range: start_time={start_time}, end_time={end_time}")
-
-                # If frame rate conversion is needed
-                if original_fps != target_fps:
-                    scale_factor = original_fps / target_fps
-                    print(f"Scaling keyframes by factor: {scale_factor}")
-                    for bone_name, bone_keyframes in keyframe_data:
-                        for keyframe in bone_keyframes:
-                            keyframe['time'] = int(keyframe['time'] * scale_factor)
-            else:
-                start_time = 0
-                end_time = 0
-
-            # Write the data to the .anim file
-            with open(save_path, 'w') as file:
-                # Write basic headers
-                file.write("animVersion 1.1;\n")
-                file.write("mayaVersion 2025;\n")
-                file.write("timeUnit pal;\n")  # Make sure it uses 'pal' for 25 FPS
-                file.write("linearUnit cm;\n")
-                file.write("angularUnit deg;\n")
-                file.write(f"startTime {start_time};\n")
-                file.write(f"endTime {end_time};\n")
-
-                # Export keyframes for each bone and transform
-                for bone_name, bone_keyframes in keyframe_data:
-                    bone = scene.FindNodeByName(bone_name)
-
-                    for transform in ['translate', 'rotate', 'scale']:
-                        for axis in ['X', 'Y', 'Z']:
-                            # Filter keyframes by curve
-                            axis_keyframes = [kf for kf in bone_keyframes if kf['curve'] == f"{transform}{axis}"]
-
-                            if axis_keyframes:
-                                file.write(f"anim {transform}.{transform}{axis} {transform}{axis} {bone_name} 0 {bone.GetChildCount()} {get_transform_key(transform, axis)};\n")
-                                file.write("animData {\n")
-                                file.write("  input time;\n")
-                                file.write("  output linear;\n")
-                                file.write("  weighted 0;\n")
-                                file.write("  preInfinity constant;\n")
-                                file.write("  postInfinity constant;\n")
-
-                                file.write("  keys {\n")
-                                for idx, keyframe in enumerate(axis_keyframes):
-                                    time = int(keyframe['time'])  # Ensure correct timing based on frame rate
-                                    value = keyframe['value']
-                                    if value.is_integer():
-                                        value = int(value)
-
-                                    # Write keyframe
-                                    if idx == 0:
-                                        file.write(f"    {time} {value} fixed fixed 1 0 0 0 1 0 1;\n")
-                                    else:
-                                        file.write(f"    {time} {value} linear linear 1 0 0;\n")
-
-                                file.write("  }\n")
-                                file.write("}\n")
-
-    print(f"Animation {anim_original} exported successfully.")
-
-def export_all_animations(animations, export_dir, scene, original_fps=25, target_fps=25):
+    with span("stack_lookup"):
+        anim_stack = scene.find_stack(anim_name)
+    if anim_stack is None:
+        raise Exception(f"Animation stack not found: {anim_name}")
+
+    logger.debug("Found animation stack: %s", anim_name)
+
+    with span("extraction"):
+        keyframe_data = get_bones_with_keyframes(anim_stack, scene)
+    curves = [curve for _, channels in keyframe_data for curve in channels if curve is not None]
+    count("curves", len(curves))
+    count("keys", sum(len(curve) for curve in curves))
+
+    # Channels repeated across the takes (or bones) of a batch share one curve
+    if scene.curve_pool is not None:
+        with span("deduplication"):
+            shared_before = scene.curve_pool.shared
+            keyframe_data = [(bone_name, [scene.curve_pool.intern(curve) for curve in channels]) for bone_name, channels in keyframe_data]
+        count("curves_shared", scene.curve_pool.shared - shared_before)
+
+    return AnimationClip(anim_name, [
+        (bone_name, scene.get_child_count(bone_name), channels) for bone_name, channels in keyframe_data
+    ])
+
+def export_all_animations(animations, export_dir, scene, original_fps=25, target_fps=25, workers=1, precision=None,
+                          name_template="{anim}.anim", progress=None, cancel_event=None, reduce_tolerances=None,
+                          incremental=False, bake=False, binary_values=None, pack_path=None, stream=False, output_names=None,
+                          prune=None, pruned=None, clip_ranges=None):
     """
     Export all animations to the specified directory.
 
+    With more than one worker, the takes are split across a process pool. FBX SDK objects
+    cannot be shared between processes, so every worker loads its own copy of the scene from
+    the handle's FBX file once and then exports its share of the takes. Output is identical
+    to a serial export.
+
+    In incremental mode an ExportManifest in export_dir remembers a digest of every written take.
+    Takes whose keyframes and settings are unchanged since the last export are not rewritten, and
+    files of takes that no longer exist in the FBX file are deleted.
+
+    Animations with clip_ranges are split into one file per range instead. Each such animation is
+    extracted once per process and every clip is sliced from the same keys (see
+    export_single_animation's frame_range).
+
+    Channels repeated across takes are formatted once per process (see animWriter.FormatCache).
+    With a pack_path, every exported take is also written to one .animpack file in which takes
+    reference shared channels instead of storing copies.
+
     Args:
         animations (list): List of animation names to export.
         export_dir (str): Directory to save the exported animations.
-        scene (FbxScene): The FBX scene containing the animations.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animations.
         original_fps (int): Original FPS of animations.
         target_fps (int): Desired FPS of exported animations.
+        workers (int): Number of worker processes (default is 1, None uses every CPU).
+        precision (int): Number of decimals written for key values (default is None, full precision).
+        name_template (str): Path of each exported file relative to export_dir, {anim} being the animation name.
+        progress (callable): Called as progress(done, total, result) after each animation finishes.
+        cancel_event (threading.Event): When set, the batch stops cleanly before the next animation.
+        reduce_tolerances (dict): Per-transform key reduction tolerances, or None to write every key.
+        incremental (bool): Only rewrite takes that changed since the last incremental export to export_dir.
+        bake (bool): Evaluate constant and cubic curves on every frame (see export_single_animation).
+        binary_values (str): None for text .anim files, or the value format of binary .animb files.
+        pack_path (str): Also write all exported takes to this .animpack file (see animBinary.write_pack_file).
+            Not written if the batch is cancelled or a take fails.
+        stream (bool): Export each take one bone at a time to bound memory (see export_streaming). Incremental
+            exports then still record digests but rewrite every take.
+        output_names (dict): Name to use for {anim} in name_template per animation, e.g. for takes renamed in
+            the GUI (default is the animation name itself).
+        prune (str): Leave out channels and bones that never leave their rest pose, in this animFilters.prune_keyframes
+            mode ("rest" or "static"), or None to export every animated bone.
+        pruned (dict): If given, filled with the pruning report of every take written with pruning, by exported name.
+        clip_ranges (dict): Animation name to a list of (clip name, first frame, last frame) tuples, frames being at
+            original_fps. Each range is exported as a clip of its own, with {anim} in name_template being the clip
+            name. Animations without ranges are exported whole.
+
+    Returns:
+        list: A (exported name, save path, error message or None) tuple per exported animation or clip, in input
+            order. The exported name is the animation name, or the clip name for a clip.
+            A failing animation is reported here and does not abort the rest of the batch. Animations skipped
+            because the batch was cancelled are left out.
     """
     if not os.path.exists(export_dir):
         os.makedirs(export_dir)  # Ensure the directory exists
-    
+
+    # Build the stack map and skeleton table once for the whole batch
+    scene = as_scene_handle(scene)
+
+    manifest = ExportManifest(export_dir) if incremental else None
+    options = {"original_fps": original_fps, "target_fps": target_fps, "precision": precision, "reduce_tolerances": reduce_tolerances, "bake": bake,
+               "binary_values": binary_values, "stream": stream, "prune": prune, "incremental": incremental}
+    jobs = []
     for anim in animations:
-        save_path = os.path.join(export_dir, f"{anim}.anim")
+        anim_name = output_names.get(anim, anim) if output_names else anim
+        for clip in (clip_ranges or {}).get(anim) or [None]:
+            output_name = clip[0] if clip is not None else anim_name
+            save_path = os.path.normpath(os.path.join(export_dir, name_template.format(anim=output_name)))
+            previous_digest = manifest.digest_for(save_path) if manifest is not None else None
+            jobs.append((anim, save_path, options, previous_digest, pack_path is not None, clip))
+    for save_dir in {os.path.dirname(job[1]) for job in jobs}:
+        os.makedirs(save_dir, exist_ok=True)
+
+    # The last job of every split animation, after which its shared extraction is released
+    extracted_before = set(scene.clips)
+    last_clip_job = {job[0]: index for index, job in enumerate(jobs) if job[5] is not None}
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers > 1 and scene.fbx_file is None:
+        logger.warning("Parallel export needs a scene loaded from a file, exporting serially instead.")
+        workers = 1
+
+    if workers > 1:
+        logger.info("Exporting %d animations with %d worker processes", len(jobs), workers)
+        chunksize = max(1, len(jobs) // (workers * 4))
+        cache_args = (scene.cache.cache_dir, scene.cache.max_bytes) if scene.cache is not None else None
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker, initargs=(scene.fbx_file, cache_args))
+        last_clips = [last_clip_job.get(job[0]) == index for index, job in enumerate(jobs)]
+        outcomes = _merge_worker_metrics(executor.map(_export_worker_job, jobs, last_clips, chunksize=chunksize))
+    else:
+        executor = None
+        format_cache = FormatCache()
+        outcomes = (_export_job(scene, *job, format_cache=format_cache) for job in jobs)
+
+    # Curves repeated across the batch's takes are shared while it runs (outcomes are produced lazily)
+    previous_pool = scene.curve_pool
+    scene.curve_pool = CurvePool()
+    results = []
+    packed = []
+    try:
+        for result, digest, clip, report in outcomes:
+            anim = jobs[len(results)][0]
+            results.append(result)
+            if last_clip_job.get(anim) == len(results) - 1 and anim not in extracted_before:
+                scene.clips.pop(anim, None)
+            if pruned is not None and report is not None:
+                pruned[result[0]] = report
+            if clip is not None:
+                packed.append(clip)
+            if manifest is not None and digest is not None:
+                manifest.record(result[1], scene.fbx_file, anim, digest)
+            if progress is not None:
+                progress(len(results), len(jobs), result)
+            if cancel_event is not None and cancel_event.is_set():
+                logger.warning("Export cancelled after %d of %d animations.", len(results), len(jobs))
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for anim in set(scene.clips) - extracted_before:
+            del scene.clips[anim]
+        scene.curve_pool = previous_pool
+        if manifest is not None:
+            # Takes that disappeared from the FBX file (not just ones left out of this batch)
+            for path in manifest.remove_missing(scene.fbx_file, set(scene.stacks) | set(scene.clips)):
+                logger.info("Removed %s, its take no longer exists", path)
+                count("files_removed")
+            manifest.save()
+
+    failed = [(anim, error) for anim, _, error in results if error]
+    for anim, error in failed:
+        logger.error("Failed to export animation %s: %s", anim, error)
+    count("takes_failed", len(failed))  # Written and unchanged takes are counted by export_single_animation
+
+    if pack_path is not None and not failed and len(results) == len(jobs):
+        with span("packing"):
+            channels = write_pack_file(pack_path, packed, {"time_unit": get_time_unit(target_fps)})
+        logger.info("Packed %d animations with %d unique channels into %s", len(packed), channels, pack_path)
+
+    if failed:
+        logger.warning("%d of %d animations exported, %d failed.", len(results) - len(failed), len(results), len(failed))
+    else:
+        logger.info("All animations exported successfully!")
+    return results
+
+def _export_job(scene, anim, save_path, options, previous_digest=None, pack=False, clip=None, format_cache=None):
+    """
+    Export one animation, or the (clip name, first frame, last frame) clip of it, and report the outcome, the
+    digest, (if packing) the exported clip and (if pruning) the pruning report instead of raising.
+    """
+    # Ensure that each animation starts fresh with its own keyframe data
+    logger.debug("Starting export for animation: %s", anim)
+    name, frame_range = (anim, None) if clip is None else (clip[0], clip[1:])
+    packed = [] if pack else None
+    pruned = []
+    try:
+        if clip is not None and anim not in scene.clips:
+            # Every clip of the animation is sliced from this one extraction
+            scene.clips[anim] = get_animation_clip(anim, scene)
+        digest = export_single_animation(anim, save_path, scene, previous_digest=previous_digest, format_cache=format_cache,
+                                         packed=packed, pruned=pruned, frame_range=frame_range, **options)
+    except Exception as e:
+        return (name, save_path, f"{type(e).__name__}: {e}"), None, None, None
+    if packed:
+        packed[0].name = name
+    return (name, save_path, None), digest, packed[0] if packed else None, pruned[0] if pruned else None
+
+# Scene loaded by each worker process of a parallel export, the takes it had extracted when loaded (from the
+# extraction cache) and the channels it already formatted
+_worker_scene = None
+_worker_loaded_clips = frozenset()
+_worker_format_cache = None
+
+def _init_export_worker(fbx_file, cache_args=None):
+    """
+    Load the FBX file once per worker process, through the extraction cache if the parent used one.
 
-        # Ensure that each animation starts fresh with its own keyframe data
-        print(f"Starting export for animation: {anim}")
-        export_single_animation(anim, save_path, scene, original_fps, target_fps)
+    The scene is released when the worker exits, which the pool makes it do at the end of the batch.
+    """
+    global _worker_scene, _worker_loaded_clips, _worker_format_cache
+    from FBX_import import load_fbx_animations
+    cache = ExtractionCache(*cache_args) if cache_args is not None else None
+    _, _worker_scene = load_fbx_animations(fbx_file, cache)
+    _worker_loaded_clips = frozenset(_worker_scene.clips)
+    multiprocessing_util.Finalize(_worker_scene, _worker_scene.destroy, exitpriority=10)
+    _worker_scene.curve_pool = CurvePool()  # The worker lives for one batch
+    _worker_format_cache = FormatCache()
+
+def _export_worker_job(job, last_clip=False):
+    """
+    Export one animation in a worker process and hand its metrics back to the parent.
 
-    print("All animations exported successfully!")
+    A take split into clips stays extracted in the worker only while it exports the take's clips: it is
+    released after the take's last clip (last_clip), or when the worker moves on to another take because
+    the last clip went to a different worker.
+    """
+    anim = job[0]
+    for split_anim in set(_worker_scene.clips) - _worker_loaded_clips - {anim}:
+        del _worker_scene.clips[split_anim]
+    outcome = _export_job(_worker_scene, *job, format_cache=_worker_format_cache)
+    if last_clip and anim not in _worker_loaded_clips:
+        _worker_scene.clips.pop(anim, None)
+    metrics = get_report().as_dict()
+    reset_report()
+    return outcome, metrics
+
+def _merge_worker_metrics(outcomes):
+    """Fold the metrics returned by the worker processes into this process's run report."""
+    for outcome, metrics in outcomes:
+        get_report().merge(metrics)
+        yield outcome
 
 def get_animation_keyframes(anim_stack, scene):
     """
@@ -159,44 +583,12 @@ def get_animation_keyframes(anim_stack, scene):
 
     Args:
         anim_stack (FbxAnimStack): The animation stack containing the animation data.
-        scene (FbxScene): The FBX scene containing the animation and bone structure.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animation and bone structure.
 
     Returns:
-        List[dict]: A list of keyframe data for each bone in the scene.
+        List[Tuple[str, list]]: A list of (bone name, curves indexed by channel) for each animated bone.
     """
-    bones_with_keyframes = []
-
-    # Print the animation stack name for debugging
-    print(f"Using animation stack: {anim_stack.GetName()}")
-
-    # Get the first animation layer from the stack
-    anim_layer = anim_stack.GetMember(FbxAnimLayer.ClassId, 0)
-    if not anim_layer:
-        print(f"No animation layers found in stack: {anim_stack.GetName()}")
-        return []
-
-    # Print the animation layer name for debugging
-    print(f"Using animation layer: {anim_layer.GetName()}")
-
-    # Iterate through all nodes in the scene to find bones with animation data
-    node_count = scene.GetSrcObjectCount(FbxCriteria.ObjectType(FbxNode.ClassId))
-    
-    for i in range(node_count):
-        node = scene.GetSrcObject(FbxCriteria.ObjectType(FbxNode.ClassId), i)
-        bone_name = node.GetName()
-
-        print(f"Checking bone: {bone_name}")
-
-        # Pass both the node and the anim_layer to the function
-        keyframe_data = extract_keyframe_data_from_node(node, anim_layer)  # Correctly pass both arguments
-        
-        if keyframe_data:
-            print(f"Keyframes found for bone: {bone_name}")
-            bones_with_keyframes.append((bone_name, keyframe_data))
-        else:
-            print(f"No keyframes found for bone: {bone_name}")
-    
-    return bones_with_keyframes
+    return list(iter_bones_with_keyframes(anim_stack, scene))
 
 def get_bones_with_keyframes(anim_stack, scene):
     """
@@ -204,45 +596,86 @@ def get_bones_with_keyframes(anim_stack, scene):
 
     Args:
         anim_stack (FbxAnimStack): The animation stack containing the animation data.
-        scene (FbxScene): The FBX scene containing the animation and bone structure.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animation and bone structure.
 
     Returns:
-        List[Tuple[str, List[dict]]]: A list of tuples where each tuple contains a bone name and its associated keyframe data.
+        List[Tuple[str, list]]: A list of tuples where each tuple contains a bone name and its curves indexed by channel.
     """
-    bones_with_keyframes = []
+    return list(iter_bones_with_keyframes(anim_stack, scene))
 
-    # Print the animation stack name for debugging
-    print(f"Using animation stack: {anim_stack.GetName()}")
+def iter_bones_with_keyframes(anim_stack, scene):
+    """
+    Extract the bones that have keyframe data in the FBX scene one at a time.
 
-    # Get the first animation layer from the stack
-    anim_layer = anim_stack.GetMember(FbxAnimLayer.ClassId, 0)
-    if not anim_layer:
-        print(f"No animation layers found in stack: {anim_stack.GetName()}")
-        return []
+    Args:
+        anim_stack (FbxAnimStack): The animation stack containing the animation data.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animation and bone structure.
 
-    # Print the animation layer name
-    print(f"Using animation layer: {anim_layer.GetName()}")
+    Yields:
+        Tuple[str, list]: A bone name and its curves indexed by channel, in scene order.
+    """
+    debug = logger.isEnabledFor(logging.DEBUG)  # Checked once, the bone loop is hot
 
-    # Iterate through all nodes in the scene to find bones with animation data
-    node_count = scene.GetSrcObjectCount(FbxCriteria.ObjectType(FbxNode.ClassId))
-    
-    for i in range(node_count):
-        node = scene.GetSrcObject(FbxCriteria.ObjectType(FbxNode.ClassId), i)
-        bone_name = node.GetName()
+    # Log the animation stack name for debugging
+    logger.debug("Using animation stack: %s", anim_stack.GetName())
 
-        print(f"Checking bone: {bone_name}")
+    # Get every animation layer of the stack, base layer first
+    anim_layers = get_anim_layers(anim_stack)
+    if not anim_layers:
+        logger.warning("No animation layers found in stack: %s", anim_stack.GetName())
+        return
 
-        # Pass both the node and the anim_layer to the function
-        keyframe_data = extract_keyframe_data_from_node(node, anim_layer)
+    # Log the animation layer names
+    logger.debug("Using animation layers: %s", ", ".join(anim_layer.GetName() for anim_layer, _, _ in anim_layers if anim_layer is not None))
+
+    # Iterate through the precomputed skeleton table to find bones with animation data
+    skeleton = as_scene_handle(scene).skeleton
+    count("nodes_scanned", len(skeleton))
+    for entry in skeleton:
+        node = entry.node
+        bone_name = entry.name
+
+        if debug:
+            logger.debug("Checking bone: %s", bone_name)
+
+        # Pass both the node and the anim_layers to the function
+        keyframe_data = extract_keyframe_data_from_layers(node, anim_layers)
         
         if keyframe_data:
-            print(f"Keyframes found for bone: {bone_name}")
-            bones_with_keyframes.append((bone_name, keyframe_data))
-        else:
-            print(f"No keyframes found for bone: {bone_name}")
-    
-    return bones_with_keyframes
+            if debug:
+                logger.debug("Keyframes found for bone: %s", bone_name)
+            yield bone_name, keyframe_data
+        elif debug:
+            logger.debug("No keyframes found for bone: %s", bone_name)
+
+def get_bone_end_times(anim_stack, scene):
+    """
+    Read the last key frame of every animated bone from the curves alone, without extracting any keys.
+
+    Args:
+        anim_stack (FbxAnimStack): The animation stack containing the animation data.
+        scene (SceneHandle or FbxScene): The loaded FBX scene containing the animation and bone structure.
 
+    Returns:
+        list: (bone name, last key frame) for every bone iter_bones_with_keyframes yields, in the same order.
+    """
+    anim_layers = get_anim_layers(anim_stack)
+    end_times = []
+    for entry in as_scene_handle(scene).skeleton:
+        properties = {"translate": entry.node.LclTranslation, "rotate": entry.node.LclRotation, "scale": entry.node.LclScaling}
+        end_time = None
+        for anim_layer, _, _ in anim_layers:
+            if anim_layer is None:
+                continue
+            for transform, axis in CHANNELS:
+                curve = properties[transform].GetCurve(anim_layer, axis)
+                key_count = curve.KeyGetCount() if curve else 0
+                if key_count:
+                    last = curve.KeyGetTime(key_count - 1).GetFrameCount()
+                    end_time = last if end_time is None else max(end_time, last)
+        if end_time is not None:
+            end_times.append((entry.name, end_time))
+    return end_times
 
 def extract_keyframe_data_from_node(node, anim_layer):
     """
@@ -253,43 +686,83 @@ def extract_keyframe_data_from_node(node, anim_layer):
         anim_layer (FbxAnimLayer): The animation layer containing keyframe data.
 
     Returns:
-        List[dict]: A list of keyframe data dictionaries.
-    """
-    keyframe_data = []
-
-    # Access the animation curves for each transform (translate, rotate, scale) in the current animation layer
-    anim_curves = {
-        "translateX": node.LclTranslation.GetCurve(anim_layer, 'X'),
-        "translateY": node.LclTranslation.GetCurve(anim_layer, 'Y'),
-        "translateZ": node.LclTranslation.GetCurve(anim_layer, 'Z'),
-        "rotateX": node.LclRotation.GetCurve(anim_layer, 'X'),
-        "rotateY": node.LclRotation.GetCurve(anim_layer, 'Y'),
-        "rotateZ": node.LclRotation.GetCurve(anim_layer, 'Z'),
-        "scaleX": node.LclScaling.GetCurve(anim_layer, 'X'),
-        "scaleY": node.LclScaling.GetCurve(anim_layer, 'Y'),
-        "scaleZ": node.LclScaling.GetCurve(anim_layer, 'Z'),
-    }
-
-    # Iterate through each animation curve and extract keyframe data
-    for curve_name, curve in anim_curves.items():
+        list: A ChannelCurve (or None) per channel, indexed like get_transform_key. Empty if the node has no keys.
+    """
+    # Access the animation curves for each transform (translate, rotate, scale) in channel index order
+    properties = {"translate": node.LclTranslation, "rotate": node.LclRotation, "scale": node.LclScaling}
+
+    # Read each animation curve into contiguous time/value arrays, bucketed by channel index
+    keyframe_data = [None] * CHANNEL_COUNT
+    for channel_index, (transform, axis) in enumerate(CHANNELS):
+        curve = properties[transform].GetCurve(anim_layer, axis)
         if curve:  # If the curve exists for this transform
-            keyframe_count = curve.KeyGetCount()
-
-            for key_index in range(keyframe_count):
-                key = curve.KeyGet(key_index)
-                keyframe_data.append({
-                    "curve": curve_name,                  # Store which curve (transform + axis) this keyframe belongs to
-                    "time": key.GetTime().GetFrameCount(),  # Convert FBX time to frame
-                    "value": key.GetValue(),                # Value of the transform at this keyframe
-                    "interp_in": "linear",                  # Interpolation type (can adjust based on actual curve data)
-                    "interp_out": "linear",                 # Interpolation type (can adjust based on actual curve data)
-                    "weight_in": 1,                         # Default weight
-                    "weight_out": 1,                        # Default weight
-                    "tangent_in": 0,                        # Default tangent
-                    "tangent_out": 0                        # Default tangent
-                })
-
-    if not keyframe_data:
-        print(f"No keyframe data found for node: {node.GetName()}")
+            keyframe_data[channel_index] = read_fbx_curve(curve)
+
+    if not any(channel is not None for channel in keyframe_data):
+        return []
+
+    return keyframe_data
+
+def get_anim_layers(anim_stack):
+    """
+    Get the animation layers of a stack that play back, with their blending settings.
+
+    Muted layers are left out. If any layer is soloed, only the soloed layers play on top of the
+    base layer (the stack's first layer), as in MotionBuilder and Maya. A muted base layer keeps its
+    place as (None, 0.0, BLEND_OVERRIDE), so the layers above it blend onto the channels' default
+    values instead of the next layer becoming the base.
+
+    Args:
+        anim_stack (FbxAnimStack): The animation stack.
+
+    Returns:
+        list: (FbxAnimLayer, weight from 0 to 1, blend mode) tuples, base layer first.
+    """
+    layers = [anim_stack.GetMember(FbxAnimLayer.ClassId, i) for i in range(anim_stack.GetMemberCount(FbxAnimLayer.ClassId))]
+    soloed = any(anim_layer.Solo.Get() for anim_layer in layers)
+
+    anim_layers = []
+    for index, anim_layer in enumerate(layers):
+        if anim_layer.Mute.Get():
+            if index == 0:
+                anim_layers.append((None, 0.0, BLEND_OVERRIDE))
+            continue
+        if soloed and index > 0 and not anim_layer.Solo.Get():
+            continue
+        anim_layers.append((anim_layer, anim_layer.Weight.Get() / 100.0, int(anim_layer.BlendMode.Get())))
+    return anim_layers
+
+def extract_keyframe_data_from_layers(node, anim_layers):
+    """
+    Extract the keyframe data of a node from every animation layer and blend it into one curve per channel.
+
+    Only the layers get_anim_layers returns are blended, so muted layers and layers silenced by
+    another layer's solo do not contribute.
+
+    Args:
+        node (FbxNode): The node (bone) from which to extract keyframe data.
+        anim_layers (list): (FbxAnimLayer or None, weight, blend mode) tuples from get_anim_layers.
+
+    Returns:
+        list: A ChannelCurve (or None) per channel, indexed like get_transform_key. Empty if the node has no keys.
+    """
+    # A single full-weight layer is read as it is, keeping its interpolation and tangents
+    if len(anim_layers) == 1 and anim_layers[0][1] == 1.0:
+        return extract_keyframe_data_from_node(node, anim_layers[0][0])
+
+    layer_data = [extract_keyframe_data_from_node(node, anim_layer) if anim_layer is not None else [] for anim_layer, _, _ in anim_layers]
+    if not any(layer_data):
+        return []
 
+    properties = {"translate": node.LclTranslation, "rotate": node.LclRotation, "scale": node.LclScaling}
+    keyframe_data = [None] * CHANNEL_COUNT
+    for channel_index, (transform, axis) in enumerate(CHANNELS):
+        layers = [
+            (data[channel_index] if data else None, weight, blend_mode)
+            for data, (_, weight, blend_mode) in zip(layer_data, anim_layers)
+        ]
+        if all(curve is None for curve, _, _ in layers):
+            continue
+        default = properties[transform].Get()["XYZ".index(axis)]  # Value where the base layer has no curve
+        keyframe_data[channel_index] = blend_curves(layers, default, multiplicative=transform == "scale")
     return keyframe_data
@@ -0,0 +1,474 @@
+from functools import reduce
+import numpy as np
+from animCurves import CHANNELS, CHANNEL_NAMES, TIME_DTYPE, BLEND_ADDITIVE, BLEND_OVERRIDE_PASSTHROUGH, INTERPOLATION_CONSTANT, INTERPOLATION_CUBIC, ChannelCurve
+
+# Default per-transform tolerances for key reduction (cm, degrees, scale factor)
+DEFAULT_TOLERANCES = {"translate": 0.001, "rotate": 0.01, "scale": 0.0001}
+
+# Pruning modes: drop static channels at the rest pose, or also bones held static in any pose
+PRUNE_REST = "rest"
+PRUNE_STATIC = "static"
+PRUNE_MODES = (PRUNE_REST, PRUNE_STATIC)
+
+def _subset(curve, keep):
+    """Return a new curve holding only the keys selected by the index or mask keep."""
+    return ChannelCurve(
+        curve.times[keep],
+        curve.values[keep],
+        curve.interpolation[keep] if curve.interpolation is not None else None,
+        curve.tangents[keep] if curve.tangents is not None else None,
+    )
+
+def reduce_curve(curve, tolerance):
+    """
+    Drop keys that linear interpolation between the remaining keys reproduces within tolerance.
+
+    Works in passes over the whole channel. Each pass tries to remove every other remaining
+    interior key (alternating which ones between passes, so no two neighbours are removed at
+    once), and checks every original key in the affected span against the straight line that
+    would replace it. Constant runs collapse to their first and last key as a special case.
+    The first and last key are always kept.
+
+    Args:
+        curve (ChannelCurve): The channel's keys.
+        tolerance (float): Maximum absolute deviation allowed for any original key.
+
+    Returns:
+        ChannelCurve: The reduced curve (the same object if nothing could be removed).
+    """
+    count = len(curve)
+    if count <= 2:
+        return curve
+
+    times = curve.times.astype(np.float64)
+    values = curve.values
+    kept = np.arange(count)
+    original = np.arange(count)
+    parity = 1
+    idle_passes = 0
+
+    while idle_passes < 2 and len(kept) > 2:
+        # Interior kept keys of this pass's parity are the removal candidates
+        ranks = np.arange(len(kept))
+        is_candidate = (ranks % 2 == parity) & (ranks > 0) & (ranks < len(kept) - 1)
+        if not is_candidate.any():
+            parity ^= 1
+            idle_passes += 1
+            continue
+
+        # Every original key within the span of a candidate (between its kept neighbours) belongs to that candidate
+        segment = np.searchsorted(kept, original, side="right") - 1
+        owner = segment + ((segment % 2) != parity)
+        inside = (owner > 0) & (owner < len(kept) - 1)
+        inside &= is_candidate[np.minimum(owner, len(kept) - 1)]
+
+        # Deviation of each such key from the line between the candidate's neighbours
+        owners = owner[inside]
+        left, right = kept[owners - 1], kept[owners + 1]
+        span = times[right] - times[left]
+        fraction = np.divide(times[inside] - times[left], span, out=np.zeros_like(span), where=span != 0)
+        line = values[left] + fraction * (values[right] - values[left])
+        error = np.zeros(len(kept))
+        np.maximum.at(error, owners, np.abs(values[inside] - line))
+
+        removable = is_candidate & (error <= tolerance)
+        if removable.any():
+            kept = kept[~removable]
+            idle_passes = 0
+        else:
+            idle_passes += 1
+        parity ^= 1
+
+    if len(kept) == count:
+        return curve
+    return _subset(curve, kept)
+
+def reduce_keyframes(keyframe_data, tolerances=None):
+    """
+    Apply reduce_curve to every channel, with a separate tolerance for translate, rotate and scale.
+
+    Args:
+        keyframe_data (list): (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+        tolerances (dict): Tolerance per transform ("translate", "rotate", "scale"), default is DEFAULT_TOLERANCES.
+
+    Returns:
+        tuple: (reduced keyframe data in the same layout, number of keys before, number of keys after).
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    keys_before = keys_after = 0
+    reduced = []
+    for bone_name, child_count, channels in keyframe_data:
+        reduced_channels = []
+        for channel_index, curve in enumerate(channels):
+            if curve is not None:
+                keys_before += len(curve)
+                curve = reduce_curve(curve, tolerances[CHANNELS[channel_index][0]])
+                keys_after += len(curve)
+            reduced_channels.append(curve)
+        reduced.append((bone_name, child_count, reduced_channels))
+    return reduced, keys_before, keys_after
+
+def is_static_curve(curve, tolerance):
+    """
+    Check whether a channel holds a single value, within tolerance, over its whole range.
+
+    Args:
+        curve (ChannelCurve): The channel's keys.
+        tolerance (float): Maximum spread allowed between the key values.
+
+    Returns:
+        bool: True if every key value lies within tolerance of the others and no Bezier tangent
+            moves the curve between them.
+    """
+    values = curve.values
+    if values.max() - values.min() > tolerance:
+        return False
+    # Equal key values can still be joined by a curve that swings between them
+    return curve.tangents is None or not (np.abs(curve.tangents) > tolerance).any()
+
+def prune_keyframes(keyframe_data, rest_poses, mode=PRUNE_REST, tolerances=None):
+    """
+    Drop channels that never leave the bone's rest pose, and bones left without any channel.
+
+    A channel is pruned when it is static (see is_static_curve) and its value matches the bone's
+    rest value within the transform's tolerance. Importing the file then leaves the channel at the
+    rig's own rest value, so the pose is unchanged. In PRUNE_STATIC mode a bone whose every channel
+    is static is dropped as a whole even if it is held away from its rest pose, for rigs whose helper
+    bones keep a fixed offset the target scene already has.
+
+    Args:
+        keyframe_data (list): (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+        rest_poses (dict): Bone name to its rest value per channel index (see FBX_import.get_rest_pose).
+            Channels of bones without a rest pose are only pruned in PRUNE_STATIC mode.
+        mode (str): PRUNE_REST or PRUNE_STATIC.
+        tolerances (dict): Tolerance per transform ("translate", "rotate", "scale"), default is DEFAULT_TOLERANCES.
+
+    Returns:
+        tuple: (pruned keyframe data in the same layout, report). The report holds "bones", the names of
+            dropped bones, and "channels", the names of dropped channels per remaining bone.
+    """
+    if mode not in PRUNE_MODES:
+        raise ValueError(f"Unknown pruning mode: {mode}")
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    pruned = []
+    report = {"bones": [], "channels": {}}
+    for bone_name, child_count, channels in keyframe_data:
+        rest = rest_poses.get(bone_name)
+        static = [
+            curve is not None and is_static_curve(curve, tolerances[CHANNELS[channel_index][0]])
+            for channel_index, curve in enumerate(channels)
+        ]
+        animated = [curve is not None for curve in channels]
+        if mode == PRUNE_STATIC and static == animated:
+            report["bones"].append(bone_name)
+            continue
+
+        at_rest = [
+            is_static and rest is not None
+            and abs(curve.values[0] - rest[channel_index]) <= tolerances[CHANNELS[channel_index][0]]
+            for channel_index, (curve, is_static) in enumerate(zip(channels, static))
+        ]
+        if at_rest == animated:
+            report["bones"].append(bone_name)
+        elif any(at_rest):
+            report["channels"][bone_name] = [CHANNEL_NAMES[channel_index] for channel_index, drop in enumerate(at_rest) if drop]
+            pruned.append((bone_name, child_count, [None if drop else curve for curve, drop in zip(channels, at_rest)]))
+        else:
+            pruned.append((bone_name, child_count, channels))
+    return pruned, report
+
+def evaluate_curve(curve, frames):
+    """
+    Evaluate a channel at arbitrary (possibly fractional) frames in one vectorized pass.
+
+    Each segment is interpolated the way its first key says: constant segments hold the key's
+    value, linear ones interpolate straight to the next key and cubic ones follow the Hermite
+    spline through both keys with the first key's right and the next key's left derivative
+    (the same curve as the SDK's Bezier form with handles at a third of the segment; tangent
+    weights are not supported). Before the first and after the last key the curve holds its
+    end values, matching the constant pre/post infinity written to the .anim file.
+
+    Args:
+        curve (ChannelCurve): The channel's keys.
+        frames (np.ndarray): Frames to evaluate at.
+
+    Returns:
+        np.ndarray: The channel's values at the given frames.
+    """
+    if curve.interpolation is None or len(curve) < 2:
+        return np.interp(frames, curve.times, curve.values)
+
+    frames = np.asarray(frames, dtype=np.float64)
+    times = curve.times.astype(np.float64)
+    values = curve.values
+
+    # Segment of every frame, and the position within it from 0 to 1
+    segment = np.clip(np.searchsorted(times, frames, side="right") - 1, 0, len(times) - 2)
+    start, end = times[segment], times[segment + 1]
+    duration = end - start
+    position = np.clip(np.divide(frames - start, duration, out=np.zeros_like(frames), where=duration != 0), 0.0, 1.0)
+    first, last = values[segment], values[segment + 1]
+
+    result = first + position * (last - first)
+    mode = curve.interpolation[segment]
+
+    cubic = mode == INTERPOLATION_CUBIC
+    if cubic.any() and curve.tangents is not None:
+        p = position[cubic]
+        p2, p3 = p * p, p * p * p
+        out_slope = curve.tangents[segment[cubic], 1] * duration[cubic]
+        in_slope = curve.tangents[segment[cubic] + 1, 0] * duration[cubic]
+        result[cubic] = (
+            (2 * p3 - 3 * p2 + 1) * first[cubic]
+            + (p3 - 2 * p2 + p) * out_slope
+            + (-2 * p3 + 3 * p2) * last[cubic]
+            + (p3 - p2) * in_slope
+        )
+
+    constant = (mode == INTERPOLATION_CONSTANT) & (position < 1.0)
+    result[constant] = first[constant]
+    return result
+
+def _slopes(curve, frames):
+    """Return the derivative of a channel (value per frame) at whole frames inside its key range, as evaluate_curve interpolates it."""
+    frames = np.asarray(frames, dtype=np.float64)
+    times = curve.times.astype(np.float64)
+    values = curve.values
+    if len(times) < 2:
+        return np.zeros_like(frames)
+
+    segment = np.clip(np.searchsorted(times, frames, side="right") - 1, 0, len(times) - 2)
+    duration = times[segment + 1] - times[segment]
+    duration = np.where(duration != 0, duration, 1.0)
+    first, last = values[segment], values[segment + 1]
+    result = (last - first) / duration
+    if curve.interpolation is None:
+        return result
+
+    mode = curve.interpolation[segment]
+    cubic = mode == INTERPOLATION_CUBIC
+    if cubic.any() and curve.tangents is not None:
+        p = (frames[cubic] - times[segment[cubic]]) / duration[cubic]
+        p2 = p * p
+        out_slope = curve.tangents[segment[cubic], 1] * duration[cubic]
+        in_slope = curve.tangents[segment[cubic] + 1, 0] * duration[cubic]
+        result[cubic] = (
+            (6 * p2 - 6 * p) * first[cubic]
+            + (3 * p2 - 4 * p + 1) * out_slope
+            + (-6 * p2 + 6 * p) * last[cubic]
+            + (3 * p2 - 2 * p) * in_slope
+        ) / duration[cubic]
+    result[mode == INTERPOLATION_CONSTANT] = 0.0
+    return result
+
+def slice_curve(curve, start, end):
+    """
+    Cut the keys of a frame range out of a channel, rebasing time so the range starts at frame 0.
+
+    Keys inside the range are kept as they are. Where the curve goes on past either end of the
+    range, a key with the curve's value at that frame is added, so the slice plays back exactly
+    like the range did; a boundary inside a cubic segment gets the curve's slope there as its
+    tangents, which leaves the rest of the segment unchanged.
+
+    Args:
+        curve (ChannelCurve): The channel's keys.
+        start (int): First frame of the range.
+        end (int): Last frame of the range.
+
+    Returns:
+        ChannelCurve: The keys from start to end, with times relative to start.
+    """
+    times = curve.times
+    first = int(np.searchsorted(times, start, side="left"))
+    last = int(np.searchsorted(times, end, side="right"))
+    kept = slice(first, last)
+
+    # Boundary keys are only needed where keys on the other side of the boundary shape the range
+    add_start = first > 0 and (first == len(times) or times[first] != start)
+    add_end = last < len(times) and (last == 0 or times[last - 1] != end)
+    boundaries = np.array(([start] if add_start else []) + ([end] if add_end else []), dtype=TIME_DTYPE)
+    if not len(boundaries):
+        sliced = _subset(curve, kept)
+        sliced.times = sliced.times - start
+        return sliced
+
+    boundary_values = evaluate_curve(curve, boundaries.astype(np.float64))
+    parts_times = [times[kept]]
+    parts_values = [curve.values[kept]]
+    if add_start:
+        parts_times.insert(0, boundaries[:1])
+        parts_values.insert(0, boundary_values[:1])
+    if add_end:
+        parts_times.append(boundaries[-1:])
+        parts_values.append(boundary_values[-1:])
+
+    interpolation = None
+    if curve.interpolation is not None:
+        # A start key continues the segment it cuts; an end key's own mode is never used
+        parts = [curve.interpolation[kept]]
+        if add_start:
+            parts.insert(0, curve.interpolation[first - 1:first])
+        if add_end:
+            parts.append(curve.interpolation[last:last + 1])
+        interpolation = np.concatenate(parts)
+
+    tangents = None
+    if curve.tangents is not None:
+        slopes = _slopes(curve, boundaries)
+        parts = [curve.tangents[kept]]
+        if add_start:
+            parts.insert(0, np.repeat(slopes[:1], 2).reshape(1, 2))
+        if add_end:
+            parts.append(np.repeat(slopes[-1:], 2).reshape(1, 2))
+        tangents = np.concatenate(parts)
+
+    return ChannelCurve(np.concatenate(parts_times) - start, np.concatenate(parts_values), interpolation, tangents)
+
+def slice_keyframes(keyframe_data, start, end):
+    """
+    Apply slice_curve to every channel.
+
+    Args:
+        keyframe_data (list): (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+        start (int): First frame of the range.
+        end (int): Last frame of the range.
+
+    Returns:
+        list: The keyframe data of the range in the same layout, starting at frame 0.
+
+    Raises:
+        ValueError: If the range does not end after it starts or is not within the take's first and last key.
+    """
+    if end <= start:
+        raise ValueError(f"Frame range {start}-{end} is empty, its last frame must come after its first")
+    key_ranges = [(curve.times[0], curve.times[-1]) for _, _, channels in keyframe_data for curve in channels if curve is not None and len(curve)]
+    if not key_ranges:
+        raise ValueError(f"Frame range {start}-{end} cannot be cut from a take without keys")
+    first_key = int(min(first for first, _ in key_ranges))
+    last_key = int(max(last for _, last in key_ranges))
+    if start < first_key or end > last_key:
+        raise ValueError(f"Frame range {start}-{end} is not within the take's keys (frames {first_key}-{last_key})")
+    return [
+        (bone_name, child_count, [slice_curve(curve, start, end) if curve is not None and len(curve) else curve for curve in channels])
+        for bone_name, child_count, channels in keyframe_data
+    ]
+
+def resample_curve(curve, original_fps, target_fps):
+    """
+    Resample a channel onto the whole-frame grid of another frame rate.
+
+    Args:
+        curve (ChannelCurve): The channel's keys, in frames at original_fps.
+        original_fps (float): Frame rate of the curve's key times.
+        target_fps (float): Frame rate to resample to.
+
+    Returns:
+        ChannelCurve: A key on every target frame covering the curve's time range.
+    """
+    if not len(curve):
+        return curve
+
+    # Target frames from the one at or before the first key to the one at or after the last key
+    ratio = target_fps / original_fps
+    first = np.floor(curve.times[0] * ratio + 1e-9)
+    last = np.ceil(curve.times[-1] * ratio - 1e-9)
+    frames = np.arange(first, last + 1, dtype=TIME_DTYPE)
+    return ChannelCurve(frames, evaluate_curve(curve, frames / ratio))
+
+def bake_curve(curve):
+    """
+    Bake a channel to a key on every whole frame between its first and last key.
+
+    Args:
+        curve (ChannelCurve): The channel's keys.
+
+    Returns:
+        ChannelCurve: The evaluated curve, to be interpolated linearly (the same object if every key is linear).
+    """
+    if curve.interpolation is None or not len(curve):
+        return curve
+    frames = np.arange(curve.times[0], curve.times[-1] + 1, dtype=TIME_DTYPE)
+    return ChannelCurve(frames, evaluate_curve(curve, frames))
+
+def bake_keyframes(keyframe_data):
+    """
+    Apply bake_curve to every channel.
+
+    Args:
+        keyframe_data (list): (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+
+    Returns:
+        list: The baked keyframe data in the same layout.
+    """
+    return [
+        (bone_name, child_count, [bake_curve(curve) if curve is not None else None for curve in channels])
+        for bone_name, child_count, channels in keyframe_data
+    ]
+
+def resample_keyframes(keyframe_data, original_fps, target_fps):
+    """
+    Apply resample_curve to every channel.
+
+    Args:
+        keyframe_data (list): (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+        original_fps (float): Frame rate of the extracted key times.
+        target_fps (float): Frame rate to resample to.
+
+    Returns:
+        list: The resampled keyframe data in the same layout.
+    """
+    return [
+        (bone_name, child_count, [resample_curve(curve, original_fps, target_fps) if curve is not None else None for curve in channels])
+        for bone_name, child_count, channels in keyframe_data
+    ]
+
+def blend_curves(layers, default=0.0, multiplicative=False):
+    """
+    Composite one channel's curves from several animation layers into a single curve.
+
+    Every layer is evaluated over the union of all layers' key times (every frame in between if
+    a layer is not linear) in one vectorized pass, then
+    the layers are applied bottom to top: additive layers add their weighted value (or, with
+    multiplicative, scale the result, as FBX does for scaling). Override layers hide the layers
+    below them, their weight fading their own value towards the default like the base layer's;
+    override passthrough layers instead let the layers below show through by one minus their
+    weight. A layer without a curve for the channel leaves it untouched.
+
+    Args:
+        layers (list): (ChannelCurve or None, weight from 0 to 1, blend mode) per layer, base layer first.
+        default (float): The channel's value where the base layer has no curve.
+        multiplicative (bool): Whether additive layers multiply instead of add (scale channels).
+
+    Returns:
+        ChannelCurve: The blended curve, or None if no layer has keys. A base layer curve that no
+            other layer touches is returned as it is.
+    """
+    curves = [curve for curve, _, _ in layers if curve is not None and len(curve)]
+    if not curves:
+        return None
+    base, base_weight, _ = layers[0]
+    if len(curves) == 1 and curves[0] is base and base_weight == 1.0:
+        return base
+
+    frames = reduce(np.union1d, [curve.times for curve in curves])
+    if any(curve.interpolation is not None for curve in curves):
+        # Curved or stepped segments are not reproduced by their keys alone, blend every frame
+        frames = np.arange(frames[0], frames[-1] + 1, dtype=TIME_DTYPE)
+    if base is not None and len(base):
+        result = default + base_weight * (evaluate_curve(base, frames) - default)
+    else:
+        result = np.full(len(frames), default, dtype=np.float64)
+
+    for curve, weight, blend_mode in layers[1:]:
+        if curve is None or not len(curve) or weight == 0.0:
+            continue
+        values = evaluate_curve(curve, frames)
+        if blend_mode == BLEND_OVERRIDE_PASSTHROUGH:
+            result += weight * (values - result)
+        elif blend_mode != BLEND_ADDITIVE:
+            result = default + weight * (values - default)
+        elif multiplicative:
+            result *= 1.0 + weight * (values - 1.0)
+        else:
+            result += weight * values
+    return ChannelCurve(frames, result)
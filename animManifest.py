@@ -0,0 +1,102 @@
+import os
+import json
+import tempfile
+
+# File name of the manifest inside an export directory
+MANIFEST_NAME = ".animManifest.json"
+
+class ExportManifest:
+    """
+    Record of what an incremental export wrote to an export directory.
+
+    Every exported file is listed with the FBX file and take it came from and the digest of the
+    take's keyframes and export settings (see animCurves.hash_clip). A take whose digest matches
+    its entry, and whose file still exists, does not need to be written again.
+
+    The manifest is read and written as a whole; concurrent exports into the same directory
+    should not both use incremental mode.
+    """
+
+    def __init__(self, export_dir):
+        """
+        Args:
+            export_dir (str): The export directory holding the manifest.
+        """
+        self.export_dir = export_dir
+        self.path = os.path.join(export_dir, MANIFEST_NAME)
+        self.entries = self._read()
+
+    def digest_for(self, save_path):
+        """
+        Return the recorded digest of an exported file.
+
+        Args:
+            save_path (str): Path of the exported file.
+
+        Returns:
+            str: The digest, or None if the file is not recorded or no longer exists.
+        """
+        entry = self.entries.get(self._key(save_path))
+        if entry is None or not os.path.exists(save_path):
+            return None
+        return entry["digest"]
+
+    def record(self, save_path, fbx_file, anim, digest):
+        """
+        Record an exported file.
+
+        Args:
+            save_path (str): Path of the exported file.
+            fbx_file (str): FBX file the take came from, or None if unknown.
+            anim (str): The take name.
+            digest (str): Digest of the take's keyframes and export settings.
+        """
+        fbx = os.path.abspath(fbx_file) if fbx_file else None
+        self.entries[self._key(save_path)] = {"fbx": fbx, "take": anim, "digest": digest}
+
+    def remove_missing(self, fbx_file, animations):
+        """
+        Delete the exported files of takes that no longer exist in an FBX file.
+
+        Args:
+            fbx_file (str): The FBX file, or None for takes recorded without one.
+            animations (iterable): Names of every take the FBX file currently contains.
+
+        Returns:
+            list: Paths of the deleted files.
+        """
+        fbx = os.path.abspath(fbx_file) if fbx_file else None
+        animations = set(animations)
+        removed = []
+        for key, entry in list(self.entries.items()):
+            if entry["fbx"] != fbx or entry["take"] in animations:
+                continue
+            path = os.path.join(self.export_dir, key)
+            if os.path.exists(path):
+                os.unlink(path)
+                removed.append(path)
+            del self.entries[key]
+        return removed
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(self.export_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.export_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"files": self.entries}, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _key(self, save_path):
+        # Relative paths keep the manifest valid when the export directory is moved
+        return os.path.relpath(os.path.abspath(save_path), os.path.abspath(self.export_dir)).replace(os.sep, "/")
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            return {}
@@ -0,0 +1,78 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+class RunReport:
+    """
+    Timing spans and counters collected during a run.
+
+    Spans accumulate wall time and call counts per phase name (e.g. "extraction"); counters
+    accumulate integers (e.g. "keys"). Both are safe to update from several threads.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.spans = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block and add it to the span called name."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, time.perf_counter() - started)
+
+    def add_span(self, name, seconds, calls=1):
+        with self._lock:
+            total = self.spans.setdefault(name, {"seconds": 0.0, "calls": 0})
+            total["seconds"] += seconds
+            total["calls"] += calls
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, data):
+        """Add the spans and counters of another report's as_dict() (e.g. from a worker process)."""
+        for name, total in data["spans"].items():
+            self.add_span(name, total["seconds"], total["calls"])
+        for name, amount in data["counters"].items():
+            self.count(name, amount)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "seconds": round(time.time() - self.started, 6),
+                "spans": {name: {"seconds": round(total["seconds"], 6), "calls": total["calls"]} for name, total in self.spans.items()},
+                "counters": dict(self.counters),
+            }
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=4)
+
+# The report every exporter module records into
+_report = RunReport()
+
+def get_report():
+    """Return the current run report."""
+    return _report
+
+def reset_report():
+    """Start a new run report and return it."""
+    global _report
+    _report = RunReport()
+    return _report
+
+def span(name):
+    """Time the enclosed block in the current run report."""
+    return _report.span(name)
+
+def count(name, amount=1):
+    """Add to a counter of the current run report."""
+    _report.count(name, amount)
@@ -0,0 +1,282 @@
+import os
+import sys
+import mmap
+import argparse
+from collections import namedtuple
+import numpy as np
+from animCurves import CHANNEL_NAMES, CHANNEL_COUNT, VALUE_DTYPE, ChannelCurve, AnimationClip
+
+# One channel of a .anim file, in file order
+AnimChannel = namedtuple("AnimChannel", ["bone_name", "child_count", "channel_index", "curve"])
+
+# Channel index by attribute name, e.g. "rotateY" -> 4
+CHANNEL_BY_NAME = {name: index for index, name in enumerate(CHANNEL_NAMES)}
+
+# Tokens per key line as written by animWriter (time, value, in/out tangent types and flags)
+KEY_LINE_TOKENS = 7
+
+class AnimParseError(ValueError):
+    """A .anim file does not follow the format written by animWriter."""
+
+    def __init__(self, path, line, message):
+        super().__init__(f"{path}:{line}: {message}")
+        self.path = path
+        self.line = line
+
+def open_anim_file(path):
+    """
+    Memory-map a .anim file for reading.
+
+    Args:
+        path (str): The .anim file.
+
+    Returns:
+        mmap.mmap or bytes: The file contents (plain bytes for an empty file, which cannot be mapped).
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class _LineCursor:
+    """Line-by-line position in the mapped file, tracking line numbers for error messages."""
+
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self.pos = 0
+        self.line = 0
+
+    def peek(self):
+        """Return the next non-blank line stripped, without consuming it (None at the end of the file)."""
+        pos = self.pos
+        while pos < len(self.data):
+            end = self.data.find(b"\n", pos)
+            end = len(self.data) if end == -1 else end + 1
+            text = self.data[pos:end].strip()
+            if text:
+                return text.decode("utf-8")
+            pos = end
+        return None
+
+    def next(self):
+        """Consume and return the next non-blank line stripped (None at the end of the file)."""
+        while self.pos < len(self.data):
+            end = self.data.find(b"\n", self.pos)
+            end = len(self.data) if end == -1 else end + 1
+            text = self.data[self.pos:end].strip()
+            self.pos = end
+            self.line += 1
+            if text:
+                return text.decode("utf-8")
+        return None
+
+    def expect(self, expected):
+        text = self.next()
+        if text != expected:
+            self.fail(f"expected '{expected}', found '{text}'")
+
+    def take_until(self, terminator):
+        """Consume and return the raw bytes up to (not including) the next terminator byte."""
+        end = self.data.find(terminator, self.pos)
+        if end == -1:
+            self.fail(f"missing '{terminator.decode()}'")
+        block = self.data[self.pos:end]
+        self.pos = end
+        self.line += block.count(b"\n")
+        return block
+
+    def fail(self, message):
+        raise AnimParseError(self.path, self.line, message)
+
+def _read_header(cursor):
+    """Read the "name value;" header lines before the first channel into a dict."""
+    header = {}
+    while True:
+        text = cursor.peek()
+        if text is None or text.startswith("anim "):
+            return header
+        cursor.next()
+        name, _, value = text.rstrip(";").partition(" ")
+        header[name] = value
+
+def _parse_keys(cursor, block):
+    """Parse the lines of a keys block into time and value arrays."""
+    lines = block.lstrip().split(b"\n", 1)
+    first = lines[0].split()
+    rest = lines[1] if len(lines) > 1 else b""
+    tokens = rest.split()
+    if not first:
+        return np.empty(0), np.empty(0)
+
+    # Fast path: every key after the first is a "time value linear linear 1 0 0;" line, so the
+    # tokens form a fixed-width table (checked by where the terminating semicolons fall)
+    fixed_width = (
+        len(first) >= 2
+        and len(tokens) == rest.count(b";") * KEY_LINE_TOKENS
+        and all(token.endswith(b";") for token in tokens[KEY_LINE_TOKENS - 1::KEY_LINE_TOKENS])
+    )
+    if fixed_width:
+        times = [first[0]] + tokens[0::KEY_LINE_TOKENS]
+        values = [first[1]] + tokens[1::KEY_LINE_TOKENS]
+    else:
+        keys = [line.split(None, 2) for line in block.split(b"\n") if line.strip()]
+        if any(len(key) < 2 for key in keys):
+            cursor.fail("key line without time and value")
+        times = [key[0] for key in keys]
+        values = [key[1] for key in keys]
+
+    try:
+        return np.array(list(map(float, times)), dtype=VALUE_DTYPE), np.array(list(map(float, values)), dtype=VALUE_DTYPE)
+    except ValueError as e:
+        cursor.fail(f"invalid key: {e}")
+
+def _read_channel(cursor):
+    """Read one "anim" line and its animData block."""
+    text = cursor.next()
+    tokens = text.rstrip(";").split()
+    if len(tokens) < 7 or tokens[0] != "anim":
+        cursor.fail(f"expected an 'anim' channel line, found '{text}'")
+
+    attribute, bone_name, child_count = tokens[2], tokens[3], tokens[5]
+    channel_index = CHANNEL_BY_NAME.get(attribute)
+    if channel_index is None:
+        cursor.fail(f"unsupported attribute '{attribute}'")
+
+    # A channel without animData is static in Maya; there are no keys to read
+    if cursor.peek() != "animData {":
+        return AnimChannel(bone_name, int(child_count), channel_index, None)
+
+    cursor.expect("animData {")
+    while True:
+        text = cursor.next()
+        if text is None:
+            cursor.fail("missing 'keys {'")
+        if text == "keys {":
+            break
+
+    times, values = _parse_keys(cursor, cursor.take_until(b"}"))
+    cursor.expect("}")  # keys
+    cursor.expect("}")  # animData
+
+    frames = times.astype(np.int64)
+    if not np.array_equal(frames, times):
+        cursor.fail("fractional key times are not supported")
+    return AnimChannel(bone_name, int(child_count), channel_index, ChannelCurve(frames, values))
+
+def read_anim_header(path):
+    """
+    Read only the header of a .anim file.
+
+    Args:
+        path (str): The .anim file.
+
+    Returns:
+        dict: Header fields by name, e.g. {"timeUnit": "pal", "startTime": "0", ...}, values as written.
+    """
+    data = open_anim_file(path)
+    try:
+        return _read_header(_LineCursor(path, data))
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+def iter_anim_channels(path):
+    """
+    Stream the channels of a .anim file one at a time.
+
+    The file is memory-mapped and only the keys block of the current channel is parsed, so
+    memory use is bounded by the largest channel, not by the file.
+
+    Args:
+        path (str): The .anim file.
+
+    Yields:
+        AnimChannel: (bone_name, child_count, channel_index, ChannelCurve or None) per channel, in file order.
+
+    Raises:
+        AnimParseError: If the file does not follow the .anim format.
+    """
+    data = open_anim_file(path)
+    try:
+        cursor = _LineCursor(path, data)
+        _read_header(cursor)
+        while cursor.peek() is not None:
+            yield _read_channel(cursor)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+def read_anim_file(path):
+    """
+    Read a whole .anim file back into the exporter's columnar form.
+
+    Args:
+        path (str): The .anim file.
+
+    Returns:
+        tuple: (header dict, AnimationClip named after the file), the clip's bones in file order
+            with channels indexed like animExport.get_transform_key.
+    """
+    header = read_anim_header(path)
+    bones = []
+    for bone_name, child_count, channel_index, curve in iter_anim_channels(path):
+        if not bones or bones[-1][0] != bone_name:
+            bones.append((bone_name, child_count, [None] * CHANNEL_COUNT))
+        bones[-1][2][channel_index] = curve
+    name = os.path.splitext(os.path.basename(path))[0]
+    return header, AnimationClip(name, bones)
+
+def check_anim_file(path):
+    """
+    Validate a .anim file without keeping its keys.
+
+    Args:
+        path (str): The .anim file.
+
+    Returns:
+        list: Problems found, empty if the file is valid.
+    """
+    try:
+        header = read_anim_header(path)
+        problems = [f"missing header field {name}" for name in ("timeUnit", "startTime", "endTime") if name not in header]
+        end_time = int(header["endTime"]) if "endTime" in header else None
+        for bone_name, _, channel_index, curve in iter_anim_channels(path):
+            if curve is None or not len(curve):
+                continue
+            channel = f"{bone_name}.{CHANNEL_NAMES[channel_index]}"
+            if np.any(np.diff(curve.times) <= 0):
+                problems.append(f"{channel}: key times are not increasing")
+            if not np.all(np.isfinite(curve.values)):
+                problems.append(f"{channel}: non-finite key values")
+            if end_time is not None and curve.end_time > end_time:
+                problems.append(f"{channel}: key at frame {curve.end_time} after endTime {end_time}")
+        return problems
+    except (OSError, ValueError) as e:
+        return [str(e)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="animReader", description="Validate .anim files.")
+    parser.add_argument("inputs", nargs="+", help=".anim files or directories to search recursively")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.inputs:
+        if os.path.isdir(path):
+            for directory, _, files in os.walk(path):
+                paths.extend(os.path.join(directory, name) for name in files if name.lower().endswith(".anim"))
+        else:
+            paths.append(path)
+
+    invalid = 0
+    for path in sorted(paths):
+        problems = check_anim_file(path)
+        if problems:
+            invalid += 1
+            for problem in problems:
+                print(f"{path}: {problem}", file=sys.stderr)
+    print(f"{len(paths) - invalid} of {len(paths)} files valid", file=sys.stderr)
+    return 1 if invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import re
+import fnmatch
+from collections import Counter
+
+class Take:
+    """
+    One animation (take) of a loaded FBX file as listed in the GUI.
+
+    Attributes:
+        id (int): Stable identifier of the take, unchanged by renames and deletions of other takes.
+        original (str): The stack name as stored in the FBX file.
+        stack (str): The cleaned stack name used to find the take's keyframes (see animExport.get_animation_clip).
+        name (str): The name the take is shown and exported under.
+    """
+    __slots__ = ("id", "original", "stack", "name", "folded")
+
+    def __init__(self, take_id, original, stack, name):
+        self.id = take_id
+        self.original = original
+        self.stack = stack
+        self.name = name
+        self.folded = name.casefold()
+
+class TakeList:
+    """
+    Index of the takes of a loaded FBX file for listing, filtering and batch editing.
+
+    Takes keep their load order and are addressed by id, so renames and deletions never shift
+    other takes. Filtering is incremental: a query that extends the previous one only searches
+    the previous matches.
+    """
+
+    def __init__(self, animations_with_originals):
+        """
+        Args:
+            animations_with_originals (list): (original name, cleaned name) tuples as returned by
+                FBX_import.load_fbx_animations. The list itself is not modified.
+        """
+        self._takes = {}
+        for take_id, (original, cleaned) in enumerate(animations_with_originals):
+            self._takes[take_id] = Take(take_id, original, cleaned, cleaned)
+        self._last_query = None
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self._takes)
+
+    def __iter__(self):
+        return iter(self._takes.values())
+
+    def get(self, take_id):
+        """Return the Take with the given id."""
+        return self._takes[take_id]
+
+    def ids(self):
+        """Return the ids of every take in load order."""
+        return list(self._takes)
+
+    def output_names(self, take_ids=None):
+        """
+        Map stack names to the names the takes are exported under.
+
+        Args:
+            take_ids (iterable): Ids of the takes to include (default is every take).
+
+        Returns:
+            dict: Stack name to take name, in load order.
+        """
+        takes = self._takes.values() if take_ids is None else (self._takes[take_id] for take_id in take_ids)
+        return {take.stack: take.name for take in takes}
+
+    def filter(self, query):
+        """
+        Find the takes matching a search query.
+
+        Takes whose name contains the query (ignoring case) come first, then takes whose name contains
+        the query's characters in order with gaps ("rnfst" matches "Run_Fast"), each group in load order.
+
+        Args:
+            query (str): The search text; an empty query matches every take.
+
+        Returns:
+            list: Ids of the matching takes.
+        """
+        query = query.strip().casefold()
+        if not query:
+            return self.ids()
+
+        # Every take matching an extended query also matched the shorter one
+        if self._last_query is not None and query.startswith(self._last_query):
+            candidates = [self._takes[take_id] for take_id in self._last_matches if take_id in self._takes]
+        else:
+            candidates = self._takes.values()
+
+        exact = []
+        fuzzy = []
+        for take in candidates:
+            if query in take.folded:
+                exact.append(take.id)
+            elif _is_subsequence(query, take.folded):
+                fuzzy.append(take.id)
+
+        self._last_query = query
+        self._last_matches = sorted(exact + fuzzy)  # Ids are in load order
+        return exact + fuzzy
+
+    def rename(self, take_id, new_name):
+        """
+        Rename one take.
+
+        Raises:
+            ValueError: If the name is empty or already used by another take.
+        """
+        self.rename_many({take_id: new_name})
+
+    def rename_by_pattern(self, take_ids, pattern, replacement, regex=False):
+        """
+        Rename several takes by replacing a pattern in their names.
+
+        Args:
+            take_ids (iterable): Ids of the takes to rename.
+            pattern (str): A glob pattern ("*" and "?") matched against the whole name, or with regex a
+                regular expression searched for anywhere in it.
+            replacement (str): For a glob pattern the new name, in which "{name}" is the old name and "{n}"
+                a counter starting at 1. For a regex the text every match is replaced with, which may use
+                \\1-style groups.
+            regex (bool): Treat the pattern as a regular expression.
+
+        Returns:
+            dict: Take id to new name for every take whose name changed.
+
+        Raises:
+            ValueError: If the pattern is invalid, or a new name would be empty or collide with another take.
+        """
+        try:
+            compiled = re.compile(pattern if regex else fnmatch.translate(pattern))
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}")
+
+        new_names = {}
+        counter = 0
+        for take_id in take_ids:
+            take = self._takes[take_id]
+            if regex:
+                if not compiled.search(take.name):
+                    continue
+                try:
+                    new_name = compiled.sub(replacement, take.name)
+                except re.error as e:
+                    raise ValueError(f"Invalid replacement: {e}")
+            else:
+                if not compiled.match(take.name):
+                    continue
+                counter += 1
+                new_name = replacement.replace("{name}", take.name).replace("{n}", str(counter))
+            if new_name != take.name:
+                new_names[take_id] = new_name
+
+        self.rename_many(new_names)
+        return new_names
+
+    def rename_many(self, new_names):
+        """
+        Rename several takes at once, checking the result as a whole.
+
+        Args:
+            new_names (dict): Take id to new name.
+
+        Raises:
+            ValueError: If a new name is empty or two takes would end up with the same name.
+        """
+        if any(not name.strip() for name in new_names.values()):
+            raise ValueError("Animation names cannot be empty")
+
+        resulting = Counter(new_names.get(take.id, take.name) for take in self._takes.values())
+        duplicates = sorted({name for name in new_names.values() if resulting[name] > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate animation names: {', '.join(duplicates)}")
+
+        for take_id, name in new_names.items():
+            take = self._takes[take_id]
+            take.name = name
+            take.folded = name.casefold()
+        self._last_query = None
+
+    def delete(self, take_ids):
+        """Remove takes from the list (the FBX file is not changed)."""
+        for take_id in take_ids:
+            self._takes.pop(take_id, None)
+
+def _is_subsequence(query, text):
+    """Return whether the characters of query appear in text in order."""
+    position = 0
+    for character in query:
+        position = text.find(character, position) + 1
+        if position == 0:
+            return False
+    return True
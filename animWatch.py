@@ -0,0 +1,484 @@
+import os
+import sys
+import json
+import time
+import select
+import signal
+import struct
+import logging
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from animConvert import find_fbx_files, convert_file, create_cache, add_conversion_arguments, conversion_options, configure_logging
+from animMetrics import get_report, reset_report, count
+from animWriter import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# A file is converted once its size and modification time have not changed for this long (seconds)
+DEFAULT_SETTLE_SECONDS = 2.0
+
+# How often the polling watcher rescans the watched directories (seconds)
+DEFAULT_POLL_INTERVAL = 5.0
+
+# How often the status file is rewritten (seconds)
+DEFAULT_STATUS_INTERVAL = 10.0
+
+# How often a file is queued again after its conversion was lost to a crashed worker process
+MAX_CRASH_RETRIES = 2
+
+# Longest the service waits for file events before checking on settling files and running conversions (seconds)
+TICK_SECONDS = 0.25
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event without its variable-length name: wd, mask, cookie, len
+INOTIFY_EVENT = struct.Struct("iIII")
+
+def file_signature(path):
+    """Return (size, mtime_ns) of a file, or None if it does not exist (any more)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def is_fbx_file(path):
+    return path.lower().endswith(".fbx")
+
+class PollingWatcher:
+    """
+    Finds FBX files that appeared or changed by rescanning the watched directories.
+
+    Works on every platform and on network shares, where file events from other machines are
+    not delivered.
+    """
+
+    def __init__(self, directories, interval=DEFAULT_POLL_INTERVAL):
+        self.directories = directories
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._last_scan = time.monotonic()
+
+    def _scan(self):
+        return {fbx_file: file_signature(fbx_file) for fbx_file, _ in find_fbx_files(self.directories)}
+
+    def changes(self, timeout):
+        """
+        Wait up to timeout seconds and return the FBX files that changed since the last scan.
+
+        Returns:
+            set: Paths of new, modified or deleted FBX files.
+        """
+        time.sleep(timeout)
+        if time.monotonic() - self._last_scan < self.interval:
+            return set()
+
+        snapshot = self._scan()
+        self._last_scan = time.monotonic()
+        changed = {path for path, signature in snapshot.items() if self._snapshot.get(path) != signature}
+        changed |= self._snapshot.keys() - snapshot.keys()
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """
+    Finds FBX files that appeared or changed from Linux inotify events, without rescanning.
+
+    Every directory below the watched ones is watched, including directories created later.
+    If the kernel's event queue overflows, the watched directories are rescanned once.
+    """
+
+    def __init__(self, directories):
+        import ctypes
+        import ctypes.util
+        self.directories = directories
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._watched = {}  # Watch descriptor -> directory
+        try:
+            for directory in directories:
+                self._watch_tree(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, root):
+        """Watch a directory and everything below it, returning the FBX files already in it."""
+        found = []
+        for directory, _, files in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                error = self._ctypes.get_errno()
+                raise OSError(error, os.strerror(error), directory)
+            self._watched[wd] = directory
+            found.extend(os.path.join(directory, name) for name in files if is_fbx_file(name))
+        return found
+
+    def _read_events(self):
+        data = b""
+        while True:
+            try:
+                chunk = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return data
+            if not chunk:
+                return data
+            data += chunk
+
+    def changes(self, timeout):
+        """
+        Wait up to timeout seconds for file events.
+
+        Returns:
+            set: Paths of FBX files that were created, written, moved or deleted.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = self._read_events()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_size = INOTIFY_EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + name_size].rstrip(b"\0"))
+            offset += INOTIFY_EVENT.size + name_size
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("File event queue overflowed, rescanning %s", ", ".join(self.directories))
+                changed.update(fbx_file for fbx_file, _ in find_fbx_files(self.directories))
+                continue
+            if mask & IN_IGNORED:
+                self._watched.pop(wd, None)
+                continue
+            directory = self._watched.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                # A new or moved-in folder may already hold files, which produced no events of their own
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        changed.update(self._watch_tree(path))
+                    except OSError as e:
+                        logger.warning("Cannot watch %s: %s", path, e)
+            elif is_fbx_file(name):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+def create_watcher(directories, poll=False, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    Create the best available watcher for the directories: inotify on Linux, polling otherwise.
+
+    Args:
+        directories (list): Directories to watch recursively.
+        poll (bool): Always poll, e.g. for network shares.
+        poll_interval (float): Seconds between rescans of the polling watcher.
+
+    Returns:
+        InotifyWatcher or PollingWatcher: An object with changes(timeout) and close().
+    """
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError) as e:
+            # AttributeError: a C library without inotify; ENOSPC: the per-user watch limit is reached
+            logger.warning("File events are unavailable (%s), polling every %ss instead", e, poll_interval)
+    return PollingWatcher(directories, poll_interval)
+
+def _convert_job(fbx_file, root, output_dir, options):
+    """Convert one FBX file in a worker process and hand its summary and metrics back to the service."""
+    reset_report()
+    options = dict(options)
+    cache = create_cache(options.pop("cache_dir", None), options.pop("use_cache", True), options.get("stream", False))
+    file_summary = convert_file(fbx_file, root, output_dir, cache, **options)
+    return file_summary, get_report().as_dict()
+
+class WatchService:
+    """
+    Long-running conversion of FBX files that appear or change in watched directories.
+
+    File events (or rescans) only mark a file as settling. Once its size and modification time have
+    stayed the same for settle_seconds, which skips files that are still being copied, it is queued
+    and converted by a pool of worker processes, one file per worker. A file that changes again
+    while it is converted is converted once more afterwards. Exports are always incremental, so only
+    takes that changed are rewritten and files of removed takes are deleted. A worker process that
+    crashes takes the whole pool down with every running conversion; those files are queued again,
+    up to MAX_CRASH_RETRIES times each, so a file that crashes the exporter does not loop forever.
+
+    Attributes:
+        counters (dict): Numbers of converted and failed files and takes (see get_stats for all counters).
+    """
+
+    def __init__(self, directories, output_dir, options=None, workers=1, settle_seconds=DEFAULT_SETTLE_SECONDS, poll=False,
+                 poll_interval=DEFAULT_POLL_INTERVAL, process_existing=True, status_path=None, status_interval=DEFAULT_STATUS_INTERVAL):
+        """
+        Args:
+            directories (list): Directories to watch recursively.
+            output_dir (str): Root directory for the exported files.
+            options (dict): Keyword arguments of animConvert.convert_files (the layout, export settings and cache);
+                workers is ignored, every file is exported by a single worker.
+            workers (int): Number of FBX files converted at the same time (None uses every CPU).
+            settle_seconds (float): How long a file must stay unchanged before it is converted.
+            poll (bool): Poll the directories instead of using file events.
+            poll_interval (float): Seconds between rescans when polling.
+            process_existing (bool): Also convert the FBX files already in the directories at startup.
+            status_path (str): JSON file the counters are written to every status_interval seconds, or None.
+            status_interval (float): Seconds between status file updates.
+        """
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        self.output_dir = output_dir
+        self.options = {**(options or {}), "workers": 1, "incremental": True}
+        self.workers = workers or os.cpu_count() or 1
+        self.settle_seconds = settle_seconds
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.process_existing = process_existing
+        self.status_path = status_path
+        self.status_interval = status_interval
+
+        self.settling = {}  # Path -> [signature, time of last change, time first noticed]
+        self.queue = deque()  # (path, time first noticed) in arrival order
+        self.running = {}  # Future -> (path, time first noticed)
+        self.changed_while_running = set()
+        self.crash_retries = {}  # Path -> times its conversion was lost to a crashed worker process
+        self.started = None
+        self.counters = {"files_converted": 0, "files_failed": 0, "files_retried": 0, "takes_exported": 0, "takes_failed": 0}
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def notice(self, path, now=None):
+        """Record that a file may have changed; it is queued once it has settled."""
+        now = time.monotonic() if now is None else now
+        entry = self.settling.get(path)
+        if entry is None:
+            self.settling[path] = [file_signature(path), now, now]
+        else:
+            entry[0] = file_signature(path)
+            entry[1] = now
+
+    def promote_settled(self, now=None):
+        """Queue the files whose size and modification time have not changed for settle_seconds."""
+        now = time.monotonic() if now is None else now
+        queued = {path for path, _ in self.queue}
+        running = {path for path, _ in self.running.values()}
+        for path, entry in list(self.settling.items()):
+            signature, last_change, first_seen = entry
+            current = file_signature(path)
+            if current is None:
+                del self.settling[path]  # Deleted (or renamed away) before it settled
+            elif current != signature:
+                entry[0], entry[1] = current, now
+            elif now - last_change >= self.settle_seconds:
+                del self.settling[path]
+                if path in running:
+                    self.changed_while_running.add(path)
+                elif path not in queued:
+                    self.queue.append((path, first_seen))
+                    count("files_queued")
+
+    def root_of(self, path):
+        """Return the watched directory a file is in, which {fbx_dir} in the layout is relative to."""
+        containing = [directory for directory in self.directories if path.startswith(directory.rstrip(os.sep) + os.sep)]
+        return max(containing, key=len) if containing else os.path.dirname(path)
+
+    def dispatch(self, executor):
+        """Start queued conversions until every worker is busy."""
+        running = {path for path, _ in self.running.values()}
+        for _ in range(len(self.queue)):
+            if len(self.running) >= self.workers:
+                break
+            path, first_seen = self.queue.popleft()
+            if path in running:
+                self.changed_while_running.add(path)
+                continue
+            logger.info("Converting %s", path)
+            future = executor.submit(_convert_job, path, self.root_of(path), self.output_dir, self.options)
+            self.running[future] = (path, first_seen)
+            running.add(path)
+
+    def collect(self):
+        """
+        Record finished conversions, and queue conversions lost to a crashed worker process again.
+
+        Returns:
+            bool: False if the worker pool broke (a worker crashed) and has to be replaced.
+        """
+        healthy = True
+        for future in [future for future in self.running if future.done()]:
+            path, first_seen = self.running.pop(future)
+            latency = time.monotonic() - first_seen
+            try:
+                file_summary, metrics = future.result()
+            except BrokenProcessPool:
+                healthy = False
+                retries = self.crash_retries.get(path, 0)
+                if retries < MAX_CRASH_RETRIES:
+                    # Every running conversion is lost with the pool, not only the one that crashed it
+                    self.crash_retries[path] = retries + 1
+                    self.queue.appendleft((path, first_seen))
+                    self.counters["files_retried"] += 1
+                    logger.warning("Conversion of %s was lost to a crashed worker process, queued it again", path)
+                    continue
+                file_summary, metrics = {"error": f"the worker process crashed {retries + 1} times", "takes": []}, None
+            except Exception as e:
+                file_summary, metrics = {"error": f"{type(e).__name__}: {e}", "takes": []}, None
+            self.crash_retries.pop(path, None)
+
+            if metrics is not None:
+                get_report().merge(metrics)
+            failed_takes = [take for take in file_summary["takes"] if take["error"]]
+            self.counters["takes_exported"] += len(file_summary["takes"]) - len(failed_takes)
+            self.counters["takes_failed"] += len(failed_takes)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if file_summary["error"] or failed_takes:
+                self.counters["files_failed"] += 1
+                logger.error("Failed to convert %s: %s", path, file_summary["error"] or f"{len(failed_takes)} takes failed")
+            else:
+                self.counters["files_converted"] += 1
+                logger.info("Converted %s: %d takes in %.1fs after it changed, %d files queued",
+                            path, len(file_summary["takes"]), latency, len(self.queue) + len(self.settling))
+
+            if path in self.changed_while_running:
+                self.changed_while_running.discard(path)
+                self.notice(path)
+        return healthy
+
+    def get_stats(self):
+        """
+        Return the service's counters.
+
+        Returns:
+            dict: queue_depth (settling and queued files), settling, queued, running, files_converted,
+                files_failed, files_retried (after a worker crash), takes_exported, takes_failed, mean/max_latency_seconds (from the first change
+                of a file until its conversion finished), files_per_minute and takes_per_second (since start)
+                and uptime_seconds.
+        """
+        uptime = time.monotonic() - self.started if self.started is not None else 0.0
+        finished = self.counters["files_converted"] + self.counters["files_failed"]
+        return {
+            "queue_depth": len(self.settling) + len(self.queue),
+            "settling": len(self.settling),
+            "queued": len(self.queue),
+            "running": len(self.running),
+            **self.counters,
+            "mean_latency_seconds": round(self.total_latency / finished, 3) if finished else None,
+            "max_latency_seconds": round(self.max_latency, 3),
+            "files_per_minute": round(finished * 60.0 / uptime, 3) if uptime > 0 else 0.0,
+            "takes_per_second": round(self.counters["takes_exported"] / uptime, 3) if uptime > 0 else 0.0,
+            "uptime_seconds": round(uptime, 3),
+        }
+
+    def write_status(self):
+        """Atomically write get_stats() to the status file."""
+        with atomic_write(self.status_path) as f:
+            json.dump(self.get_stats(), f, indent=4)
+
+    def run(self, stop_event=None):
+        """
+        Watch and convert until stop_event is set (or the process is interrupted).
+
+        Conversions that are running when the service stops are finished; queued files are not.
+
+        Args:
+            stop_event (threading.Event): Set to stop the service, or None to run until interrupted.
+        """
+        stop_event = stop_event or threading.Event()
+        self.started = time.monotonic()
+        watcher = create_watcher(self.directories, self.poll, self.poll_interval)
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        last_status = 0.0
+        logger.info("Watching %s with %s and %d workers", ", ".join(self.directories), type(watcher).__name__, self.workers)
+
+        try:
+            if self.process_existing:
+                for fbx_file, _ in find_fbx_files(self.directories):
+                    self.notice(fbx_file, now=self.started - self.settle_seconds)
+
+            while not stop_event.is_set():
+                for path in watcher.changes(TICK_SECONDS):
+                    self.notice(path)
+                self.promote_settled()
+                if not self.collect():
+                    logger.error("A worker process crashed, restarting the worker pool")
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    executor = ProcessPoolExecutor(max_workers=self.workers)  # collect queued the lost conversions again
+                self.dispatch(executor)
+
+                if self.status_path is not None and time.monotonic() - last_status >= self.status_interval:
+                    self.write_status()
+                    last_status = time.monotonic()
+        finally:
+            watcher.close()
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.collect()
+            if self.status_path is not None:
+                self.write_status()
+            logger.info("Stopped watching: %s", self.get_stats())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="animWatch", description="Convert FBX files as they are added to or changed in watched folders.")
+    parser.add_argument("directories", nargs="+", help="directories to watch recursively")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE_SECONDS, help="seconds a file must stay unchanged before it is converted (default: %(default)s)")
+    parser.add_argument("--poll", action="store_true", help="rescan the folders instead of using file events (needed for network shares)")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, help="seconds between rescans when polling (default: %(default)s)")
+    parser.add_argument("--skip-existing", action="store_true", help="only convert files that change after startup")
+    parser.add_argument("--status", metavar="PATH", help=f"keep queue depth, latency and throughput counters as JSON in PATH (updated every {DEFAULT_STATUS_INTERVAL:g}s)")
+    add_conversion_arguments(parser)
+    parser.set_defaults(workers=1)
+    args = parser.parse_args(argv)
+    configure_logging(args)
+
+    for directory in args.directories:
+        if not os.path.isdir(directory):
+            parser.error(f"not a directory: {directory}")
+
+    # -j is the number of files converted at once here, each file is exported by a single process
+    try:
+        options = conversion_options(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    workers = options.pop("workers")
+    service = WatchService(args.directories, args.output_dir, options, workers, args.settle, args.poll, args.poll_interval,
+                           not args.skip_existing, args.status)
+    # Stop like on Ctrl+C when a service manager terminates the process
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    try:
+        service.run(stop_event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.report:
+            get_report().write_json(args.report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
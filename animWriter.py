@@ -0,0 +1,223 @@
+import os
+import uuid
+from contextlib import contextmanager
+import numpy as np
+from animCurves import CHANNELS, hash_curve
+from animMetrics import count
+
+# Size of the file buffer used while writing .anim files
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Constant parts of each channel's "anim" line, indexed by channel index
+CHANNEL_HEADERS = [
+    (f"anim {transform}.{transform}{axis} {transform}{axis} ", f" {index};\n")
+    for index, (transform, axis) in enumerate(CHANNELS)
+]
+
+# Maya's named time units; any other frame rate is written as "<fps>fps"
+TIME_UNITS = {15: "game", 24: "film", 25: "pal", 30: "ntsc", 48: "show", 50: "palf", 60: "ntscf"}
+
+ANIM_DATA_HEADER = (
+    "animData {\n"
+    "  input time;\n"
+    "  output linear;\n"
+    "  weighted 0;\n"
+    "  preInfinity constant;\n"
+    "  postInfinity constant;\n"
+    "  keys {\n"
+)
+ANIM_DATA_FOOTER = "  }\n}\n"
+
+# Characters of formatted keys a FormatCache keeps before it stops adding channels
+DEFAULT_FORMAT_CACHE_CHARS = 64 * 1024 * 1024
+
+FIRST_KEY_LINE = "    %d %s fixed fixed 1 0 0 0 1 0 1;\n"
+KEY_LINE = "    %d %s linear linear 1 0 0;\n"
+
+@contextmanager
+def atomic_write(save_path, binary=False):
+    """
+    Open a file for writing that only appears at save_path once it is completely written.
+
+    The data goes to a temporary file next to save_path, which replaces save_path on success and
+    is removed on failure, so a crash can never leave a truncated file behind.
+
+    Args:
+        save_path (str): The final path of the file.
+        binary (bool): Open the file in binary instead of text mode.
+    """
+    directory, name = os.path.split(os.path.abspath(save_path))
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(temp_path, 'xb' if binary else 'x', buffering=WRITE_BUFFER_SIZE) as file:
+            yield file
+        os.replace(temp_path, save_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def format_values(values, precision=None):
+    """
+    Prepare a value column for bulk %s-formatting.
+
+    Values are rounded to the requested number of decimals first; the shortest repr of a rounded
+    double never has more decimals than that, so no trailing zeros need to be stripped afterwards.
+
+    Args:
+        values (np.ndarray): Key values.
+        precision (int): Number of decimals to round to, or None to keep full precision.
+
+    Returns:
+        list: Python ints for whole values (written without a decimal point, like int(value)) and floats for the rest.
+    """
+    if precision is not None:
+        values = np.round(values, precision) + 0.0  # + 0.0 turns -0.0 into 0.0
+
+    whole = np.isfinite(values) & (values == np.floor(values))
+    formatted = values.astype(object)
+    formatted[whole] = values[whole].astype(np.int64)
+    return formatted.tolist()
+
+def format_keys(curve, precision=None):
+    """
+    Format every key of a channel in one pass.
+
+    Args:
+        curve (ChannelCurve): The channel's keys.
+        precision (int): Number of decimals for values, or None to keep full precision.
+
+    Returns:
+        str: The key lines of the channel.
+    """
+    times = curve.times.tolist()
+    values = format_values(curve.values, precision)
+
+    # Interleave times and values and run a single format over all keys after the first
+    interleaved = [None] * (2 * len(times) - 2)
+    interleaved[0::2] = times[1:]
+    interleaved[1::2] = values[1:]
+    return FIRST_KEY_LINE % (times[0], values[0]) + (KEY_LINE * (len(times) - 1)) % tuple(interleaved)
+
+class FormatCache:
+    """
+    Formatted key lines of the channels already written in a batch, by curve content.
+
+    A channel that repeats across takes (or bones) is formatted once and its text reused for
+    every later copy. Only the keys are cached; the "anim" line naming the bone is not.
+
+    Attributes:
+        max_chars (int): Total size of cached text after which new channels are no longer added.
+        chars (int): Total size of the cached text.
+        hits (int): Number of channels served from the cache.
+    """
+
+    def __init__(self, max_chars=DEFAULT_FORMAT_CACHE_CHARS):
+        self.max_chars = max_chars
+        self.chars = 0
+        self.hits = 0
+        self._keys = {}
+
+    def format_keys(self, curve, precision=None):
+        """Return format_keys(curve, precision), formatting it only if no identical curve was seen before."""
+        key = (hash_curve(curve), precision)
+        text = self._keys.get(key)
+        if text is not None:
+            self.hits += 1
+            count("channels_reused")
+            return text
+
+        text = format_keys(curve, precision)
+        if self.chars + len(text) <= self.max_chars:
+            self._keys[key] = text
+            self.chars += len(text)
+        return text
+
+def format_channel(bone_name, child_count, channel_index, curve, precision=None, format_cache=None):
+    """
+    Format a complete channel block (anim line, animData header and keys).
+
+    Args:
+        bone_name (str): Name of the bone the channel belongs to.
+        child_count (int): Number of children of the bone.
+        channel_index (int): Channel index (see animExport.get_transform_key).
+        curve (ChannelCurve): The channel's keys.
+        precision (int): Number of decimals for values, or None to keep full precision.
+        format_cache (FormatCache): Cache of already formatted keys to reuse, or None.
+
+    Returns:
+        str: The channel block.
+    """
+    header_prefix, header_suffix = CHANNEL_HEADERS[channel_index]
+    keys = format_keys(curve, precision) if format_cache is None else format_cache.format_keys(curve, precision)
+    return (
+        f"{header_prefix}{bone_name} 0 {child_count}{header_suffix}"
+        + ANIM_DATA_HEADER
+        + keys
+        + ANIM_DATA_FOOTER
+    )
+
+def get_time_unit(fps):
+    """
+    Get the .anim timeUnit name for a frame rate.
+
+    Args:
+        fps (float): Frames per second.
+
+    Returns:
+        str: The time unit, e.g. "pal" for 25 FPS or "120fps".
+    """
+    if float(fps).is_integer():
+        fps = int(fps)
+    return TIME_UNITS.get(fps, f"{fps}fps")
+
+def format_header(start_time, end_time, time_unit="pal"):
+    """
+    Format the .anim file header.
+
+    Args:
+        start_time (int): First frame of the animation.
+        end_time (int): Last frame of the animation.
+        time_unit (str): The timeUnit matching the frame rate of the keys (default is "pal", 25 FPS).
+
+    Returns:
+        str: The header lines.
+    """
+    return (
+        "animVersion 1.1;\n"
+        "mayaVersion 2025;\n"
+        f"timeUnit {time_unit};\n"
+        "linearUnit cm;\n"
+        "angularUnit deg;\n"
+        f"startTime {start_time};\n"
+        f"endTime {end_time};\n"
+    )
+
+def write_anim_file(save_path, keyframe_data, start_time, end_time, precision=None, time_unit="pal", format_cache=None):
+    """
+    Write keyframes to a .anim file atomically.
+
+    Args:
+        save_path (str): The path to save the .anim file.
+        keyframe_data (list): (bone_name, child_count, channels) tuples, channels being indexed by channel index.
+        start_time (int): First frame of the animation.
+        end_time (int): Last frame of the animation.
+        precision (int): Number of decimals for values, or None to keep full precision.
+        time_unit (str): The timeUnit matching the frame rate of the keys (default is "pal", 25 FPS).
+        format_cache (FormatCache): Cache shared by the files of a batch, so repeated channels are formatted once.
+
+    Returns:
+        int: Number of characters written.
+    """
+    written = 0
+    with atomic_write(save_path) as file:
+        written += file.write(format_header(start_time, end_time, time_unit))
+
+        # Export keyframes for each bone and transform, one buffered write per channel
+        for bone_name, child_count, channels in keyframe_data:
+            for channel_index, curve in enumerate(channels):
+                if curve is None or not len(curve):
+                    continue
+                written += file.write(format_channel(bone_name, child_count, channel_index, curve, precision, format_cache))
+
+    return written
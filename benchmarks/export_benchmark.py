@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+
+# Make the exporter modules importable and swap in the FBX SDK stand-in before they are imported
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fbx_standin
+fbx_standin.install()
+
+import numpy as np
+from FBX_import import SceneHandle, clean_animation_name
+from animExport import get_animation_clip, export_all_animations
+from animWriter import write_anim_file
+from animCurves import get_end_time
+from animFilters import resample_keyframes, bake_keyframes
+
+def count_keys(clip):
+    """Return the number of keys in a clip."""
+    return sum(len(curve) for _, _, channels in clip.bones for curve in channels if curve is not None)
+
+@contextlib.contextmanager
+def measure(results, phase, keys=0, trace_memory=False):
+    """
+    Record wall time, or peak traced memory, of a phase.
+
+    Tracing memory slows Python code down considerably, so timings and memory peaks are taken
+    in separate runs. The yielded dict may be updated with "keys" and "bytes" to get throughput figures.
+    """
+    stats = {"keys": keys, "bytes": 0}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        yield stats
+        seconds = time.perf_counter() - started
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    if trace_memory:
+        results[phase] = {"peak_bytes": peak}
+        return
+
+    result = {"seconds": round(seconds, 6)}
+    if stats["keys"]:
+        result["keys"] = stats["keys"]
+        result["keys_per_second"] = round(stats["keys"] / seconds, 1)
+    if stats["bytes"]:
+        result["bytes"] = stats["bytes"]
+        result["bytes_per_second"] = round(stats["bytes"] / seconds, 1)
+    results[phase] = result
+
+def run_benchmark(bones=50, keys=500, takes=4, layers=1, cubic=False, trace_memory=False):
+    """
+    Run every export phase on a synthetic scene.
+
+    Args:
+        bones (int): Number of animated bones.
+        keys (int): Keys per channel.
+        takes (int): Number of takes.
+        layers (int): Animation layers per take.
+        cubic (bool): Whether keys use cubic interpolation.
+        trace_memory (bool): Measure peak memory per phase instead of time.
+
+    Returns:
+        dict: Configuration, environment and per-phase results.
+    """
+    scene = fbx_standin.build_scene(bones, keys, takes, layers, cubic)
+    for anim_stack in scene.objects[fbx_standin.FbxAnimStack.ClassId]:
+        anim_stack.SetName(clean_animation_name(anim_stack.GetName()))
+
+    phases = {}
+    with measure(phases, "scene_index", trace_memory=trace_memory):
+        handle = SceneHandle(scene)
+    animations = list(handle.stacks)
+
+    with measure(phases, "extraction", trace_memory=trace_memory) as stats:
+        clips = [get_animation_clip(anim, handle) for anim in animations]
+        stats["keys"] = sum(count_keys(clip) for clip in clips)
+
+    total_keys = sum(count_keys(clip) for clip in clips)
+    with measure(phases, "resampling", total_keys, trace_memory):
+        for clip in clips:
+            resample_keyframes(clip.bones, 25, 60)
+
+    with measure(phases, "baking", total_keys, trace_memory):
+        for clip in clips:
+            bake_keyframes(clip.bones)
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        with measure(phases, "writing", total_keys, trace_memory) as stats:
+            for clip in clips:
+                keyframe_data = clip.bones[1:]
+                stats["bytes"] += write_anim_file(os.path.join(export_dir, f"{clip.name}.anim"), keyframe_data, 0, get_end_time(keyframe_data) or 0)
+
+        with measure(phases, "export_all", total_keys, trace_memory) as stats:
+            export_all_animations(animations, export_dir, handle)
+            stats["bytes"] = sum(os.path.getsize(os.path.join(export_dir, f"{anim}.anim")) for anim in animations)
+    handle.destroy()
+
+    return {
+        "config": {"bones": bones, "keys": keys, "takes": takes, "layers": layers, "cubic": cubic},
+        "environment": {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine()},
+        "phases": phases,
+    }
+
+def compare(results, baseline, max_regression):
+    """
+    Compare per-phase wall times against a baseline run.
+
+    Args:
+        results (dict): The current run.
+        baseline (dict): A previous run with the same configuration.
+        max_regression (float): Allowed slowdown as a fraction, e.g. 0.2 for 20%.
+
+    Returns:
+        list: Names of the phases that regressed by more than max_regression.
+    """
+    if results["config"] != baseline["config"]:
+        print(f"Warning: baseline configuration {baseline['config']} differs from {results['config']}")
+
+    regressed = []
+    for phase, current in results["phases"].items():
+        previous = baseline["phases"].get(phase)
+        if previous is None:
+            continue
+        ratio = current["seconds"] / previous["seconds"] if previous["seconds"] else float("inf")
+        print(f"{phase:12s} {previous['seconds']:10.4f}s -> {current['seconds']:10.4f}s ({ratio:5.2f}x)")
+        if ratio > 1.0 + max_regression:
+            regressed.append(phase)
+    return regressed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction and .anim export on a synthetic rig without the FBX SDK.")
+    parser.add_argument("--bones", type=int, default=50, help="animated bones (default: %(default)s)")
+    parser.add_argument("--keys", type=int, default=500, help="keys per channel (default: %(default)s)")
+    parser.add_argument("--takes", type=int, default=4, help="takes (default: %(default)s)")
+    parser.add_argument("--layers", type=int, default=1, help="animation layers per take (default: %(default)s)")
+    parser.add_argument("--cubic", action="store_true", help="use cubic keys with tangents")
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slow) peak memory run")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against the results JSON of an earlier run")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed slowdown per phase against the baseline (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.bones, args.keys, args.takes, args.layers, args.cubic)
+    if not args.no_memory:
+        memory = run_benchmark(args.bones, args.keys, args.takes, args.layers, args.cubic, trace_memory=True)
+        for phase, result in memory["phases"].items():
+            results["phases"][phase]["peak_bytes"] = result["peak_bytes"]
+    print(json.dumps(results, indent=4))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressed = compare(results, json.load(f), args.max_regression)
+        if regressed:
+            print(f"FAIL: slower than the baseline: {', '.join(regressed)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+# Stand-in for the parts of the FBX Python SDK the exporter uses, so benchmarks run on machines
+# without the SDK. install() registers it as the "fbx" module; build_scene() generates a synthetic
+# rig with any number of bones, keys, takes and layers, and write_scene_file() saves one for the importer.
+import sys
+import json
+import math
+
+# Frame rate of the scene's time mode
+FRAME_RATE = 25.0
+
+class FbxCriteria:
+    @staticmethod
+    def ObjectType(class_id):
+        return class_id
+
+class FbxTime:
+    __slots__ = ("frame",)
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def GetFrameCount(self, *args):
+        return int(self.frame)
+
+    def GetSecondDouble(self):
+        return self.frame / FRAME_RATE
+
+class FbxAnimCurveDef:
+    eInterpolationConstant = 0x02
+    eInterpolationLinear = 0x04
+    eInterpolationCubic = 0x08
+
+class FbxAnimCurveKey:
+    __slots__ = ("curve", "index")
+
+    def __init__(self, curve, index):
+        self.curve = curve
+        self.index = index
+
+    def GetTime(self):
+        return self.curve.KeyGetTime(self.index)
+
+    def GetValue(self):
+        return self.curve.KeyGetValue(self.index)
+
+    def GetInterpolation(self):
+        return self.curve.KeyGetInterpolation(self.index)
+
+class FbxAnimCurve:
+    def __init__(self, times, values, interpolation=None, tangents=None):
+        self.times = times
+        self.values = values
+        self.interpolation = interpolation
+        self.tangents = tangents
+
+    def KeyGetCount(self):
+        return len(self.times)
+
+    def KeyGet(self, index):
+        return FbxAnimCurveKey(self, index)
+
+    def KeyGetTime(self, index):
+        return FbxTime(self.times[index])
+
+    def KeyGetValue(self, index):
+        return self.values[index]
+
+    def KeyGetInterpolation(self, index):
+        return self.interpolation[index] if self.interpolation else FbxAnimCurveDef.eInterpolationLinear
+
+    def KeyGetLeftDerivative(self, index):
+        return self.tangents[index][0] if self.tangents else 0.0
+
+    def KeyGetRightDerivative(self, index):
+        return self.tangents[index][1] if self.tangents else 0.0
+
+class FbxProperty:
+    def __init__(self, default):
+        self.default = default
+        self.curves = {}
+
+    def GetCurve(self, anim_layer, channel, create=False):
+        return self.curves.get((id(anim_layer), channel))
+
+    def Get(self):
+        return self.default
+
+class FbxPropertyValue:
+    def __init__(self, value):
+        self.value = value
+
+    def Get(self):
+        return self.value
+
+class FbxSkeleton:
+    pass
+
+class FbxNode:
+    ClassId = "FbxNode"
+
+    def __init__(self, name, is_skeleton=True):
+        self.name = name
+        self.parent = None
+        self.children = []
+        self.skeleton = FbxSkeleton() if is_skeleton else None
+        self.LclTranslation = FbxProperty((0.0, 0.0, 0.0))
+        self.LclRotation = FbxProperty((0.0, 0.0, 0.0))
+        self.LclScaling = FbxProperty((1.0, 1.0, 1.0))
+
+    def GetName(self):
+        return self.name
+
+    def GetChildCount(self):
+        return len(self.children)
+
+    def GetChild(self, index):
+        return self.children[index]
+
+    def GetParent(self):
+        return self.parent
+
+    def GetSkeleton(self):
+        return self.skeleton
+
+    def AddChild(self, child):
+        child.parent = self
+        self.children.append(child)
+
+class FbxAnimLayer:
+    ClassId = "FbxAnimLayer"
+
+    def __init__(self, name, weight=100.0, blend_mode=0):
+        self.name = name
+        self.Weight = FbxPropertyValue(weight)
+        self.BlendMode = FbxPropertyValue(blend_mode)
+        self.Mute = FbxPropertyValue(False)
+        self.Solo = FbxPropertyValue(False)
+
+    def GetName(self):
+        return self.name
+
+class FbxAnimStack:
+    ClassId = "FbxAnimStack"
+
+    def __init__(self, name):
+        self.name = name
+        self.layers = []
+
+    def GetName(self):
+        return self.name
+
+    def SetName(self, name):
+        self.name = name
+
+    def GetMember(self, class_id, index):
+        return self.layers[index] if index < len(self.layers) else None
+
+    def GetMemberCount(self, class_id):
+        return len(self.layers)
+
+class FbxManager:
+    @staticmethod
+    def Create():
+        return FbxManager()
+
+    def GetIOSettings(self):
+        return None
+
+    def Destroy(self):
+        pass
+
+class FbxScene:
+    def __init__(self):
+        self.objects = {FbxNode.ClassId: [], FbxAnimStack.ClassId: []}
+
+    @staticmethod
+    def Create(manager, name):
+        return FbxScene()
+
+    def GetSrcObjectCount(self, class_id):
+        return len(self.objects.get(class_id, ()))
+
+    def GetSrcObject(self, class_id, index):
+        return self.objects[class_id][index]
+
+    def GetRootNode(self):
+        return self.objects[FbxNode.ClassId][0]
+
+    def FindNodeByName(self, name):
+        for node in self.objects[FbxNode.ClassId]:
+            if node.name == name:
+                return node
+        return None
+
+    def Destroy(self):
+        pass
+
+class FbxImporter:
+    @staticmethod
+    def Create(manager, name):
+        return FbxImporter()
+
+    def Initialize(self, fbx_file, file_format, io_settings):
+        # The stand-in cannot read FBX files, only the build_scene arguments saved by write_scene_file
+        try:
+            with open(fbx_file, "r") as f:
+                self.scene_args = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def Import(self, scene):
+        scene.objects = build_scene(**self.scene_args).objects
+        return True
+
+    def Destroy(self):
+        pass
+
+def install():
+    """
+    Register the stand-in as the "fbx" module. Must run before the exporter modules are imported.
+
+    The stand-in is used even when the real SDK is installed, so results are comparable between machines.
+    """
+    sys.modules["fbx"] = sys.modules[__name__]
+
+def write_scene_file(path, **scene_args):
+    """
+    Write a file the stand-in imports as build_scene(**scene_args), so the exporter can load it by path.
+
+    Args:
+        path (str): The file to write, usually named .fbx.
+        scene_args: Arguments of build_scene.
+    """
+    with open(path, "w") as f:
+        json.dump(scene_args, f)
+
+def build_scene(bones=50, keys=500, takes=4, layers=1, cubic=False):
+    """
+    Build a synthetic scene: a chain of bones under an armature, each animated on all nine channels.
+
+    Args:
+        bones (int): Number of animated bones (an armature node and a scene root are added).
+        keys (int): Keys per channel per layer.
+        takes (int): Number of animation stacks.
+        layers (int): Animation layers per stack.
+        cubic (bool): Whether keys use cubic interpolation with tangents.
+
+    Returns:
+        FbxScene: The scene.
+    """
+    scene = FbxScene()
+    nodes = scene.objects[FbxNode.ClassId]
+    root = FbxNode("RootNode", is_skeleton=False)
+    armature = FbxNode("Armature")
+    root.AddChild(armature)
+    nodes.extend([root, armature])
+
+    parent = armature
+    for bone in range(bones):
+        node = FbxNode(f"Bone{bone:03d}")
+        parent.AddChild(node)
+        nodes.append(node)
+        parent = node if bone % 8 else armature  # Chains of eight bones
+
+    times = list(range(keys))
+    interpolation = [FbxAnimCurveDef.eInterpolationCubic] * keys if cubic else None
+    for take in range(takes):
+        anim_stack = FbxAnimStack(f"Armature|Take{take:03d}")
+        scene.objects[FbxAnimStack.ClassId].append(anim_stack)
+        for layer_index in range(layers):
+            anim_layer = FbxAnimLayer(f"Layer{layer_index}")
+            anim_stack.layers.append(anim_layer)
+            for node_index, node in enumerate(nodes[1:]):
+                properties = (node.LclTranslation, node.LclRotation, node.LclScaling)
+                for channel in range(9):
+                    phase = 0.1 * (take + node_index + channel + layer_index)
+                    values = [math.sin(0.05 * frame + phase) * (10.0 if channel < 6 else 0.1) + (1.0 if channel >= 6 else 0.0) for frame in times]
+                    tangents = [(0.5, 0.5)] * keys if cubic else None
+                    curve = FbxAnimCurve(times, values, interpolation, tangents)
+                    properties[channel // 3].curves[(id(anim_layer), "XYZ"[channel % 3])] = curve
+    return scene
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Repository root, where the GUI script lives
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_SCRIPT = os.path.join(REPO_DIR, ".anim_Creator.py")
+
+# Modules that must not be imported before the window is shown
+HEAVY_MODULES = ("fbx", "numpy", "FBX_import", "animExport", "animCache", "animCurves")
+
+# Runs the GUI script's module level (imports, constants, class definitions) without opening the window
+PROBE = """
+import sys, json, time, runpy
+started = time.perf_counter()
+namespace = runpy.run_path({script!r}, run_name="startup_benchmark")
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "heavy_modules": [m for m in {heavy!r} if m in sys.modules],
+                  "budget_seconds": namespace["startup_budget_seconds"]}}))
+"""
+
+def measure_startup(runs=5):
+    """
+    Measure how long the GUI script takes to get to the point of building its window.
+
+    Every run uses a fresh interpreter so nothing is already imported.
+
+    Args:
+        runs (int): Number of measurements.
+
+    Returns:
+        dict: Median and individual timings, the heavy modules that were imported too early and the GUI's
+        startup_budget_seconds.
+    """
+    probe = PROBE.format(script=GUI_SCRIPT, heavy=HEAVY_MODULES)
+    timings = []
+    heavy_modules = set()
+    budget_seconds = None
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        heavy_modules.update(result["heavy_modules"])
+        budget_seconds = result["budget_seconds"]
+    return {"median_seconds": statistics.median(timings), "runs": timings, "heavy_modules": sorted(heavy_modules),
+            "budget_seconds": budget_seconds}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Guard the GUI cold-start time.")
+    parser.add_argument("--runs", type=int, default=5, help="number of measurements (default: %(default)s)")
+    parser.add_argument("--budget", type=float, help="maximum median module load time in seconds (default: the GUI's startup_budget_seconds)")
+    args = parser.parse_args(argv)
+
+    result = measure_startup(args.runs)
+    print(json.dumps(result, indent=4))
+    budget = args.budget if args.budget is not None else result["budget_seconds"]
+
+    if result["heavy_modules"]:
+        print(f"FAIL: imported before the window is shown: {', '.join(result['heavy_modules'])}")
+        return 1
+    if result["median_seconds"] > budget:
+        print(f"FAIL: startup took {result['median_seconds']:.3f}s, budget is {budget:.3f}s")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+# Make the exporter modules importable and swap in the FBX SDK stand-in before they are imported,
+# so the tests run on machines without the SDK (see benchmarks/fbx_standin.py)
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+import fbx_standin
+fbx_standin.install()
+
+import pytest
+from FBX_import import SceneHandle
+from animExport import get_animation_clip
+
+# Name of the first take of fbx_standin.build_scene
+TAKE = "Armature|Take000"
+
+def extract(scene, take=TAKE):
+    """Return the bones of a stand-in take as the exporter extracts them."""
+    return get_animation_clip(take, SceneHandle(scene)).bones
+
+def curves(bones):
+    """Yield (bone name, channel index, curve) for every animated channel of keyframe data."""
+    for bone_name, _, channels in bones:
+        for channel_index, curve in enumerate(channels):
+            if curve is not None:
+                yield bone_name, channel_index, curve
+
+@pytest.fixture
+def linear_bones():
+    return extract(fbx_standin.build_scene(bones=6, keys=60, takes=1))
+
+@pytest.fixture
+def cubic_bones():
+    return extract(fbx_standin.build_scene(bones=6, keys=60, takes=1, cubic=True))
@@ -0,0 +1,32 @@
+import numpy as np
+
+from conftest import TAKE
+import fbx_standin
+from FBX_import import SceneHandle
+from animExport import export_single_animation
+from animBinary import BinaryAnimation, anim_to_binary, binary_to_anim
+from animReader import read_anim_file
+
+def test_anim_binary_round_trip_is_lossless(tmp_path):
+    scene = SceneHandle(fbx_standin.build_scene(bones=6, keys=40, takes=1, cubic=True))
+    anim_path = tmp_path / "take.anim"
+    binary_path = tmp_path / "take.animb"
+    back_path = tmp_path / "back.anim"
+    export_single_animation(TAKE, str(anim_path), scene, bake=True)
+
+    anim_to_binary(str(anim_path), str(binary_path))
+    binary_to_anim(str(binary_path), str(back_path))
+    assert back_path.read_bytes() == anim_path.read_bytes()
+
+    # The binary file holds exactly the keys of the text file
+    _, clip = read_anim_file(str(anim_path))
+    with BinaryAnimation(str(binary_path)) as animation:
+        binary_clip = animation.to_clip(clip.name)
+    assert [(bone_name, child_count) for bone_name, child_count, _ in binary_clip.bones] == \
+        [(bone_name, child_count) for bone_name, child_count, _ in clip.bones]
+    for (_, _, channels), (_, _, binary_channels) in zip(clip.bones, binary_clip.bones):
+        for curve, binary_curve in zip(channels, binary_channels):
+            assert (curve is None) == (binary_curve is None)
+            if curve is not None:
+                np.testing.assert_array_equal(binary_curve.times, curve.times)
+                np.testing.assert_array_equal(binary_curve.values, curve.values)
@@ -0,0 +1,31 @@
+import json
+import os
+
+import fbx_standin
+from animCache import ExtractionCache
+from FBX_import import load_fbx_animations
+
+def test_corrupt_entry_is_a_miss_and_deleted(tmp_path):
+    fbx_standin.write_scene_file(str(tmp_path / "rig.fbx"), bones=3, keys=10, takes=1)
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    load_fbx_animations(str(tmp_path / "rig.fbx"), cache)
+    key = cache.key_for(str(tmp_path / "rig.fbx"))
+    assert cache.load(key) is not None
+
+    entry = tmp_path / "cache" / f"{key}.npz"
+    entry.write_bytes(entry.read_bytes()[:100])
+    assert cache.load(key) is None
+    assert not entry.exists()
+
+def test_eviction_forgets_deleted_fbx_files(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    for name in ("a.fbx", "b.fbx"):
+        fbx_standin.write_scene_file(str(tmp_path / name), bones=3, keys=10, takes=1)
+        load_fbx_animations(str(tmp_path / name), cache)
+    os.remove(tmp_path / "a.fbx")
+
+    fbx_standin.write_scene_file(str(tmp_path / "c.fbx"), bones=3, keys=12, takes=1)
+    load_fbx_animations(str(tmp_path / "c.fbx"), cache)
+
+    with open(cache.index_path) as f:
+        assert sorted(os.path.basename(path) for path in json.load(f)) == ["b.fbx", "c.fbx"]
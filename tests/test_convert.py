@@ -0,0 +1,41 @@
+import os
+
+import fbx_standin
+from animConvert import convert_files
+from animBinary import read_pack_file
+
+def written_files(directory):
+    return sorted(os.path.relpath(os.path.join(parent, name), directory) for parent, _, names in os.walk(directory) for name in names)
+
+def test_bare_file_name_writes_below_the_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fbx_standin.write_scene_file("rig.fbx", bones=4, keys=20, takes=2)
+
+    summary = convert_files(["rig.fbx"], "out", layout="{fbx_dir}/{take}.anim", use_cache=False)
+
+    assert summary["failed"] == 0 and summary["exported"] == 2
+    for take in summary["files"][0]["takes"]:
+        assert os.path.commonpath([os.path.abspath("out"), os.path.abspath(take["path"])]) == os.path.abspath("out")
+    assert written_files(tmp_path) == [os.path.join("out", "Take000.anim"), os.path.join("out", "Take001.anim"), "rig.fbx"]
+
+def test_layout_leading_outside_the_output_dir_is_refused(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fbx_standin.write_scene_file("rig.fbx", bones=4, keys=20, takes=2)
+
+    summary = convert_files(["rig.fbx"], "out", layout="../{take}.anim", use_cache=False)
+
+    assert summary["failed"] == 1 and summary["exported"] == 0
+    assert "outside the output directory" in summary["files"][0]["error"]
+    assert written_files(tmp_path) == ["rig.fbx"]
+
+def test_pack_of_a_bare_file_name_is_written_below_the_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fbx_standin.write_scene_file("rig.fbx", bones=4, keys=20, takes=2)
+
+    summary = convert_files(["rig.fbx"], "out", use_cache=False, pack=True)
+
+    assert summary["files"][0]["pack"] == os.path.join("out", "rig.animpack")
+    clips, _ = read_pack_file(summary["files"][0]["pack"])
+    assert [clip.name for clip in clips] == ["Take000", "Take001"]
+    assert written_files(tmp_path) == sorted([os.path.join("out", "rig", "Take000.anim"), os.path.join("out", "rig", "Take001.anim"),
+                                              os.path.join("out", "rig.animpack"), "rig.fbx"])
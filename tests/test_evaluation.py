@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from conftest import curves
+from animFilters import evaluate_curve
+
+def test_cubic_evaluation_matches_the_keys(cubic_bones):
+    for _, _, curve in curves(cubic_bones):
+        np.testing.assert_allclose(evaluate_curve(curve, curve.times), curve.values, rtol=0, atol=1e-12)
+
+def test_cubic_evaluation_follows_the_tangents(cubic_bones):
+    _, _, curve = next(curves(cubic_bones))
+    # Halfway through a segment the Hermite spline is the mean of the keys plus an eighth of the tangent difference
+    first, last = curve.values[0], curve.values[1]
+    out_slope, in_slope = curve.tangents[0, 1], curve.tangents[1, 0]
+    expected = (first + last) / 2 + (out_slope - in_slope) / 8
+    assert evaluate_curve(curve, np.array([0.5]))[0] == pytest.approx(expected)
@@ -0,0 +1,42 @@
+import os
+
+import fbx_standin
+from animConvert import convert_files
+from animMetrics import get_report
+
+def convert(**options):
+    """Convert rig.fbx incrementally and return the files written, unchanged and removed."""
+    convert_files(["rig.fbx"], "out", use_cache=False, incremental=True, **options)
+    counters = get_report().as_dict()["counters"]
+    return counters.get("takes_exported", 0), counters.get("takes_unchanged", 0), counters.get("files_removed", 0)
+
+def test_incremental_export_skips_unchanged_takes_and_rewrites_changed_ones(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fbx_standin.write_scene_file("rig.fbx", bones=4, keys=20, takes=2)
+    take_path = os.path.join("out", "rig", "Take000.anim")
+
+    assert convert() == (2, 0, 0)
+    written = os.stat(take_path).st_mtime_ns
+
+    # Nothing changed: no file is touched
+    assert convert() == (0, 2, 0)
+    assert os.stat(take_path).st_mtime_ns == written
+
+    # A deleted output is written again, the other take is kept
+    os.remove(take_path)
+    assert convert() == (1, 1, 0)
+    assert os.path.exists(take_path)
+
+    # Other export settings change every take
+    assert convert(precision=3) == (2, 0, 0)
+
+    # A new take is exported on its own, removed takes lose their files
+    fbx_standin.write_scene_file("rig.fbx", bones=4, keys=20, takes=3)
+    assert convert(precision=3) == (1, 2, 0)
+    fbx_standin.write_scene_file("rig.fbx", bones=4, keys=20, takes=1)
+    assert convert(precision=3) == (0, 1, 2)
+    assert sorted(os.listdir(os.path.join("out", "rig"))) == ["Take000.anim"]
+
+    # Changed keys are picked up
+    fbx_standin.write_scene_file("rig.fbx", bones=4, keys=25, takes=1)
+    assert convert(precision=3) == (1, 0, 0)
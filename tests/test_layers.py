@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import fbx_standin
+from conftest import extract
+from animCurves import BLEND_ADDITIVE, BLEND_OVERRIDE, BLEND_OVERRIDE_PASSTHROUGH, ChannelCurve
+from animFilters import blend_curves
+
+def test_override_passthrough_lets_lower_layers_show_through():
+    base = ChannelCurve([0, 10], [2.0, 2.0])
+    layer = ChannelCurve([0, 10], [6.0, 6.0])
+    override = blend_curves([(base, 1.0, BLEND_OVERRIDE), (layer, 0.25, BLEND_OVERRIDE)], default=1.0)
+    passthrough = blend_curves([(base, 1.0, BLEND_OVERRIDE), (layer, 0.25, BLEND_OVERRIDE_PASSTHROUGH)], default=1.0)
+    # Override hides the base and fades towards the default, passthrough mixes with the base
+    np.testing.assert_allclose(override.values, [2.25, 2.25])
+    np.testing.assert_allclose(passthrough.values, [3.0, 3.0])
+
+def layered_scene(base_muted):
+    scene = fbx_standin.build_scene(bones=3, keys=20, takes=1, layers=2)
+    base_layer, additive_layer = scene.GetSrcObject(fbx_standin.FbxAnimStack.ClassId, 0).layers
+    base_layer.Mute = fbx_standin.FbxPropertyValue(base_muted)
+    additive_layer.Weight = fbx_standin.FbxPropertyValue(50.0)
+    additive_layer.BlendMode = fbx_standin.FbxPropertyValue(BLEND_ADDITIVE)
+    return scene, additive_layer
+
+@pytest.mark.parametrize("base_muted", [False, True])
+def test_layers_blend_onto_the_default_values_when_the_base_layer_is_muted(base_muted):
+    scene, additive_layer = layered_scene(base_muted)
+    scene.FindNodeByName("Bone001").LclTranslation.default = (5.0, 0.0, 0.0)
+    bones = extract(scene)
+
+    node = scene.FindNodeByName("Bone001")
+    translate_x = np.array(node.LclTranslation.curves[(id(additive_layer), "X")].values)
+    curve = dict((bone_name, channels) for bone_name, _, channels in bones)["Bone001"][0]
+    if base_muted:
+        # The additive layer is added to the default value, not blended as if it were the base
+        np.testing.assert_allclose(curve.values, 5.0 + 0.5 * translate_x)
+    else:
+        assert not np.allclose(curve.values, 5.0 + 0.5 * translate_x)
@@ -0,0 +1,37 @@
+import os
+import multiprocessing
+
+import pytest
+
+import fbx_standin
+from animConvert import convert_files
+
+# Worker processes only have the FBX SDK stand-in if they are forked from the test process
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs forked worker processes")
+
+def read_tree(directory):
+    files = {}
+    for parent, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(parent, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, directory)] = f.read()
+    return files
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"target_fps": 30, "reduce_tolerances": {}},
+    {"bake": True, "binary_values": "float32"},
+    {"pack": True, "prune": "rest"},
+    {"clip_ranges": {"Take000": [("Intro", 0, 10), ("Loop", 5, 30)], "Take002": [("Outro", 20, 39)]}},
+])
+def test_parallel_output_matches_serial(tmp_path, monkeypatch, options):
+    monkeypatch.chdir(tmp_path)
+    fbx_standin.write_scene_file("rig.fbx", bones=6, keys=40, takes=4, layers=2, cubic=True)
+
+    serial = convert_files(["rig.fbx"], "serial", use_cache=False, workers=1, **options)
+    parallel = convert_files(["rig.fbx"], "parallel", use_cache=False, workers=3, **options)
+
+    assert serial["failed"] == parallel["failed"] == 0
+    assert parallel["exported"] == serial["exported"] > 0
+    assert read_tree("parallel") == read_tree("serial")
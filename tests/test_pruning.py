@@ -0,0 +1,44 @@
+import fbx_standin
+from conftest import extract
+from animFilters import DEFAULT_TOLERANCES, prune_keyframes
+from FBX_import import SceneHandle
+
+def test_pruning_drops_only_rest_pose_channels():
+    scene = fbx_standin.build_scene(bones=6, keys=20, takes=1)
+    layer = scene.GetSrcObject(fbx_standin.FbxAnimStack.ClassId, 0).GetMember(None, 0)
+    times = list(range(20))
+
+    def hold(node_name, prop, axis, value):
+        node = scene.FindNodeByName(node_name)
+        getattr(node, prop).curves[(id(layer), axis)] = fbx_standin.FbxAnimCurve(times, [value] * len(times))
+
+    # Bone001 is at rest on every channel, Bone002 only on its translation
+    for prop, value in (("LclTranslation", 0.0), ("LclRotation", 0.0), ("LclScaling", 1.0)):
+        for axis in "XYZ":
+            hold("Bone001", prop, axis, value)
+    for axis in "XYZ":
+        hold("Bone002", "LclTranslation", axis, 0.0)
+    # Bone003 holds still away from its rest pose, which is not pruned
+    hold("Bone003", "LclRotation", "X", 45.0)
+    # Bone004 moves by less than the tolerance around its rest pose
+    hold("Bone004", "LclScaling", "Y", 1.0)
+    scene.FindNodeByName("Bone004").LclScaling.curves[(id(layer), "Y")].values[5] = 1.0 + DEFAULT_TOLERANCES["scale"] / 2
+
+    handle = SceneHandle(scene)
+    bones = extract(scene)
+    pruned, report = prune_keyframes(bones, handle.rest_poses)
+
+    assert report["bones"] == ["Bone001"]
+    assert report["channels"] == {
+        "Bone002": ["translateX", "translateY", "translateZ"],
+        "Bone004": ["scaleY"],
+    }
+    kept = {bone_name: channels for bone_name, _, channels in pruned}
+    assert "Bone001" not in kept
+    assert kept["Bone003"][3] is not None
+    # Every channel that was not reported is passed through untouched
+    originals = {bone_name: channels for bone_name, _, channels in bones}
+    for bone_name, channels in kept.items():
+        for channel_index, curve in enumerate(channels):
+            if curve is not None:
+                assert curve is originals[bone_name][channel_index]
@@ -0,0 +1,18 @@
+import numpy as np
+
+from conftest import curves
+from animCurves import CHANNEL_NAMES
+from animFilters import reduce_keyframes
+
+def test_reduction_stays_within_tolerance(linear_bones):
+    tolerances = {"translate": 0.01, "rotate": 0.05, "scale": 0.001}
+    reduced, keys_before, keys_after = reduce_keyframes(linear_bones, tolerances)
+    assert keys_after < keys_before
+
+    originals = {(bone_name, channel_index): curve for bone_name, channel_index, curve in curves(linear_bones)}
+    for bone_name, channel_index, curve in curves(reduced):
+        original = originals[(bone_name, channel_index)]
+        assert curve.times[0] == original.times[0] and curve.times[-1] == original.times[-1]
+        tolerance = tolerances[CHANNEL_NAMES[channel_index][:-1]]
+        error = np.abs(np.interp(original.times, curve.times, curve.values) - original.values).max()
+        assert error <= tolerance + 1e-12
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from conftest import curves
+from animCurves import ChannelCurve
+from animFilters import evaluate_curve, slice_keyframes
+
+def every_seventh_key(curve):
+    keep = slice(None, None, 7)
+    return ChannelCurve(curve.times[keep], curve.values[keep], curve.interpolation[keep], curve.tangents[keep])
+
+@pytest.mark.parametrize("start, end", [(10, 31), (14, 28), (0, 56), (3, 4)])
+def test_slice_reproduces_its_range(cubic_bones, start, end):
+    # Sparse keys, so most ranges start and end between keys
+    sparse = [(bone_name, child_count, [every_seventh_key(curve) for curve in channels]) for bone_name, child_count, channels in cubic_bones]
+    sliced = slice_keyframes(sparse, start, end)
+
+    frames = np.linspace(start, end, 4 * (end - start) + 1)
+    originals = {(bone_name, channel_index): curve for bone_name, channel_index, curve in curves(sparse)}
+    for bone_name, channel_index, curve in curves(sliced):
+        assert curve.times[0] >= 0 and curve.times[-1] <= end - start
+        original = originals[(bone_name, channel_index)]
+        np.testing.assert_allclose(evaluate_curve(curve, frames - start), evaluate_curve(original, frames), rtol=0, atol=1e-9)
+
+@pytest.mark.parametrize("start, end", [(60, 80), (-5, 10), (20, 20), (30, 20)])
+def test_slice_rejects_ranges_outside_the_take(linear_bones, start, end):
+    with pytest.raises(ValueError):
+        slice_keyframes(linear_bones, start, end)
@@ -0,0 +1,32 @@
+import pytest
+
+import fbx_standin
+from conftest import TAKE
+from FBX_import import SceneHandle
+from animExport import export_single_animation, export_streaming
+
+OPTIONS = [
+    {},
+    {"target_fps": 30},
+    {"bake": True},
+    {"reduce_tolerances": {}},
+    {"precision": 3, "target_fps": 24, "reduce_tolerances": {}},
+    {"binary_values": "float32"},
+    {"binary_values": "uint16", "bake": True},
+    {"prune": "static"},
+]
+
+@pytest.mark.parametrize("cubic", [False, True])
+@pytest.mark.parametrize("layers", [1, 2])
+@pytest.mark.parametrize("options", OPTIONS)
+def test_streaming_output_matches_the_normal_export(tmp_path, cubic, layers, options):
+    settings = {"original_fps": 25, "target_fps": 25, "precision": None, "reduce_tolerances": None, "bake": False,
+                "binary_values": None, "prune": None, **options}
+    build_args = {"bones": 6, "keys": 40, "takes": 1, "layers": layers, "cubic": cubic}
+    normal_path = tmp_path / "normal"
+    streamed_path = tmp_path / "streamed"
+
+    export_single_animation(TAKE, str(normal_path), SceneHandle(fbx_standin.build_scene(**build_args)), **settings)
+    export_streaming(TAKE, str(streamed_path), SceneHandle(fbx_standin.build_scene(**build_args)), settings)
+
+    assert streamed_path.read_bytes() == normal_path.read_bytes()